@@ -0,0 +1,75 @@
+# Config cache benchmark: time to the first row of a config with many tables, with the pure-Python
+# YAML loader, with the C loader, and with a warm plan cache (--cache-dir).
+# Every measurement runs in a new process, so nothing is cached in memory between them.
+# Usage: python benchmarks/bench_config_cache.py [--tables 400]
+import sys, os, io, time, argparse, contextlib, subprocess, tempfile
+sys.path.append(os.path.abspath("."))
+
+import yaml
+
+
+def many_tables_config(table_count):
+    tables = []
+    for t in range(table_count):
+        columns = [{"column_name": "id", "data": "row_id", "is_primary_key": True}]
+        if t > 0:
+            parent = t // 2
+            columns.append({"column_name": f"t{parent}_id", "data": f'foreign_key("t{parent}", "id")'})
+            columns.append({"column_name": f"t{parent}_name", "data": f'copy_from_fk("t{parent}", "t{parent}_id", "name")'})
+        columns += [
+            {"column_name": "name", "data": "fake.name()"},
+            {"column_name": "email", "data": "fake.email()", "type": "string"},
+            {"column_name": "amount", "data": "round(random.uniform(1, 100), 2)", "type": "float"},
+            {"column_name": "quantity", "data": "random.randint(1, 9)", "type": "int32", "null_percentage": 0.1},
+            {"column_name": "status", "data": 'random.choice(["new", "paid", "sent"])'},
+            {"column_name": "score", "data": "x = random.random()\nif x > 0.5:\n    return x * 10\nreturn x"},
+        ]
+        tables.append({"table_name": f"t{t}", "row_count": 1, "columns": columns})
+    return {"version": 1, "config": {"locale": "en_US", "seed": 1}, "tables": tables}
+
+
+def run_once(config_path, mode, cache_dir):
+    """Time from loading the config to the first row of the first table."""
+    from tablefaker import config
+    from tablefaker.tablefaker import TableFaker
+    if mode == "python":
+        config.YAML_LOADER = yaml.SafeLoader
+    kwargs = {"cache_dir": cache_dir} if mode == "cache" else {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        batches = TableFaker().iter_batches(config_path, "t0", batch_size=1, **kwargs)
+        next(batches)
+        first_row = time.perf_counter() - start
+        # the rest of t0 is generated and the cache file written when the generator finishes
+        for _ in batches:
+            pass
+    print(first_row)
+
+
+def measure(config_path, mode, cache_dir):
+    output = subprocess.run([sys.executable, __file__, "--run", config_path, mode, cache_dir], capture_output=True, text=True, check=True)
+    return float(output.stdout.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="config cache benchmark")
+    parser.add_argument("--tables", type=int, default=400)
+    parser.add_argument("--run", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run_once(*args.run)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = os.path.join(directory, "many_tables.yaml")
+        with open(config_path, "w") as f:
+            yaml.safe_dump(many_tables_config(args.tables), f, sort_keys=False)
+        cache_dir = os.path.join(directory, ".tablefaker_cache")
+        measure(config_path, "cache", cache_dir)  # fills the cache
+        print(f"tables={args.tables} config={os.path.getsize(config_path) / 1024:.0f} KB")
+        for mode, label in [("python", "pure-Python YAML"), ("c", "C YAML loader"), ("cache", "warm plan cache")]:
+            print(f"{label:>17}: first row after {measure(config_path, mode, cache_dir):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
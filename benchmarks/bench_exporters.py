@@ -0,0 +1,128 @@
+# Exporter throughput benchmark: pre-generated DataFrames of several widths, column types and null densities are
+# written with call_export_function to every file type. Reports rows/sec, MB/s (of the written file and of the
+# DataFrame in memory) and the peak memory the export adds. Every case runs in its own process.
+# Usage: python benchmarks/bench_exporters.py [--rows 20000] [--widths 5,20,80] [--kinds numeric,text,mixed]
+#        [--nulls 0,0.3] [--formats csv,json,parquet,sql,excel,deltalake] [--report out.json]
+import sys, os, io, json, time, argparse, contextlib, subprocess, tempfile, threading
+sys.path.append(os.path.abspath("."))
+
+FORMATS = ["csv", "json", "parquet", "sql", "excel", "deltalake"]
+KINDS = ["numeric", "text", "mixed"]
+SAMPLE_INTERVAL = 0.005  # seconds between RSS samples during an export
+
+
+def make_frame(rows, width, kind, null_fraction, seed=1):
+    """A DataFrame like a generated table: ints, floats, strings, dates and booleans, with null_fraction of nulls."""
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    words = np.array(["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "o'neil", "zulu"], dtype=object)
+    makers = {
+        "int": lambda: pd.array(rng.integers(0, 1_000_000, rows), dtype="Int64"),
+        "float": lambda: rng.uniform(-1000, 1000, rows).round(2),
+        "text": lambda: pd.Series(words[rng.integers(0, len(words), rows)] + " " + rng.integers(0, 10_000, rows).astype(str).astype(object)),
+        "date": lambda: pd.Series(pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D")).dt.date,
+        "bool": lambda: pd.Series(rng.integers(0, 2, rows).astype(bool), dtype="boolean"),
+    }
+    cycle = {"numeric": ["int", "float"], "text": ["text"], "mixed": ["int", "float", "text", "date", "bool"]}[kind]
+    columns = {}
+    for i in range(width):
+        series = pd.Series(makers[cycle[i % len(cycle)]]())
+        if null_fraction > 0:
+            series[rng.random(rows) < null_fraction] = None
+        columns[f"c{i}_{cycle[i % len(cycle)]}"] = series
+    frame = pd.DataFrame(columns)
+    frame.Name = "bench"
+    return frame
+
+
+class PeakRss:
+    """Peak RSS of this process while the block runs, sampled by a thread."""
+
+    def __enter__(self):
+        import psutil
+        self.process = psutil.Process()
+        self.before = self.peak = self.process.memory_info().rss
+        self.running = True
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def _sample(self):
+        while self.running:
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            time.sleep(SAMPLE_INTERVAL)
+
+    def __exit__(self, *exc):
+        self.running = False
+        self.thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+def run_case(file_type, rows, width, kind, null_fraction):
+    from tablefaker import util
+    from tablefaker.run_stats import path_size
+    from tablefaker.tablefaker import TableFaker
+    util.configure_logging(quiet=True)
+    frame = make_frame(rows, width, kind, null_fraction)
+    frame_bytes = int(frame.memory_usage(deep=True).sum())
+    table_faker = TableFaker()
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        file_path = os.path.join(directory, "bench" + util.get_file_extension(file_type))
+        with PeakRss() as memory:
+            start = time.perf_counter()
+            table_faker.call_export_function(frame, file_type, file_path)
+            seconds = time.perf_counter() - start
+        output_bytes = path_size(file_path)
+    return {
+        "seconds": round(seconds, 4),
+        "rows_per_sec": rows / seconds,
+        "output_mb_per_sec": output_bytes / 2**20 / seconds,
+        "frame_mb_per_sec": frame_bytes / 2**20 / seconds,
+        "output_bytes": output_bytes,
+        "frame_bytes": frame_bytes,
+        "export_memory_bytes": memory.peak - memory.before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="exporter throughput benchmark")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--widths", default="5,20,80", help="comma separated column counts")
+    parser.add_argument("--kinds", default=",".join(KINDS), help="comma separated column kinds: numeric, text, mixed")
+    parser.add_argument("--nulls", default="0,0.3", help="comma separated null fractions")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="comma separated file types")
+    parser.add_argument("--report", default=None, help="write the results as JSON to this file")
+    parser.add_argument("--case", default=None, help=argparse.SUPPRESS)  # file_type:rows:width:kind:nulls, run by the benchmark itself
+    args = parser.parse_args()
+
+    if args.case:
+        file_type, rows, width, kind, null_fraction = args.case.split(":")
+        print(json.dumps(run_case(file_type, int(rows), int(width), kind, float(null_fraction))))
+        return
+
+    results = []
+    print(f"{'format':<10} {'width':>5} {'kind':<8} {'nulls':>5} {'rows/s':>10} {'file MB/s':>10} {'frame MB/s':>10} {'file MB':>8} {'export MB':>9}")
+    for width in [int(width) for width in args.widths.split(",")]:
+        for kind in args.kinds.split(","):
+            for null_fraction in [float(nulls) for nulls in args.nulls.split(",")]:
+                for file_type in args.formats.split(","):
+                    case = {"format": file_type, "rows": args.rows, "width": width, "kind": kind, "nulls": null_fraction}
+                    process = subprocess.run([sys.executable, __file__, "--case", f"{file_type}:{args.rows}:{width}:{kind}:{null_fraction}"],
+                                             capture_output=True, text=True)
+                    if process.returncode != 0:
+                        lines = process.stderr.strip().splitlines()
+                        case["error"] = lines[-1] if lines else f"exit status {process.returncode}"
+                        print(f"{file_type:<10} {width:>5} {kind:<8} {null_fraction:>5g} failed: {case['error']}")
+                    else:
+                        case.update(json.loads(process.stdout.strip().splitlines()[-1]))
+                        print(f"{file_type:<10} {width:>5} {kind:<8} {null_fraction:>5g} {case['rows_per_sec']:>10,.0f} {case['output_mb_per_sec']:>10.1f} "
+                              f"{case['frame_mb_per_sec']:>10.1f} {case['output_bytes'] / 2**20:>8.1f} {case['export_memory_bytes'] / 2**20:>9.1f}")
+                    results.append(case)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Foreign key benchmark: rows/sec of an FK-heavy fact table generated through to_pandas.
+# Usage: python benchmarks/bench_foreign_keys.py [--parents 10000] [--rows 50000] [--engine interpreter] [--per-row] [--unique]
+# --per-row passes the distribution through a variable so foreign_key runs once per row instead of once per chunk.
+# --unique benchmarks a 1:1 child instead: one is_unique foreign key per row, rows capped at the parent count.
+import sys, os, io, time, argparse, contextlib
+sys.path.append(os.path.abspath("."))
+
+from tablefaker.tablefaker import TableFaker
+
+
+def fact_table_config(parent_count, row_count, per_row=False):
+    zipf, weighted = ('str("zipf")', 'str("weighted_parent")') if per_row else ('"zipf"', '"weighted_parent"')
+    return {
+        "version": 1,
+        "config": {"locale": "en_US", "seed": 1},
+        "tables": [
+            {
+                "table_name": "customers",
+                "row_count": parent_count,
+                "columns": [
+                    {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                    {"column_name": "tier", "data": 'random.choice(["gold", "silver", "bronze"])'},
+                ],
+            },
+            {
+                "table_name": "products",
+                "row_count": parent_count,
+                "columns": [{"column_name": "product_id", "data": "row_id * 10", "is_primary_key": True}],
+            },
+            {
+                "table_name": "sales",
+                "row_count": row_count,
+                "columns": [
+                    {"column_name": "sale_id", "data": "row_id", "is_primary_key": True},
+                    {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id")'},
+                    {"column_name": "product_id", "data": f'foreign_key("products", "product_id", distribution={zipf}, param=1.1)'},
+                    {"column_name": "vip_customer_id", "data": f'foreign_key("customers", "customer_id", distribution={weighted}, parent_attr="tier", weights={{"gold": 5, "silver": 2, "bronze": 1}})'},
+                ],
+            },
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="foreign key generation benchmark")
+    parser.add_argument("--parents", type=int, default=10000)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--engine", default="interpreter")
+    parser.add_argument("--per-row", action="store_true")
+    parser.add_argument("--unique", action="store_true")
+    args = parser.parse_args()
+
+    cfg = fact_table_config(args.parents, args.rows, args.per_row)
+    if args.unique:
+        args.rows = min(args.rows, args.parents)
+        cfg["tables"][2]["row_count"] = args.rows
+        cfg["tables"][2]["columns"] = [
+            {"column_name": "sale_id", "data": "row_id", "is_primary_key": True},
+            {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id", is_unique=True)'},
+        ]
+    with contextlib.redirect_stdout(io.StringIO()):
+        tf = TableFaker()
+        tf.to_pandas(cfg, table_name="customers", engine=args.engine)
+        tf.to_pandas(cfg, table_name="products", engine=args.engine)
+        start = time.perf_counter()
+        tf.to_pandas(cfg, table_name="sales", engine=args.engine)
+        elapsed = time.perf_counter() - start
+    print(f"engine={args.engine} per_row={args.per_row} unique={args.unique} parents={args.parents} rows={args.rows} elapsed={elapsed:.2f}s rows/sec={args.rows / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
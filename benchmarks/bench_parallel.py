@@ -0,0 +1,61 @@
+# Parallel chunk benchmark: rows/sec of a chunked csv export with 1..N worker processes.
+# Usage: python benchmarks/bench_parallel.py [--rows 100000] [--chunks 16] [--workers 1 2 4 8]
+import sys, os, io, time, argparse, contextlib, tempfile
+sys.path.append(os.path.abspath("."))
+
+from tablefaker.tablefaker import TableFaker
+
+
+def chunked_config(row_count, chunk_count):
+    return {
+        "version": 1,
+        "config": {"locale": "en_US", "seed": 1},
+        "tables": [
+            {
+                "table_name": "customers",
+                "row_count": 1000,
+                "columns": [
+                    {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                    {"column_name": "name", "data": "fake.name()"},
+                ],
+            },
+            {
+                "table_name": "orders",
+                "row_count": row_count,
+                "export_file_count": chunk_count,
+                "columns": [
+                    {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                    {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id")'},
+                    {"column_name": "product", "data": "fake.word()"},
+                    {"column_name": "quantity", "data": "random.randint(1, 10)"},
+                    {"column_name": "price", "data": "round(random.uniform(1, 500), 2)"},
+                    {"column_name": "total", "data": "round(quantity * price, 2)"},
+                ],
+            },
+        ],
+    }
+
+
+def run(row_count, chunk_count, workers):
+    cfg = chunked_config(row_count, chunk_count)
+    with tempfile.TemporaryDirectory() as target, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        TableFaker().to_target("csv", cfg, target, table_name=None, workers=workers)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="parallel chunk generation benchmark")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--chunks", type=int, default=16)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"cpu count: {os.cpu_count()}")
+    for workers in args.workers:
+        elapsed = run(args.rows, args.chunks, workers)
+        print(f"workers={workers} rows={args.rows} chunks={args.chunks} elapsed={elapsed:.2f}s rows/sec={args.rows / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Parent cache benchmark: memory of full parent row dicts vs the compact ParentCache.
+# Usage: python benchmarks/bench_parent_cache.py [--rows 500000] [--columns 12]
+import sys, os, argparse, tracemalloc
+sys.path.append(os.path.abspath("."))
+
+from tablefaker.parent_cache import ParentCache
+
+
+def parent_rows(row_count, column_count):
+    for row_id in range(1, row_count + 1):
+        row = {"customer_id": row_id, "email": f"user{row_id}@example.com", "tier": ("gold", "silver")[row_id % 2]}
+        for i in range(column_count - 3):
+            row[f"attr_{i}"] = row_id * 0.5 + i
+        yield row
+
+
+def measure(build):
+    tracemalloc.start()
+    cache = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return cache, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="parent cache memory benchmark")
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--columns", type=int, default=12)
+    args = parser.parse_args()
+
+    def full_rows():
+        cache = {}
+        for row in parent_rows(args.rows, args.columns):
+            cache[row["customer_id"]] = row
+        return cache
+
+    def compact():
+        cache = ParentCache(["customer_id"], ["email", "tier"])
+        for row in parent_rows(args.rows, args.columns):
+            cache.add_row(row)
+        cache.flush()
+        return cache
+
+    _, full_size = measure(full_rows)
+    _, compact_size = measure(compact)
+    print(f"rows={args.rows} columns={args.columns} referenced=2")
+    print(f"full row dicts: {full_size / 2**20:,.1f} MB")
+    print(f"ParentCache:    {compact_size / 2**20:,.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Parquet export benchmark: time and peak memory of to_parquet, which builds an Arrow table without a DataFrame.
+# Usage: python benchmarks/bench_parquet_export.py [--rows 300000] [--engine vectorized]
+import sys, os, io, time, argparse, contextlib, resource, tempfile
+sys.path.append(os.path.abspath("."))
+
+from tablefaker.tablefaker import TableFaker
+
+
+def parquet_config(row_count):
+    return {
+        "version": 1,
+        "config": {"locale": "en_US", "seed": 1},
+        "tables": [
+            {
+                "table_name": "readings",
+                "row_count": row_count,
+                "columns": [
+                    {"column_name": "reading_id", "data": "row_id", "is_primary_key": True, "type": "int64"},
+                    {"column_name": "sensor_id", "data": "random.randint(1, 500)", "type": "int32", "parquet_type": "int16"},
+                    {"column_name": "value", "data": "round(random.uniform(-50, 50), 3)", "parquet_type": "decimal128(8, 3)"},
+                    {"column_name": "gain", "data": "random.uniform(0, 1)", "type": "float64", "parquet_type": "float32"},
+                    {"column_name": "site", "data": 'random.choice(["north", "south", "east", "west"])', "type": "string"},
+                    {"column_name": "label", "data": 'f"reading-{row_id}"'},
+                    {"column_name": "batch", "data": "row_id // 1000"},
+                ],
+            },
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="parquet export benchmark")
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--engine", default="vectorized")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as target_dir, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        TableFaker().to_target("parquet", parquet_config(args.rows), target_dir, engine=args.engine)
+        elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"engine={args.engine} rows={args.rows} elapsed={elapsed:.2f}s rows/sec={args.rows / elapsed:,.0f} peak_rss={peak:,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
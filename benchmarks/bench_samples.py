@@ -0,0 +1,165 @@
+# Generation benchmark over the sample schemas in samples/: every sample at several scale factors, through
+# to_pandas and every file_type. Records rows/sec, peak memory and output size per case and compares them with a
+# stored baseline (benchmarks/baseline.json), exiting with status 1 when a case regressed.
+# Every case runs in its own process, so its peak memory is not hidden by the cases before it.
+# Usage: python benchmarks/bench_samples.py [--samples bank,hotel] [--scales 1,2] [--outputs pandas,csv]
+#        [--repeat 3] [--tolerance 0.25] [--baseline benchmarks/baseline.json] [--update-baseline] [--report out.json]
+import sys, os, io, json, time, argparse, contextlib, platform, subprocess, tempfile
+sys.path.append(os.path.abspath("."))
+
+SAMPLES_DIR = "samples"
+BASELINE = os.path.join("benchmarks", "baseline.json")
+MEMORY_SLACK = 16 * 2**20  # memory growth below this is allocator noise
+OUTPUTS = ["pandas", "csv", "json", "parquet", "sql", "excel", "deltalake"]
+
+
+def sample_names():
+    return sorted(name for name in os.listdir(SAMPLES_DIR) if os.path.isfile(os.path.join(SAMPLES_DIR, name, f"{name}.yaml")))
+
+
+def scaled_config(sample, scale):
+    """The sample config with every row_count multiplied by scale, seeded so output sizes are comparable."""
+    import yaml
+    with open(os.path.join(SAMPLES_DIR, sample, f"{sample}.yaml")) as f:
+        config = yaml.safe_load(f)
+    config.setdefault("config", {}).setdefault("seed", 1)
+    for table in config["tables"]:
+        table["row_count"] = max(1, round((table["row_count"] if "row_count" in table else 10) * scale))
+    return config
+
+
+def run_case(sample, scale, output):
+    """Run one case in this process and return its measurements."""
+    import psutil
+    from tablefaker import util
+    from tablefaker.tablefaker import TableFaker
+    # python_import modules of the sample are imported from its folder
+    sys.path.insert(0, os.path.abspath(os.path.join(SAMPLES_DIR, sample)))
+    util.configure_logging(quiet=True)
+    config = scaled_config(sample, scale)
+    table_faker = TableFaker()
+    rss_before = psutil.Process().memory_info().rss
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if output == "pandas":
+            frames = table_faker.to_pandas(config, progress=False)
+        else:
+            table_faker.to_target(output, config, directory, progress=False)
+        seconds = time.perf_counter() - start
+        report = table_faker.run_stats.report()
+    if output == "pandas":
+        output_bytes = int(sum(frame.memory_usage(deep=True).sum() for frame in frames.values()))
+    else:
+        output_bytes = report["bytes_written"]
+    return {
+        "rows": report["rows"],
+        "seconds": round(seconds, 4),
+        "rows_per_sec": report["rows"] / seconds if seconds > 0 else None,
+        "peak_rss_bytes": report["peak_rss_bytes"],
+        # memory taken by the run itself, without the interpreter and imported modules
+        "run_memory_bytes": max(0, report["peak_rss_bytes"] - rss_before),
+        "output_bytes": output_bytes,
+    }
+
+
+def measure(sample, scale, output, repeat):
+    """Best rows/sec and lowest peak memory of repeat runs of a case, each in a new process."""
+    best = None
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, __file__, "--case", f"{sample}:{scale}:{output}"], capture_output=True, text=True)
+        if process.returncode != 0:
+            lines = process.stderr.strip().splitlines()
+            return {"error": lines[-1] if lines else f"exit status {process.returncode}"}
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        if best is None:
+            best = result
+        else:
+            best["rows_per_sec"] = max(best["rows_per_sec"], result["rows_per_sec"])
+            best["seconds"] = min(best["seconds"], result["seconds"])
+            best["peak_rss_bytes"] = min(best["peak_rss_bytes"], result["peak_rss_bytes"])
+            best["run_memory_bytes"] = min(best["run_memory_bytes"], result["run_memory_bytes"])
+    return best
+
+
+def compare(name, result, baseline, tolerance, size_tolerance):
+    """Regressions of a case against its baseline, as messages."""
+    if "error" in result:
+        return [f"{name}: failed: {result['error']}"] if "error" not in baseline else []
+    if "error" in baseline:
+        return []
+    problems = []
+    if result["rows_per_sec"] < baseline["rows_per_sec"] * (1 - tolerance):
+        problems.append(f"{name}: {result['rows_per_sec']:,.0f} rows/s, baseline {baseline['rows_per_sec']:,.0f} rows/s")
+    if result["run_memory_bytes"] > baseline["run_memory_bytes"] * (1 + tolerance) + MEMORY_SLACK:
+        problems.append(f"{name}: run memory {result['run_memory_bytes'] / 2**20:.1f} MB, baseline {baseline['run_memory_bytes'] / 2**20:.1f} MB")
+    if abs(result["output_bytes"] - baseline["output_bytes"]) > baseline["output_bytes"] * size_tolerance:
+        problems.append(f"{name}: output {result['output_bytes']:,} bytes, baseline {baseline['output_bytes']:,} bytes")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="generation benchmark over the sample schemas")
+    parser.add_argument("--samples", default=None, help="comma separated samples (default: every sample)")
+    # the hotel sample draws room ids from a fixed range, so it needs scales >= 1
+    parser.add_argument("--scales", default="1,2", help="comma separated row_count scale factors")
+    parser.add_argument("--outputs", default=",".join(OUTPUTS), help="comma separated outputs: pandas and file types")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case, the best is kept")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed rows/sec drop and run memory growth (fraction)")
+    parser.add_argument("--size-tolerance", type=float, default=0.05, help="allowed output size change (fraction)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--report", default=None, help="write the results as JSON to this file")
+    parser.add_argument("--case", default=None, help=argparse.SUPPRESS)  # sample:scale:output, run by the benchmark itself
+    args = parser.parse_args()
+
+    if args.case:
+        sample, scale, output = args.case.split(":")
+        print(json.dumps(run_case(sample, float(scale), output)))
+        return
+
+    samples = args.samples.split(",") if args.samples else sample_names()
+    scales = [float(scale) for scale in args.scales.split(",")]
+    outputs = args.outputs.split(",")
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["cases"]
+
+    results, problems = {}, []
+    print(f"{'case':<28} {'rows':>8} {'rows/s':>10} {'peak MB':>8} {'run MB':>8} {'output MB':>10} {'vs baseline':>12}")
+    for sample in samples:
+        for scale in scales:
+            for output in outputs:
+                name = f"{sample} x{scale:g} {output}"
+                result = results[name] = measure(sample, scale, output, args.repeat)
+                if "error" in result:
+                    print(f"{name:<28} failed: {result['error']}")
+                else:
+                    reference = baseline.get(name, {}).get("rows_per_sec")
+                    change = f"{100 * (result['rows_per_sec'] / reference - 1):+.1f}%" if reference else "-"
+                    print(f"{name:<28} {result['rows']:>8} {result['rows_per_sec']:>10,.0f} {result['peak_rss_bytes'] / 2**20:>8.1f} {result['run_memory_bytes'] / 2**20:>8.1f} "
+                          f"{result['output_bytes'] / 2**20:>10.2f} {change:>12}")
+                if name in baseline:
+                    problems += compare(name, result, baseline[name], args.tolerance, args.size_tolerance)
+
+    environment = {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system(), "cpus": os.cpu_count()}
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"environment": environment, "cases": results}, f, indent=2)
+    if args.update_baseline:
+        # cases not run this time keep their baseline
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": environment, "cases": {**baseline, **results}}, f, indent=2, sort_keys=True)
+        print(f"baseline is written to {args.baseline}")
+        return
+    if problems:
+        print(f"{len(problems)} regressions against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    if baseline:
+        print(f"no regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
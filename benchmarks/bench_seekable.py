@@ -0,0 +1,65 @@
+# Seekable generation benchmark: cost of per-cell reseeding, and reading the last rows of a
+# table with generate_rows instead of generating the whole table.
+# Usage: python benchmarks/bench_seekable.py [--rows 100000] [--tail 1000] [--engine codegen]
+import sys, os, io, time, copy, argparse, contextlib
+sys.path.append(os.path.abspath("."))
+
+from tablefaker.tablefaker import TableFaker
+
+
+def seekable_config(row_count, seekable):
+    return {
+        "version": 1,
+        "config": {"locale": "en_US", "seed": 1, "seekable": seekable},
+        "tables": [
+            {
+                "table_name": "customers",
+                "row_count": 1000,
+                "columns": [
+                    {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                    {"column_name": "name", "data": "fake.name()"},
+                ],
+            },
+            {
+                "table_name": "orders",
+                "row_count": row_count,
+                "columns": [
+                    {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                    {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id")'},
+                    {"column_name": "customer_name", "data": 'copy_from_fk("customers", "customer_id", "name")'},
+                    {"column_name": "product", "data": "fake.word()"},
+                    {"column_name": "quantity", "data": "random.randint(1, 20)"},
+                    {"column_name": "price", "data": "round(random.uniform(1, 500), 2)"},
+                    {"column_name": "total", "data": "round(quantity * price, 2)"},
+                ],
+            },
+        ],
+    }
+
+
+def timed(function):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = function()
+        return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="seekable generation benchmark")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--tail", type=int, default=1000)
+    parser.add_argument("--engine", default="codegen")
+    args = parser.parse_args()
+
+    _, plain = timed(lambda: TableFaker().to_pandas(seekable_config(args.rows, False), engine=args.engine))
+    full, seekable = timed(lambda: TableFaker().to_pandas(seekable_config(args.rows, True), engine=args.engine))
+    start = args.rows - args.tail
+    tail, seek = timed(lambda: TableFaker().generate_rows(seekable_config(args.rows, True), "orders", start, args.rows, engine=args.engine))
+    identical = tail.equals(full["orders"].iloc[start:].reset_index(drop=True))
+    print(f"engine={args.engine} rows={args.rows} plain={args.rows / plain:,.0f} rows/sec seekable={args.rows / seekable:,.0f} rows/sec "
+          f"overhead={seekable / plain - 1:.0%}")
+    print(f"last {args.tail} rows: generate_rows={seek:.2f}s full table={seekable:.2f}s identical={identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Streaming benchmark: peak memory of a csv export with and without batch_size.
+# Usage: python benchmarks/bench_streaming.py [--rows 200000] [--batch-size 10000]
+import sys, os, io, time, argparse, contextlib, tempfile, resource, subprocess
+sys.path.append(os.path.abspath("."))
+
+
+def streaming_config(row_count):
+    return {
+        "version": 1,
+        "config": {"locale": "en_US", "seed": 1},
+        "tables": [
+            {
+                "table_name": "events",
+                "row_count": row_count,
+                "columns": [
+                    {"column_name": "event_id", "data": "row_id", "is_primary_key": True},
+                    {"column_name": "user", "data": "fake.user_name()"},
+                    {"column_name": "kind", "data": 'random.choice(["view", "click", "buy"])'},
+                    {"column_name": "value", "data": "round(random.uniform(0, 100), 2)"},
+                ],
+            },
+        ],
+    }
+
+
+def run(row_count, batch_size):
+    """Export in this process and return (elapsed seconds, peak RSS in MB)."""
+    from tablefaker.tablefaker import TableFaker
+    kwargs = {} if batch_size is None else {"batch_size": batch_size}
+    with tempfile.TemporaryDirectory() as target, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        TableFaker().to_target("csv", streaming_config(row_count), target, **kwargs)
+        elapsed = time.perf_counter() - start
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="streaming export memory benchmark")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--single", choices=["full", "batched"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        elapsed, peak = run(args.rows, None if args.single == "full" else args.batch_size)
+        print(f"mode={args.single} rows={args.rows} elapsed={elapsed:.2f}s peak_rss={peak:,.0f} MB")
+        return
+
+    # one process per mode so the peak RSS of one run does not hide the other
+    for mode in ["full", "batched"]:
+        subprocess.run([sys.executable, __file__, "--rows", str(args.rows), "--batch-size", str(args.batch_size), "--single", mode], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Typed columns benchmark: time and peak memory of to_pandas for a table whose columns declare a type.
+# Usage: python benchmarks/bench_typed_columns.py [--rows 300000] [--engine vectorized]
+import sys, os, io, time, argparse, contextlib, resource
+sys.path.append(os.path.abspath("."))
+
+from tablefaker.tablefaker import TableFaker
+
+
+def typed_config(row_count):
+    return {
+        "version": 1,
+        "config": {"locale": "en_US", "seed": 1},
+        "tables": [
+            {
+                "table_name": "measurements",
+                "row_count": row_count,
+                "columns": [
+                    {"column_name": "measurement_id", "data": "row_id", "is_primary_key": True, "type": "int64"},
+                    {"column_name": "sensor_id", "data": "random.randint(1, 500)", "type": "int32"},
+                    {"column_name": "value", "data": "round(random.uniform(-50, 50), 3)", "type": "float64"},
+                    {"column_name": "gain", "data": "random.uniform(0, 1)", "type": "float32"},
+                    {"column_name": "offset", "data": "row_id % 1000", "type": "int16"},
+                    {"column_name": "unit", "data": 'random.choice(["C", "F", "K"])', "type": "string"},
+                    {"column_name": "batch", "data": "row_id // 1000"},
+                ],
+            },
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="typed column frame building benchmark")
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--engine", default="vectorized")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        df = TableFaker().to_pandas(typed_config(args.rows), engine=args.engine)["measurements"]
+        elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"engine={args.engine} rows={args.rows} elapsed={elapsed:.2f}s rows/sec={args.rows / elapsed:,.0f} peak_rss={peak:,.0f} MB frame={df.memory_usage(deep=True).sum() / 2**20:,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
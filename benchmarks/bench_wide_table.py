@@ -0,0 +1,56 @@
+# Wide-table benchmark: rows/sec of a 300-column table generated through to_pandas.
+# Usage: python benchmarks/bench_wide_table.py [--columns 300] [--rows 2000] [--engine codegen]
+import sys, os, io, time, argparse, contextlib
+sys.path.append(os.path.abspath("."))
+
+from tablefaker.tablefaker import TableFaker
+
+
+def wide_table_config(column_count, row_count):
+    columns = [{"column_name": "id", "data": "row_id", "is_primary_key": True}]
+    for i in range(column_count - 1):
+        kind = i % 6
+        if kind == 0:
+            data = "random.randint(1, 100)"
+        elif kind == 1:
+            data = "round(random.uniform(0, 1000), 2)"
+        elif kind == 2:
+            data = "fake.random_int(1, 1000)"
+        elif kind == 3:
+            data = f"col_{i - 3} + col_{i - 1}"
+        elif kind == 4:
+            data = "random.choice(['a', 'b', 'c'])"
+        else:
+            data = f"col_{i - 1} * 2 if col_{i - 2} == 'a' else col_{i - 1}"
+        columns.append({"column_name": f"col_{i}", "data": data})
+
+    return {
+        "version": 1,
+        "config": {"locale": "en_US", "seed": 1},
+        "tables": [{"table_name": "wide", "row_count": row_count, "columns": columns}],
+    }
+
+
+def run(column_count, row_count, engine="interpreter"):
+    cfg = wide_table_config(column_count, row_count)
+    tf = TableFaker()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        tf.to_pandas(cfg, engine=engine)
+        elapsed = time.perf_counter() - start
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="wide table generation benchmark")
+    parser.add_argument("--columns", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--engine", default="interpreter")
+    args = parser.parse_args()
+
+    elapsed = run(args.columns, args.rows, args.engine)
+    print(f"engine={args.engine} columns={args.columns} rows={args.rows} elapsed={elapsed:.2f}s rows/sec={args.rows / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
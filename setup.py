@@ -1,11 +1,16 @@
+import re
 from setuptools import setup, find_packages
 
 with open("README.md") as file:
     description = file.read()
 
+# the version is kept in tablefaker/__init__.py only, the plan cache and run reports read it from there
+with open("tablefaker/__init__.py") as file:
+    version = re.search(r'^__version__ = "([^"]+)"', file.read(), re.M).group(1)
+
 setup(
     name='tablefaker',
-    version='1.11.1',
+    version=version,
     description='A Python package to generate fake tabular data. Get data in pandas dataframe or export to Parquet, DeltaLake, Csv, Json, Excel or Sql',
     long_description = description,
     long_description_content_type = "text/markdown",
@@ -1,5 +1,8 @@
-from .tablefaker import to_csv, to_excel, to_json, to_pandas, to_parquet, to_target, to_sql, to_deltalake, yaml_to_json, avro_to_yaml, csv_to_yaml
+__version__ = "1.11.1"
+
+from .tablefaker import to_csv, to_excel, to_json, to_pandas, to_arrow, to_parquet, to_target, to_sql, to_deltalake, to_database, iter_batches, generate_rows, yaml_to_json, avro_to_yaml, csv_to_yaml
 from .relationships import generate_relationships
 from .semantic_view import generate_semantic_view
 from .semantic_model_metrics import generate_model_metrics
-from .llm_client import LLMClient, create_sample_config
\ No newline at end of file
+from .llm_client import LLMClient, create_sample_config
+from .util import configure_logging
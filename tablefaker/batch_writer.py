@@ -0,0 +1,158 @@
+# streaming exporters: write a table batch by batch so only one batch is in memory
+import importlib.util
+import pandas as pd
+from .sql_writer import SqlWriter
+
+
+class BatchWriter:
+    """Write the DataFrame batches of one table to one target file."""
+
+    arrow = False  # True when the batches are pyarrow Tables instead of DataFrames
+
+    def __init__(self, table_faker, file_path):
+        self.table_faker = table_faker
+        self.file_path = file_path
+        self.batch_count = 0
+
+    def write(self, data_frame):
+        self._write(data_frame)
+        self.batch_count += 1
+
+    def _write(self, data_frame):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class CsvBatchWriter(BatchWriter):
+    def _write(self, data_frame):
+        mode = "w" if self.batch_count == 0 else "a"
+        data_frame.to_csv(self.file_path, index=False, mode=mode, header=self.batch_count == 0)
+
+
+class JsonBatchWriter(BatchWriter):
+    """Writes the same indented records array as DataFrame.to_json, one batch of records at a time."""
+
+    def __init__(self, table_faker, file_path):
+        super().__init__(table_faker, file_path)
+        self.file = open(file_path, "w")
+        self.file.write("[\n")
+        self.has_records = False
+
+    def _write(self, data_frame):
+        if len(data_frame) == 0:
+            return
+        records = data_frame.to_json(None, index=False, indent=4, orient='records', date_format='iso')
+        records = records[len("[\n"):-len("\n]")]
+        if self.has_records:
+            self.file.write(",\n")
+        self.file.write(records)
+        self.has_records = True
+
+    def close(self):
+        self.file.write("\n]")
+        self.file.close()
+
+
+class ParquetBatchWriter(BatchWriter):
+    """Appends every batch as row groups of one parquet file, using the schema of the first batch."""
+
+    arrow = True
+
+    def __init__(self, table_faker, file_path):
+        super().__init__(table_faker, file_path)
+        self.schema = None
+        self.writer = None
+
+    def _write(self, table):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = self.table_faker._to_arrow_table(table)
+        if self.writer is None:
+            self.schema = table.schema
+            self.writer = pq.ParquetWriter(self.file_path, self.schema)
+        try:
+            table = table.cast(self.schema, safe=False)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as error:
+            raise Exception(f"Batch {self.batch_count + 1} of {self.file_path} does not match the parquet schema of the first batch. "
+                            f"Set parquet_type on the column to fix its type. {error}")
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class ExcelBatchWriter(BatchWriter):
+    """Appends batches below each other in one sheet (openpyxl keeps the workbook in memory until close)."""
+
+    def __init__(self, table_faker, file_path):
+        super().__init__(table_faker, file_path)
+        self.writer = pd.ExcelWriter(file_path)
+        self.start_row = 0
+
+    def _write(self, data_frame):
+        header = self.batch_count == 0
+        data_frame.to_excel(self.writer, index=False, header=header, startrow=self.start_row)
+        self.start_row += len(data_frame) + (1 if header else 0)
+
+    def close(self):
+        self.writer.close()
+
+
+class SqlBatchWriter(BatchWriter):
+    """Streams the batches into the same INSERT statements (or COPY block) as to_sql_internal, see sql_writer.SqlWriter."""
+
+    def __init__(self, table_faker, file_path, sql_options=None):
+        super().__init__(table_faker, file_path)
+        self.sql_options = sql_options or {}
+        self.writer = None
+
+    def _write(self, data_frame):
+        if self.writer is None:
+            self.writer = SqlWriter(self.file_path, data_frame.Name, **self.sql_options)
+        self.writer.write(data_frame)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class DeltaLakeBatchWriter(BatchWriter):
+    """Overwrites the delta table with the first batch and appends the others."""
+
+    arrow = True
+
+    def __init__(self, table_faker, file_path):
+        super().__init__(table_faker, file_path)
+        if not importlib.util.find_spec("deltalake"):
+            raise Exception("deltalake package is not installed. install it with pip install deltalake")
+
+    def _write(self, table):
+        deltalake = __import__("deltalake")
+        mode = "overwrite" if self.batch_count == 0 else "append"
+        deltalake.writer.write_deltalake(self.file_path, table, mode=mode)
+
+
+BATCH_WRITERS = {
+    "csv": CsvBatchWriter,
+    "json": JsonBatchWriter,
+    "parquet": ParquetBatchWriter,
+    "excel": ExcelBatchWriter,
+    "sql": SqlBatchWriter,
+    "deltalake": DeltaLakeBatchWriter,
+}
+
+
+def writes_arrow(file_type):
+    """True when a file type is written from pyarrow Tables."""
+    return file_type in BATCH_WRITERS and BATCH_WRITERS[file_type].arrow
+
+
+def get_batch_writer(file_type, table_faker, file_path, sql_options=None):
+    if file_type not in BATCH_WRITERS:
+        raise Exception(f"Wrong file_type = {file_type}")
+    if file_type == "sql":
+        return SqlBatchWriter(table_faker, file_path, sql_options)
+    return BATCH_WRITERS[file_type](table_faker, file_path)
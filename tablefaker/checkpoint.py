@@ -0,0 +1,103 @@
+# checkpoint directory of an export: completed tables and chunks, so a resumed run picks up where one stopped
+import hashlib
+import json
+import os
+import pickle
+import random
+from os import path
+
+MANIFEST = "manifest.json"
+
+
+def fingerprint(*parts):
+    """Hash of the config and options of a run; a checkpoint only resumes a run with the same fingerprint."""
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    """
+    Progress of a to_target run, kept in a directory.
+
+    manifest.json holds the run seed and, for every table, its export file
+    path, the chunks already exported and whether the table is done. The key
+    caches of every exported chunk (primary keys, parent attributes, rows read
+    by get_table) are pickled next to it; once a table is done they are
+    replaced by one pickle of the caches of the whole table. A resumed run
+    restores these caches instead of generating the rows again.
+    """
+
+    def __init__(self, directory, run_fingerprint, seed=None, resume=False):
+        self.directory = directory
+        self.manifest_path = path.join(directory, MANIFEST)
+        if resume:
+            if not path.exists(self.manifest_path):
+                raise Exception(f"No checkpoint to resume in {directory}")
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+            if self.manifest["fingerprint"] != run_fingerprint:
+                raise Exception(f"Checkpoint in {directory} was written for another config or other options, it cannot be resumed")
+        else:
+            os.makedirs(directory, exist_ok=True)
+            for file_name in os.listdir(directory):
+                if file_name.endswith(".pkl"):
+                    os.remove(path.join(directory, file_name))
+            if seed is None:
+                # chunk seeds need a common base, also in the resumed run
+                seed = random.SystemRandom().randrange(2**32)
+            self.manifest = {"version": 1, "fingerprint": run_fingerprint, "seed": seed, "tables": {}}
+            self._write_manifest()
+        self.seed = self.manifest["seed"]
+
+    def _table(self, table_name):
+        return self.manifest["tables"].setdefault(table_name, {"file_path": None, "chunks": [], "done": False})
+
+    def _write_manifest(self):
+        # written to a temporary file first, so a crash never leaves half a manifest
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def _dump(self, file_name, value):
+        with open(path.join(self.directory, file_name), "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _load(self, file_name):
+        with open(path.join(self.directory, file_name), "rb") as f:
+            return pickle.load(f)
+
+    def file_path(self, table_name, file_path):
+        """Export path of a table: the one of the interrupted run when there is one, file_path otherwise."""
+        table = self._table(table_name)
+        if table["file_path"] is None:
+            table["file_path"] = file_path
+            self._write_manifest()
+        return table["file_path"]
+
+    def table_done(self, table_name):
+        return self._table(table_name)["done"]
+
+    def has_chunk(self, table_name, chunk_index):
+        return chunk_index in self._table(table_name)["chunks"]
+
+    def save_chunk(self, table_name, chunk_index, caches):
+        """Record an exported chunk with its key caches."""
+        self._dump(f"{table_name}.chunk{chunk_index}.pkl", caches)
+        self._table(table_name)["chunks"].append(chunk_index)
+        self._write_manifest()
+
+    def load_chunk(self, table_name, chunk_index):
+        return self._load(f"{table_name}.chunk{chunk_index}.pkl")
+
+    def save_table(self, table_name, caches):
+        """Record a finished table with the key caches of all its rows; its chunk caches are dropped."""
+        self._dump(f"{table_name}.pkl", caches)
+        table = self._table(table_name)
+        chunks, table["chunks"], table["done"] = table["chunks"], [], True
+        self._write_manifest()
+        for chunk_index in chunks:
+            os.remove(path.join(self.directory, f"{table_name}.chunk{chunk_index}.pkl"))
+
+    def load_table(self, table_name):
+        return self._load(f"{table_name}.pkl")
@@ -4,13 +4,33 @@ from . import relationships
 from . import semantic_view
 # from . import semantic_view_enhanced
 from . import semantic_model_metrics
+from . import util
 
 def main():
     parser = argparse.ArgumentParser(description=get_description())
     parser.add_argument('--config', required=False, help='Config yaml file path (required for data generation, relationships, and semantic views)')
-    parser.add_argument('--file_type', required=False, help='Target file type (csv,json,parquet,excel)')
-    parser.add_argument('--target', required=False, help='Target folder/file')
+    parser.add_argument('--file_type', required=False, help='Target file type (csv,json,parquet,excel,deltalake,sql) or database')
+    parser.add_argument('--target', required=False, help='Target folder/file, or the sqlite file / sqlite:/// or SQLAlchemy URL of --file_type database')
     parser.add_argument('--seed', type=int, required=False, help='Override seed value for deterministic output')
+    parser.add_argument('--engine', required=False, choices=['interpreter', 'codegen', 'vectorized'], help='Row engine: interpreter (default), codegen (one generated function per table) or vectorized (NumPy columns)')
+    parser.add_argument('--jobs', type=int, required=False, help='Number of worker processes generating export chunks in parallel')
+    parser.add_argument('--seekable', action='store_true', required=False, help='Derive every value from (seed, table, column, row id) so any row range can be generated on its own')
+    parser.add_argument('--shard', required=False, help='Export only shard i of N (e.g. 2/8) of every table; the N shard outputs together equal a single run (implies --seekable)')
+    parser.add_argument('--checkpoint', required=False, help='Directory recording the exported tables and chunks, so an interrupted export can be resumed')
+    parser.add_argument('--resume', action='store_true', required=False, help='Resume the export recorded in --checkpoint at its first unfinished chunk')
+    parser.add_argument('--cache-dir', nargs='?', const='.tablefaker_cache', required=False, help='Cache the parsed config, its analysis and compiled expressions in this directory (default .tablefaker_cache) for the next runs')
+    parser.add_argument('--no-progress', action='store_true', required=False, help='Do not report progress (rows/sec and ETA per table)')
+    parser.add_argument('--progress-interval', type=float, required=False, help='Seconds between progress updates (default 0.2 on a terminal, 10 otherwise)')
+    parser.add_argument('--run-report', required=False, help='Write a JSON run report (timings, rows/sec, bytes written, CPU and peak memory per table and chunk) to this file')
+    parser.add_argument('--sql-batch-size', type=int, required=False, help='Rows per INSERT statement of sql exports (default: 1000)')
+    parser.add_argument('--sql-dialect', required=False, choices=['postgres', 'mysql', 'sqlite', 'snowflake'], help='Quote identifiers and write booleans for this database in sql exports (default: identifiers as provided)')
+    parser.add_argument('--sql-format', required=False, choices=['insert', 'copy'], help='sql exports as INSERT statements (default) or a Postgres COPY ... FROM stdin block')
+    parser.add_argument('--if-exists', required=False, choices=['fail', 'replace', 'append'], help='What --file_type database does with a table that exists: fail (default), replace (drop it) or append')
+    parser.add_argument('--profile', nargs='?', const=True, required=False, help='Report the time and calls of every column expression, plugin function and export stage, sorted by time; with a file path also written there as JSON')
+    parser.add_argument('--profile-sample', type=float, required=False, help='Fraction of rows timed by --profile (e.g. 0.01), times are extrapolated (default: 1, every row)')
+    parser.add_argument('--quiet', action='store_true', required=False, help='Only log warnings and errors, without progress')
+    parser.add_argument('--log-level', required=False, choices=['debug', 'info', 'warning', 'error'], help='Log level (default: info)')
+    parser.add_argument('--log-format', required=False, choices=['text', 'json'], help='Log lines as colored text (default) or one JSON object per line')
     parser.add_argument('--infer-attrs', type=str, required=False, choices=['true', 'false'], help='Override infer_entity_attrs_by_name (true/false)')
     parser.add_argument('--relationships', action='store_true', required=False, help='Generate relationships YAML file')
     parser.add_argument('--semantic-view', action='store_true', required=False, help='Generate semantic view YAML file')
@@ -47,12 +67,47 @@ def main():
         target_file_path = "."  
 
 
+    util.configure_logging(level=args.log_level.upper() if args.log_level else None, log_format=args.log_format, quiet=args.quiet)
+
     # Prepare kwargs for overriding config values
     kwargs = {}
     if args.seed is not None:
         kwargs['seed'] = args.seed
     if hasattr(args, 'infer_attrs') and args.infer_attrs is not None:
         kwargs['infer_attrs'] = args.infer_attrs
+    if args.engine is not None:
+        kwargs['engine'] = args.engine
+    if args.jobs is not None:
+        kwargs['workers'] = args.jobs
+    if args.seekable:
+        kwargs['seekable'] = True
+    if args.shard is not None:
+        kwargs['shard'] = args.shard
+    if args.checkpoint is not None:
+        kwargs['checkpoint'] = args.checkpoint
+    if args.resume:
+        kwargs['resume'] = True
+    if args.cache_dir is not None:
+        kwargs['cache_dir'] = args.cache_dir
+    if args.run_report is not None:
+        kwargs['run_report'] = args.run_report
+    if args.sql_batch_size is not None:
+        kwargs['sql_batch_size'] = args.sql_batch_size
+    if args.sql_dialect is not None:
+        kwargs['sql_dialect'] = args.sql_dialect
+    if args.sql_format is not None:
+        kwargs['sql_format'] = args.sql_format
+    if args.if_exists is not None:
+        kwargs['if_exists'] = args.if_exists
+    if args.profile is not None:
+        kwargs['profile'] = args.profile
+    if args.profile_sample is not None:
+        kwargs['profile_sample'] = args.profile_sample
+        kwargs.setdefault('profile', True)
+    if args.no_progress:
+        kwargs['progress'] = False
+    if args.progress_interval is not None:
+        kwargs['progress_interval'] = args.progress_interval
 
     # Handle generate-metrics separately as it takes a semantic view file, not config
     if hasattr(args, 'generate_metrics') and args.generate_metrics:
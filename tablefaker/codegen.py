@@ -0,0 +1,243 @@
+# whole-row code generation: one Python function per table instead of one exec() per cell
+import ast
+import time
+import traceback
+from .row_plan import referenced_names
+from . import plan_cache
+
+ROW_FUNCTION_FILE = "<tablefaker-row>"
+BIND_ROOTS = ("fake", "random")
+
+
+class CodegenUnsupported(Exception):
+    """Raised when a table uses a construct the row code generator does not reproduce exactly."""
+
+
+class _RenameColumns(ast.NodeTransformer):
+    """Replace reads of column names with the generated local/parameter names."""
+
+    def __init__(self, names):
+        self.names = names
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load) and node.id in self.names:
+            return ast.copy_location(ast.Name(id=self.names[node.id], ctx=ast.Load()), node)
+        return node
+
+
+class _BindCalls(ast.NodeTransformer):
+    """
+    Replace call targets like fake.first_name or random.randint with names that
+    are bound once when the row function is built.
+    """
+
+    def __init__(self, variables, shadowed, bindings):
+        self.variables = variables
+        self.shadowed = shadowed
+        self.bindings = bindings  # bound name -> object
+
+    def _resolve(self, node):
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name) or node.id not in BIND_ROOTS or node.id in self.shadowed:
+            return None
+        if node.id not in self.variables or not parts:
+            return None
+        obj = self.variables[node.id]
+        if node.id == "fake" and len(getattr(obj, "_factories", ())) != 1:
+            # multi-locale Faker picks a locale (using randomness) on every attribute access
+            return None
+        try:
+            for attr in reversed(parts):
+                obj = getattr(obj, attr)
+        except Exception:
+            # leave the lookup in place so the error surfaces per row as before
+            return None
+        return obj
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        obj = self._resolve(node.func)
+        if obj is not None and callable(obj):
+            bound_name = f"_tf_b{len(self.bindings)}"
+            self.bindings[bound_name] = obj
+            node.func = ast.copy_location(ast.Name(id=bound_name, ctx=ast.Load()), node.func)
+        return node
+
+
+class _RewriteCopyFromFk(ast.NodeTransformer):
+    """copy_from_fk(parent, "fk_col", attr) -> _tf_copy_from_fk(parent, <fk_col value>, attr)."""
+
+    def __init__(self, names):
+        self.names = names
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if not isinstance(node.func, ast.Name) or node.func.id != "copy_from_fk":
+            return node
+        if len(node.args) != 3 or node.keywords:
+            raise CodegenUnsupported("copy_from_fk must be called with three positional arguments")
+        fk_arg = node.args[1]
+        if not isinstance(fk_arg, ast.Constant) or fk_arg.value not in self.names:
+            raise CodegenUnsupported("copy_from_fk foreign key column must be a column name literal")
+        node.func = ast.copy_location(ast.Name(id="_tf_copy_from_fk", ctx=ast.Load()), node.func)
+        node.args[1] = ast.copy_location(ast.Name(id=self.names[fk_arg.value], ctx=ast.Load()), fk_arg)
+        return node
+
+
+def _check_no_shadowing(tree, columns):
+    """Renamed column names must not be rebound inside an expression (comprehension targets, lambdas, walrus)."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load) and node.id in columns:
+            raise CodegenUnsupported(f"expression rebinds column name {node.id}")
+        if isinstance(node, ast.arg) and node.arg in columns:
+            raise CodegenUnsupported(f"expression rebinds column name {node.arg}")
+
+
+def _uses_name(tree, name):
+    return any(isinstance(node, ast.Name) and node.id == name for node in ast.walk(tree))
+
+
+class RowFunction:
+    """A generated function returning one row dict, plus the line map used for error messages."""
+
+    def __init__(self, func, source, line_commands):
+        self.func = func
+        self.source = source
+        self.line_commands = line_commands  # line number in source -> column data expression
+
+    def __call__(self, row_id):
+        return self.func(row_id)
+
+    def column_error(self, error):
+        """Translate an error raised by the row function the way the interpreter reports it."""
+        command = None
+        for frame, lineno in traceback.walk_tb(error.__traceback__):
+            if frame.f_code.co_filename == ROW_FUNCTION_FILE and frame.f_code.co_name == "_tf_row":
+                command = self.line_commands.get(lineno)
+        if command is None:
+            return error
+        if isinstance(error, AttributeError):
+            return RuntimeError(f"Attribute can not be found. {command} \n {error}")
+        if isinstance(error, NameError):
+            return RuntimeError(f"Function can not be found. {command} \n {error}")
+        return error
+
+
+def build_row_function(plan, variables, pk_appenders, copy_from_fk_value, row_streams=None, cell_seeds=None, column_timer=None):
+    """
+    Compile all column expressions of a table into one Python function.
+
+    Column values live in fast locals (_tf_c0, _tf_c1, ...), multi-line `return`
+    blocks become helper functions receiving the columns they read as arguments,
+    and call targets under fake./random. are resolved once. Evaluation order
+    follows the row plan so the output matches the interpreter for a given seed.
+
+    Args:
+        plan: RowPlan of the table
+        variables: evaluation environment (used as globals of the generated code)
+        pk_appenders: column_name -> callable recording a primary key value
+        copy_from_fk_value: callable(parent_table, fk_value, parent_attr)
+        row_streams: rng.Streams selected for every column reading rng, or None
+        cell_seeds: rng.CellSeeds selected before every column it reseeds (seekable mode), or None
+        column_timer: callable(column_name, seconds) timing every column of the row (profiling), or None
+
+    Raises CodegenUnsupported when the table must run through the interpreter.
+    """
+    columns = plan.columns
+    column_names = {c["column_name"] for c in columns}
+    locals_by_name = {}
+    for index, col in enumerate(columns):
+        locals_by_name.setdefault(col["column_name"], f"_tf_c{index}")
+
+    bindings = {}
+    closure_values = {}
+    helper_lines = []
+    row_lines = []      # (source line, column data expression)
+
+    for index, col in enumerate(columns):
+        column_name = col["column_name"]
+        command = col["data"]
+        deps = plan.dependencies[column_name]
+        renames = {name: locals_by_name[name] for name in deps}
+
+        if command == "auto":
+            raise CodegenUnsupported(f"column {column_name} has unresolved data='auto'")
+
+        try:
+            if isinstance(command, str) and "return " in command:
+                func_inner_code = "\n".join(["    " + line for line in command.split("\n")])
+                tree = ast.parse(f"def _tf_f{index}():\n{func_inner_code}")
+                _check_no_shadowing(tree, deps)
+                params = sorted(deps)
+                param_names = {name: f"_tf_p{i}" for i, name in enumerate(params)}
+                tree.body[0].args.args = [ast.arg(arg=param_names[name]) for name in params]
+                tree = _RewriteCopyFromFk(param_names).visit(tree)
+                tree = _RenameColumns(param_names).visit(tree)
+                expr_source = f"_tf_f{index}({', '.join(renames[name] for name in params)})"
+            else:
+                tree = ast.parse(f"{command}", mode="eval")
+                _check_no_shadowing(tree, column_names)
+                tree = _RewriteCopyFromFk(locals_by_name).visit(tree)
+                tree = _RenameColumns(renames).visit(tree)
+                expr_source = None
+        except SyntaxError as error:
+            raise CodegenUnsupported(f"column {column_name} is not a single expression: {error}")
+
+        if _uses_name(tree, "copy_from_fk"):
+            raise CodegenUnsupported("copy_from_fk is used without being called")
+        tree = _BindCalls(variables, column_names, bindings).visit(tree)
+        ast.fix_missing_locations(tree)
+
+        if expr_source is None:
+            expr_source = ast.unparse(tree)
+        else:
+            helper_lines.extend("    " + line for line in ast.unparse(tree).split("\n"))
+
+        local_name = f"_tf_c{index}"
+        column_lines = []
+        if row_streams is not None and "rng" in referenced_names(command):
+            column_lines.append(f"_tf_rng.select({column_name!r}, row_id)")
+        if cell_seeds is not None and cell_seeds.reseeds(column_name):
+            column_lines.append(f"_tf_seeds.select({column_name!r}, row_id)")
+        column_lines.append(f"{local_name} = {expr_source}")
+        if column_name in referenced_names(command):
+            # the interpreter keeps the previous row's value visible under the column name
+            column_lines.append(f"_tf_env[{column_name!r}] = {local_name}")
+        if col.get("is_primary_key", False):
+            closure_values[f"_tf_pk{index}"] = pk_appenders[column_name]
+            column_lines.append(f"_tf_pk{index}({local_name})")
+        if column_timer is not None:
+            # on the column's own lines, so the timed function has the line map of the untimed one
+            column_lines[0] = f"_tf_started = _tf_clock(); {column_lines[0]}"
+            column_lines[-1] = f"{column_lines[-1]}; _tf_timer({column_name!r}, _tf_clock() - _tf_started)"
+        row_lines.extend((line, command) for line in column_lines)
+
+    items = ", ".join(f"{c['column_name']!r}: _tf_c{i}" for i, c in enumerate(columns))
+    row_lines.append((f"return {{{items}}}", None))
+
+    closure_values.update(bindings)
+    closure_values["_tf_env"] = variables
+    closure_values["_tf_copy_from_fk"] = copy_from_fk_value
+    if row_streams is not None:
+        closure_values["_tf_rng"] = row_streams
+    if cell_seeds is not None:
+        closure_values["_tf_seeds"] = cell_seeds
+    if column_timer is not None:
+        closure_values["_tf_timer"] = column_timer
+        closure_values["_tf_clock"] = time.perf_counter
+
+    lines = [f"def _tf_make_row({', '.join(closure_values)}):"] + helper_lines + ["    def _tf_row(row_id):"]
+    line_commands = {}
+    for line, command in row_lines:
+        lines.append("        " + line)
+        line_commands[len(lines)] = command
+    lines.append("    return _tf_row")
+    source = "\n".join(lines)
+
+    namespace = {}
+    exec(plan_cache.compiled(source, ROW_FUNCTION_FILE), variables, namespace)
+    func = namespace["_tf_make_row"](**closure_values)
+    return RowFunction(func, source, line_commands)
@@ -2,10 +2,16 @@ import yaml, json
 import pandas as pd
 from os import path
 from . import util
+from . import plan_cache
 import sys  # NEW
 
+# libyaml's C loader when PyYAML was built with it, same results as the pure-Python SafeLoader
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 class Config:
-    def __init__(self, source):
+    def __init__(self, source, cache_dir=None):
+        """Load a config file path or dict; with cache_dir, the parsed config and its analyses are cached there (see plan_cache)."""
+        self.plan_cache = None
         if isinstance(source, str):
             if not path.isabs(source):
                 source = path.abspath(source)
@@ -19,10 +25,12 @@ class Config:
             if abs_cfg_dir not in [path.abspath(p) for p in sys.path if isinstance(p, str)]:
                 sys.path.insert(0, abs_cfg_dir)
 
-            self.load_config_file()
+            self.load_config_file(cache_dir)
         elif isinstance(source, dict):
             self.config = source
             self.file_path = None
+            if cache_dir is not None:
+                self.plan_cache = plan_cache.PlanCache(cache_dir, plan_cache.config_text(source))
 
         self.validate_config()
 
@@ -37,17 +45,30 @@ class Config:
         with open(target_file_path, "w") as file:
             json.dump(self.config, file, indent=4)
 
-    def load_config_file(self):
+    def load_config_file(self, cache_dir=None):
         if isinstance(self.file_path, str) and path.isfile(self.file_path):
-            with open(self.file_path, "r") as file:
-                if self.file_path.endswith(".yaml"):
-                    self.config = yaml.safe_load(file)
-                elif self.file_path.endswith(".json"):
-                    self.config = json.load(file)
-                else:
-                    raise Exception(f"Unsupported config file type {self.file_path}")
+            if not self.file_path.endswith((".yaml", ".json")):
+                raise Exception(f"Unsupported config file type {self.file_path}")
+            with open(self.file_path, "rb") as file:
+                text = file.read()
+            if cache_dir is not None:
+                self.plan_cache = plan_cache.PlanCache(cache_dir, path.splitext(self.file_path)[1].encode("utf-8") + b"|" + text)
+                self.config = self.plan_cache.parsed_config()
+                if self.config is not None:
+                    return
+            if self.file_path.endswith(".yaml"):
+                self.config = yaml.load(text.decode("utf-8"), Loader=YAML_LOADER)
+            else:
+                self.config = json.loads(text)
+            if self.plan_cache is not None:
+                self.plan_cache.set_config(self.config)
         else:
             raise Exception(f"{self.file_path} file not found")
+
+    def save_plan_cache(self):
+        """Write the plan cache file when the config is cached (cache_dir) and something new was computed."""
+        if self.plan_cache is not None:
+            self.plan_cache.save()
     
     def validate_config(self):
         if "tables" not in self.config:
@@ -420,7 +441,7 @@ class Config:
 
         unused_columns = [col for col in df.columns if col not in columns_allowed]
         if unused_columns:
-            util.log("columns will NOT be used in csv: " + ", ".join(unused_columns), util.FOREGROUND_COLOR.YELLOW)
+            util.log("columns will NOT be used in csv: " + ", ".join(unused_columns), util.FOREGROUND_COLOR.YELLOW, util.WARNING)
 
         for row in df.itertuples(index=False):
             col_struct = {
@@ -449,7 +470,7 @@ class Config:
                     if 0.0 <= null_perc <= 1.0:
                         col_struct["null_percentage"] = null_perc
                 except (ValueError, TypeError):
-                    util.log(f"invalid null_percentage value {null_perc} for column {col_struct['column_name']}. 0.0 <= null_percentage <= 1.0", util.FOREGROUND_COLOR.YELLOW)
+                    util.log(f"invalid null_percentage value {null_perc} for column {col_struct['column_name']}. 0.0 <= null_percentage <= 1.0", util.FOREGROUND_COLOR.YELLOW, util.WARNING)
             if "description" in df.columns and isinstance(getattr(row, "description"), str):
                 desc = getattr(row, "description")
                 if isinstance(desc, str) and desc.strip():
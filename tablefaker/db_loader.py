@@ -0,0 +1,240 @@
+# direct load into a database: tables created from the declared column types, rows bulk-loaded per batch
+import importlib.util
+import io
+import sqlite3
+import sys
+import pandas as pd
+from . import parallel
+from . import sql_writer
+
+IF_EXISTS = ["fail", "replace", "append"]
+DEFAULT_LOAD_BATCH_SIZE = 10000  # rows generated and loaded at once when batch_size is not set
+# SQLAlchemy dialect names of the sql_writer dialects
+SQLALCHEMY_DIALECTS = {"postgresql": "postgres", "mysql": "mysql", "mariadb": "mysql", "sqlite": "sqlite", "snowflake": "snowflake"}
+# SQL type of each column kind by dialect, None is the type of every other database
+SQL_TYPES = {
+    "integer": {None: "BIGINT", "sqlite": "INTEGER"},
+    "float": {None: "DOUBLE PRECISION", "sqlite": "REAL", "mysql": "DOUBLE", "snowflake": "FLOAT"},
+    "decimal": {None: "NUMERIC"},
+    "boolean": {None: "BOOLEAN", "sqlite": "INTEGER"},
+    "date": {None: "DATE", "sqlite": "TEXT"},
+    "datetime": {None: "TIMESTAMP", "sqlite": "TEXT", "mysql": "DATETIME"},
+    "time": {None: "TIME", "sqlite": "TEXT"},
+    "string": {None: "TEXT", "snowflake": "VARCHAR"},
+}
+# kinds sqlite3 has no adapter for (or a deprecated one), loaded as text
+SQLITE_TEXT_KINDS = ("decimal", "date", "datetime", "time")
+
+
+def load_order(tables):
+    """
+    Tables ordered parents first by the tables their foreign_key, copy_from_fk and get_table
+    calls name, otherwise in config order. A table naming a parent by a non-literal keeps its
+    config position after every table before it.
+    """
+    names = [table["table_name"] for table in tables]
+    parents = {}
+    for i, table in enumerate(tables):
+        referenced = parallel.referenced_tables(table)
+        if referenced is None:
+            referenced = set(names[:i])
+        parents[table["table_name"]] = (referenced & set(names)) - {table["table_name"]}
+    ordered, loaded, remaining = [], set(), list(tables)
+    while remaining:
+        table = next((table for table in remaining if parents[table["table_name"]] <= loaded), None)
+        if table is None:
+            raise Exception(f"Tables {[table['table_name'] for table in remaining]} reference each other, they can not be loaded parents first")
+        ordered.append(table)
+        loaded.add(table["table_name"])
+        remaining.remove(table)
+    return ordered
+
+
+def _dtype_kind(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "integer"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    if isinstance(dtype, pd.StringDtype):
+        return "string"
+    return None
+
+
+def _parquet_kind(parquet_type):
+    parquet_type = str(parquet_type)
+    for prefixes, kind in [(("int", "uint"), "integer"), (("float", "double"), "float"), (("decimal",), "decimal"),
+                           (("bool",), "boolean"), (("date",), "date"), (("timestamp",), "datetime"), (("time",), "time"),
+                           (("string", "utf8", "large_string", "large_utf8"), "string")]:
+        if parquet_type.startswith(prefixes):
+            return kind
+    return None
+
+
+def declared_kind(column):
+    """Kind of the SQL type fixed by a column's config: its type, else its parquet_type; None when neither fixes one."""
+    if "type" in column:
+        try:
+            kind = _dtype_kind(pd.api.types.pandas_dtype(column["type"]))
+        except (TypeError, ValueError):
+            kind = None
+        if kind is not None:
+            return kind
+    if "parquet_type" in column:
+        return _parquet_kind(column["parquet_type"])
+    return None
+
+
+def column_kind(series):
+    """Kind of the SQL type of a column without a declared type, from its dtype, else its non-null values."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    kind = _dtype_kind(series.dtype)
+    if kind is not None:
+        return kind
+    kind = pd.api.types.infer_dtype(series, skipna=True)
+    return {"integer": "integer", "floating": "float", "mixed-integer-float": "float", "decimal": "decimal", "boolean": "boolean",
+            "date": "date", "datetime": "datetime", "datetime64": "datetime", "time": "time"}.get(kind, "string")
+
+
+def sql_type(kind, dialect=None):
+    types = SQL_TYPES[kind]
+    return types.get(dialect, types[None])
+
+
+def column_values(series, kind, dialect=None):
+    """Python values of a column for executemany as an object array, None where the value is missing."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    missing = series.isna().to_numpy()
+    if dialect == "sqlite" and pd.api.types.is_datetime64_any_dtype(series.dtype):
+        # the same text in every batch, with the fraction only when a value has one
+        values = series.dt.strftime("%Y-%m-%d %H:%M:%S.%f" if (series.dt.microsecond != 0).any() else "%Y-%m-%d %H:%M:%S").to_numpy(dtype=object, copy=True)
+    elif kind == "string" or (dialect == "sqlite" and kind in SQLITE_TEXT_KINDS):
+        values = series.astype(str).to_numpy(dtype=object, copy=True)
+    else:
+        values = series.to_numpy(dtype=object, copy=True)
+    if missing.any():
+        values[missing] = None
+    return values
+
+
+def _placeholder(paramstyle, position):
+    if paramstyle == "qmark":
+        return "?"
+    if paramstyle == "numeric":
+        return f":{position + 1}"
+    if paramstyle == "named":
+        return f":p{position}"
+    return "%s"
+
+
+class DatabaseLoader:
+    """
+    Loads generated tables into a database, one DataFrame batch at a time.
+
+    target is a sqlite:/// URL or a file path (sqlite3), another SQLAlchemy
+    URL (sqlalchemy and the driver must be installed) or an open DB-API
+    connection, which is not closed. Every table is created from the declared
+    column types (declared_kind), the values of its first batch decide the
+    other columns. A table is loaded in one transaction: batches go in
+    with executemany, or with COPY through Postgres drivers that have a COPY
+    API (psycopg2, psycopg). if_exists is what happens to a table that
+    exists: fail, replace (drop it) or append.
+    """
+
+    def __init__(self, target, if_exists="fail", dialect=None):
+        if if_exists not in IF_EXISTS:
+            raise Exception(f"Wrong if_exists = {if_exists}. Supported values: {IF_EXISTS}")
+        self.if_exists = if_exists
+        self.owned = isinstance(target, str)
+        if not isinstance(target, str):
+            self.connection = target
+            module = sys.modules.get(type(target).__module__.split(".")[0])
+            self.paramstyle = getattr(module, "paramstyle", "qmark")
+            if dialect is None and isinstance(target, sqlite3.Connection):
+                dialect = "sqlite"
+        elif "://" not in target or target.startswith("sqlite:///"):
+            self.connection = sqlite3.connect(target[len("sqlite:///"):] if target.startswith("sqlite:///") else target)
+            self.paramstyle = sqlite3.paramstyle
+            dialect = "sqlite"
+        elif importlib.util.find_spec("sqlalchemy"):
+            sqlalchemy = __import__("sqlalchemy")
+            engine = sqlalchemy.create_engine(target)
+            self.connection = engine.raw_connection()
+            self.paramstyle = engine.dialect.paramstyle
+            dialect = dialect or SQLALCHEMY_DIALECTS.get(engine.dialect.name)
+        else:
+            raise Exception(f"sqlalchemy package is not installed, it is needed to load into {target.split('://')[0]}. install it with pip install sqlalchemy")
+        self.dialect = dialect
+        self.table_name = None
+
+    def start_table(self, table_name, columns):
+        """Start loading a table with the column configs columns; a table without rows is created from them alone."""
+        self.table_name = table_name
+        # a column defined twice takes its last definition, like the generated table
+        self.declared = {column["column_name"]: declared_kind(column) for column in columns}
+        self.cursor = self.connection.cursor()
+        self.insert = None
+
+    def _quote(self, name):
+        return sql_writer.quote_identifier(name, self.dialect or "postgres")
+
+    def _create(self, columns):
+        table = self._quote(self.table_name)
+        if self.if_exists == "replace":
+            self.cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        exists = " IF NOT EXISTS" if self.if_exists == "append" else ""
+        definitions = ", ".join(f"{self._quote(name)} {sql_type(kind, self.dialect)}" for name, kind in columns)
+        self.cursor.execute(f"CREATE TABLE{exists} {table} ({definitions})")
+        names = ", ".join(self._quote(name) for name, _ in columns)
+        self.copy = None
+        if self.dialect == "postgres" and (hasattr(self.cursor, "copy_expert") or hasattr(self.cursor, "copy")):
+            self.copy = f"COPY {table} ({names}) FROM STDIN"
+        placeholders = ", ".join(_placeholder(self.paramstyle, i) for i in range(len(columns)))
+        self.insert = f"INSERT INTO {table} ({names}) VALUES ({placeholders})"
+
+    def write(self, data_frame):
+        series = [data_frame.iloc[:, i] for i in range(data_frame.shape[1])]
+        if self.insert is None:
+            self.kinds = [self.declared.get(name) or column_kind(column) for name, column in zip(data_frame.columns, series)]
+            self._create(list(zip(data_frame.columns, self.kinds)))
+        if len(data_frame) == 0:
+            return
+        if self.copy is not None:
+            self._copy(series, len(data_frame))
+            return
+        rows = list(zip(*[column_values(column, kind, self.dialect) for column, kind in zip(series, self.kinds)]))
+        if self.paramstyle == "named":
+            rows = [{f"p{i}": value for i, value in enumerate(row)} for row in rows]
+        self.cursor.executemany(self.insert, rows)
+
+    def _copy(self, series, row_count):
+        text = "\n".join(sql_writer._join_columns([sql_writer.copy_fields(column) for column in series], "\t", row_count)) + "\n"
+        if hasattr(self.cursor, "copy_expert"):
+            self.cursor.copy_expert(self.copy, io.StringIO(text))
+        else:
+            with self.cursor.copy(self.copy) as copy:
+                copy.write(text)
+
+    def finish_table(self):
+        """Commit the table, created from its column configs when no batch was written."""
+        if self.insert is None:
+            self.kinds = [kind or "string" for kind in self.declared.values()]
+            self._create(list(zip(self.declared, self.kinds)))
+        self.cursor.close()
+        self.connection.commit()
+        self.table_name = None
+
+    def rollback(self):
+        """Roll back the table being loaded."""
+        if self.table_name is not None:
+            self.connection.rollback()
+            self.table_name = None
+
+    def close(self):
+        if self.owned:
+            self.connection.close()
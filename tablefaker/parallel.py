@@ -0,0 +1,163 @@
+# process-pool generation of export chunks (workers / --jobs)
+import ast
+from . import plan_cache
+from . import run_stats
+from . import util
+
+# state of the TableFaker living in each worker process, set by init_worker
+_worker = None
+_worker_state = None
+
+
+def _calls(table):
+    """Yield (function name, call node) for the calls in a table's column expressions."""
+    for col in table["columns"]:
+        command = col.get("data")
+        if not isinstance(command, str):
+            continue
+        try:
+            if "return " in command:
+                inner_code = "\n".join(["    " + line for line in command.split("\n")])
+                tree = ast.parse(f"def _tf_parallel_func():\n{inner_code}")
+            else:
+                tree = ast.parse(command, mode="eval")
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call):
+                func = node.func
+                name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+                yield name, node
+
+
+def _keyword(call, name, position):
+    if len(call.args) > position:
+        return call.args[position]
+    for keyword in call.keywords:
+        if keyword.arg == name:
+            return keyword.value
+    return None
+
+
+def sequential_reason(table):
+    """
+    Return why the chunks of a table must be generated one after another, or None.
+
+    Chunks are independent once every chunk is seeded on its own, except when a
+    chunk reads state written by the previous chunks of the same table: values
+    that must be unique across the table, or keys of the table itself.
+    """
+    key = (table["table_name"], plan_cache.columns_key(table["columns"]))
+    return plan_cache.cached("sequential", key, lambda: _sequential_reason(table))
+
+
+def _sequential_reason(table):
+    table_name = table["table_name"]
+    for col in table["columns"]:
+        if ".unique." in str(col.get("data")):
+            return "fake.unique values must be unique across chunks"
+    for name, call in _calls(table):
+        if name == "foreign_key":
+            is_unique = _keyword(call, "is_unique", 6)
+            if is_unique is not None and not (isinstance(is_unique, ast.Constant) and not is_unique.value):
+                return "is_unique foreign keys must be unique across chunks"
+        if name in ("foreign_key", "copy_from_fk"):
+            parent = _keyword(call, "table_name" if name == "foreign_key" else "parent_table", 0)
+            if not isinstance(parent, ast.Constant):
+                return f"{name} parent table is not a literal"
+            if parent.value == table_name:
+                return "the table references its own keys"
+        if name == "get_table":
+            return "get_table reads rows generated by previous chunks"
+    return None
+
+
+def parent_tables(table):
+    """Parent tables a table reads keys or rows from (literal foreign_key/copy_from_fk arguments)."""
+    parents = set()
+    for name, call in _calls(table):
+        if name in ("foreign_key", "copy_from_fk"):
+            parent = _keyword(call, "table_name" if name == "foreign_key" else "parent_table", 0)
+            if isinstance(parent, ast.Constant):
+                parents.add(parent.value)
+    return parents
+
+
+def referenced_tables(table):
+    """
+    Tables whose keys or rows a table reads (foreign_key, copy_from_fk, get_table),
+    None when one of them is not named by a literal.
+    """
+    tables = set()
+    for name, call in _calls(table):
+        if name in ("foreign_key", "copy_from_fk", "get_table"):
+            argument = {"foreign_key": "table_name", "copy_from_fk": "parent_table", "get_table": "name"}[name]
+            parent = _keyword(call, argument, 0)
+            if not isinstance(parent, ast.Constant):
+                return None
+            tables.add(parent.value)
+    return tables
+
+
+def worker_state(table_faker, table, configurator, file_type, kwargs):
+    """Everything a worker needs to generate chunks of a table, picklable."""
+    table_name = table["table_name"]
+    if configurator.get_python_import():
+        # plugins can read any generated table through get_table
+        parents = set(table_faker.primary_key_cache) | set(table_faker.generated_rows)
+    else:
+        parents = parent_tables(table)
+    parents.discard(table_name)
+    return {
+        "seed": table_faker.seed,
+        "table": table,
+        "configurator": configurator,
+        "file_type": file_type,
+        "logging": util.logging_options(),
+        # progress is reported by the main process as chunks finish, a callback may not pickle
+        "kwargs": {k: v for k, v in kwargs.items() if k not in ("progress", "progress_interval")},
+        "primary_key_cache": {t: v for t, v in table_faker.primary_key_cache.items() if t in parents},
+        "parent_rows": {t: v for t, v in table_faker.parent_rows.items() if t in parents},
+        "generated_rows": {t: v for t, v in table_faker.generated_rows.items() if t in parents},
+    }
+
+
+def init_worker(state):
+    """Process pool initializer: one TableFaker per worker process with read-only parent caches."""
+    global _worker, _worker_state
+    from .tablefaker import TableFaker
+    from .progress import Progress
+    from .profiler import Profiler
+    _worker = TableFaker()
+    _worker._progress = Progress(False)
+    if state["kwargs"].get("profile"):
+        _worker.profiler = Profiler(state["kwargs"].get("profile_sample", 1.0))
+    if state["logging"] is not None:
+        util.configure_logging(*state["logging"])
+    _worker.seed = state["seed"]
+    _worker.primary_key_cache = state["primary_key_cache"]
+    _worker.parent_rows = state["parent_rows"]
+    _worker.generated_rows = state["generated_rows"]
+    _worker_state = state
+
+
+def export_chunk(chunk_index, start_row_id, row_count, file_path):
+    """
+    Generate and export one chunk in a worker.
+
+    Returns the primary key values of the chunk, its ParentCache and, when
+    get_table reads the table, its rows, so the main process can extend its
+    caches in chunk order, the run stats of the chunk and, when profiling,
+    the profile entries of the chunk.
+    """
+    state = _worker_state
+    table_name = state["table"]["table_name"]
+    _worker.export_chunk(state["file_type"], state["table"], state["configurator"], chunk_index, start_row_id, row_count, file_path, state["kwargs"])
+    primary_keys = _worker.primary_key_cache.pop(table_name, {})
+    parent_cache = _worker.parent_rows.pop(table_name, None)
+    rows = _worker.generated_rows.pop(table_name, None)
+    chunk_stats = _worker.run_stats.tables.pop(table_name)["chunks"][-1]
+    # workers are started for each table, so their lifetime peak is within the run
+    chunk_stats["peak_rss_bytes"] = run_stats.process_peak_rss_bytes() or chunk_stats["rss_bytes"]
+    profile = _worker.profiler.pop_entries() if _worker.profiler is not None else None
+    return primary_keys, parent_cache, rows, chunk_stats, profile
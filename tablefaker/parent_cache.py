@@ -0,0 +1,380 @@
+# compact parent-row cache: only the attributes children read, stored as NumPy columns
+import ast
+from bisect import bisect_right
+import numpy as np
+from . import plan_cache
+
+
+class ParentUsage:
+    """
+    Which parent tables and attributes the column expressions of a config read.
+
+    copy_from_fk(parent, fk_col, attr) and foreign_key(..., distribution="weighted_parent",
+    parent_attr=attr) read single attributes, get_table(name) reads whole rows.
+    Anything that cannot be worked out from literals (a computed table name,
+    copy_from_fk passed to a plugin, ...) falls back to keeping everything.
+    """
+
+    def __init__(self, tables, infer=False):
+        self.all_tables = False     # every column of every table may be read
+        self.attributes = {}        # table_name -> set of attributes, None for every column
+        self.row_tables = set()     # tables read through get_table
+        self.all_row_tables = False
+        for table in tables:
+            self._analyze_table(table, infer)
+
+    def attributes_of(self, table_name):
+        """Attributes to cache for a table: a set (maybe empty), or None for every column."""
+        if self.all_tables:
+            return None
+        return self.attributes.get(table_name, set())
+
+    def keeps_rows(self, table_name):
+        """True when get_table may read the generated rows of a table."""
+        return self.all_row_tables or table_name in self.row_tables
+
+    def _add(self, table_name, attribute):
+        if table_name in self.attributes and self.attributes[table_name] is None:
+            return
+        if attribute is None:
+            self.attributes[table_name] = None
+        else:
+            self.attributes.setdefault(table_name, set()).add(attribute)
+
+    def _analyze_table(self, table, infer):
+        fk_parents = set()
+        has_auto = False
+        for col in table["columns"]:
+            command = col.get("data")
+            if command in (None, "auto"):
+                has_auto = True
+                continue
+            tree = _parse(command)
+            if tree is None:
+                continue
+            call_targets = set()
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+                    call_targets.add(id(node.func))
+                    self._analyze_call(node, fk_parents)
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Name) and id(node) not in call_targets:
+                    # passed around instead of called directly, e.g. to a plugin
+                    if node.id in ("copy_from_fk", "foreign_key"):
+                        self.all_tables = True
+                    elif node.id == "get_table":
+                        self.all_row_tables = True
+        if infer and has_auto:
+            # data: auto becomes copy_from_fk(<fk parent>, ..., <name suffix>) at generation time
+            for parent in fk_parents:
+                self._add(parent, None)
+
+    def _analyze_call(self, call, fk_parents):
+        name = call.func.id
+        if name == "copy_from_fk":
+            parent = _argument(call, "parent_table", 0)
+            attribute = _argument(call, "parent_attr", 2)
+            if not _is_literal(parent):
+                self.all_tables = True
+            else:
+                self._add(parent.value, attribute.value if _is_literal(attribute) else None)
+        elif name == "foreign_key":
+            parent = _argument(call, "table_name", 0)
+            if not _is_literal(parent):
+                self.all_tables = True
+                return
+            fk_parents.add(parent.value)
+            distribution = _argument(call, "distribution", 2)
+            if distribution is None or (_is_literal(distribution) and distribution.value != "weighted_parent"):
+                return
+            attribute = _argument(call, "parent_attr", 4)
+            self._add(parent.value, attribute.value if _is_literal(attribute) else None)
+        elif name == "get_table":
+            table_name = _argument(call, "name", 0)
+            if _is_literal(table_name):
+                self.row_tables.add(table_name.value)
+            else:
+                self.all_row_tables = True
+
+
+FOREIGN_KEY_PARAMETERS = ["table_name", "column_name", "distribution", "param", "parent_attr", "weights", "is_unique"]
+
+
+def literal_foreign_key_calls(columns):
+    """Arguments of the foreign_key(...) calls in column expressions whose arguments are all literals (shared, read only)."""
+    return plan_cache.cached("fk_calls", plan_cache.columns_key(columns), lambda: _literal_foreign_key_calls(columns))
+
+
+def _literal_foreign_key_calls(columns):
+    calls = []
+    for col in columns:
+        tree = _parse(col.get("data"))
+        if tree is None:
+            continue
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "foreign_key"):
+                continue
+            if len(node.args) > len(FOREIGN_KEY_PARAMETERS) or any(k.arg not in FOREIGN_KEY_PARAMETERS for k in node.keywords):
+                continue
+            try:
+                arguments = dict(zip(FOREIGN_KEY_PARAMETERS, (ast.literal_eval(arg) for arg in node.args)))
+                arguments.update((k.arg, ast.literal_eval(k.value)) for k in node.keywords)
+            except ValueError:
+                continue
+            if "table_name" in arguments and "column_name" in arguments:
+                calls.append(arguments)
+    return calls
+
+
+def _parse(command):
+    if not isinstance(command, str):
+        return None
+    try:
+        if "return " in command:
+            inner_code = "\n".join(["    " + line for line in command.split("\n")])
+            return ast.parse(f"def _tf_usage_func():\n{inner_code}")
+        return ast.parse(command, mode="eval")
+    except SyntaxError:
+        return None
+
+
+def _argument(call, name, position):
+    if len(call.args) > position:
+        return call.args[position]
+    for keyword in call.keywords:
+        if keyword.arg == name:
+            return keyword.value
+    return None
+
+
+def _is_literal(node):
+    return isinstance(node, ast.Constant) and isinstance(node.value, str)
+
+
+def _is_int(value):
+    return isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+
+
+class KeyIndex:
+    """
+    Key -> row position. Keys forming an arithmetic progression (row_id keys)
+    are stored as (start, step, count); any other key switches to a dict.
+    """
+
+    def __init__(self):
+        self.start = None
+        self.step = None
+        self.count = 0
+        self.positions = None  # dict once the keys are not a progression
+
+    def add(self, key, position):
+        if self.positions is None and position == self.count:
+            if self.count == 0 and _is_int(key):
+                self.start = int(key)
+                self.count = 1
+                return
+            if self.count == 1 and _is_int(key) and key != self.start:
+                self.step = int(key) - self.start
+                self.count = 2
+                return
+            if self.count > 1 and _is_int(key) and key == self.start + self.step * self.count:
+                self.count += 1
+                return
+        if self.positions is None:
+            self.positions = dict(self.items())
+        self.positions[key] = position
+
+    def items(self):
+        """(key, position) pairs in insertion order."""
+        if self.positions is not None:
+            return iter(self.positions.items())
+        return ((self.start + (self.step or 0) * i, i) for i in range(self.count))
+
+    def get(self, key):
+        if self.positions is not None:
+            return self.positions.get(key)
+        if isinstance(key, float) and key.is_integer():
+            key = int(key)
+        if not _is_int(key) or self.count == 0:
+            return None
+        offset = int(key) - self.start
+        if self.step is None:
+            return 0 if offset == 0 else None
+        position, remainder = divmod(offset, self.step)
+        if remainder == 0 and 0 <= position < self.count:
+            return position
+        return None
+
+    def extend(self, other, offset):
+        """Append the keys of another index whose positions start at offset."""
+        if (self.positions is None and other.positions is None and self.step is not None
+                and other.count > 0 and other.start == self.start + self.step * self.count
+                and (other.step is None or other.step == self.step)):
+            self.count += other.count
+            return
+        for key, position in other.items():
+            self.add(key, position + offset)
+
+
+def _to_array(values):
+    """Typed NumPy array when all values share an int/float/bool type, object array otherwise."""
+    kinds = {type(value) for value in values}
+    if kinds == {int}:
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            pass
+    elif kinds == {float}:
+        return np.array(values, dtype=np.float64)
+    elif kinds == {bool}:
+        return np.array(values, dtype=np.bool_)
+    array = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        array[i] = value
+    return array
+
+
+class ParentCache:
+    """
+    Referenced attributes of one parent table.
+
+    Rows of the chunk being generated are buffered as tuples (so later rows of
+    the same table can already read them) and turned into one NumPy array per
+    attribute when the chunk is flushed. Every primary key column gets a
+    KeyIndex from key value to row position.
+    """
+
+    def __init__(self, key_columns, attributes):
+        self.key_columns = list(key_columns)
+        self.attributes = list(attributes)
+        self.attribute_positions = {attribute: i for i, attribute in enumerate(self.attributes)}
+        self.indexes = {column: KeyIndex() for column in self.key_columns}
+        self.chunks = []        # list of {attribute: ndarray}
+        self.chunk_starts = []  # first row position of every chunk
+        self.flushed_count = 0
+        self.pending = []       # tuples of attribute values, not flushed yet
+
+    def __len__(self):
+        return self.flushed_count + len(self.pending)
+
+    def add_row(self, row):
+        position = len(self)
+        self.pending.append(tuple(row[attribute] for attribute in self.attributes))
+        for column in self.key_columns:
+            self.indexes[column].add(row[column], position)
+
+    def flush(self):
+        if not self.pending:
+            return
+        columns = list(zip(*self.pending))
+        self.chunks.append({attribute: _to_array(list(columns[i])) for i, attribute in enumerate(self.attributes)})
+        self.chunk_starts.append(self.flushed_count)
+        self.flushed_count += len(self.pending)
+        self.pending = []
+
+    def position(self, key):
+        # later primary key columns win, like the row dict cache indexed by every PK column
+        for column in reversed(self.key_columns):
+            position = self.indexes[column].get(key)
+            if position is not None:
+                return position
+        return None
+
+    def value(self, key, attribute):
+        """Attribute of the row whose primary key is key; KeyError when there is no such row or attribute."""
+        position = self.position(key)
+        if position is None or attribute not in self.attribute_positions:
+            raise KeyError(key)
+        if position >= self.flushed_count:
+            return self.pending[position - self.flushed_count][self.attribute_positions[attribute]]
+        chunk_index = bisect_right(self.chunk_starts, position) - 1
+        array = self.chunks[chunk_index][attribute]
+        value = array[position - self.chunk_starts[chunk_index]]
+        return value if array.dtype == object else value.item()
+
+    def get(self, key, attribute, default=None):
+        try:
+            return self.value(key, attribute)
+        except KeyError:
+            return default
+
+    def extend(self, other):
+        """Append the rows of another cache of the same table (chunks generated by a worker)."""
+        other.flush()
+        offset = len(self)
+        self.flush()
+        for chunk, start in zip(other.chunks, other.chunk_starts):
+            self.chunks.append(chunk)
+            self.chunk_starts.append(start + offset)
+        self.flushed_count += other.flushed_count
+        for column in self.key_columns:
+            self.indexes[column].extend(other.indexes[column], offset)
+
+
+def _array_dtype(values):
+    """int64/float64 when every value is a Python int/float that fits, object otherwise."""
+    kinds = {type(value) for value in values}
+    if kinds == {int} and all(-2**63 <= value < 2**63 for value in values):
+        return np.dtype(np.int64)
+    if kinds == {float}:
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+class PrimaryKeyValues:
+    """
+    Primary key values of one table column in a growable typed NumPy array
+    (int64/float64, object for strings and mixed values), so foreign_key can
+    index and sample them without building Python lists.
+    """
+
+    def __init__(self, values=()):
+        self.buffer = np.empty(0, dtype=np.int64)
+        self.count = 0
+        self.extend(values)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        value = self.buffer[:self.count][index]
+        if isinstance(index, slice):
+            return value.tolist()
+        return value if self.buffer.dtype == object else value.item()
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def tolist(self):
+        return self.buffer[:self.count].tolist()
+
+    def array(self):
+        """The values as a NumPy array (a view, valid until the next append)."""
+        return self.buffer[:self.count]
+
+    def append(self, value):
+        self.extend((value,))
+
+    def extend(self, values):
+        if isinstance(values, PrimaryKeyValues):
+            values = values.array()
+        if isinstance(values, np.ndarray):
+            dtype = values.dtype if values.dtype in (np.int64, np.float64) else np.dtype(object)
+        else:
+            values = list(values)
+            dtype = _array_dtype(values)
+        if not len(values):
+            return
+        if self.count and dtype != self.buffer.dtype:
+            dtype = np.dtype(object)
+        needed = self.count + len(values)
+        if dtype != self.buffer.dtype or needed > len(self.buffer):
+            buffer = np.empty(max(needed, 2 * len(self.buffer), 16), dtype=dtype)
+            buffer[:self.count] = self.buffer[:self.count]
+            self.buffer = buffer
+        if dtype == object:
+            for i, value in enumerate(values, self.count):
+                self.buffer[i] = value
+        else:
+            self.buffer[self.count:needed] = values
+        self.count = needed
@@ -0,0 +1,157 @@
+# compiled-plan cache: config analyses and compiled expressions, reused within a process and optionally across runs
+import hashlib
+import json
+import marshal
+import os
+import pickle
+import sys
+from os import path
+from . import __version__
+
+CACHE_FORMAT = 2
+MAX_ENTRIES = 4096  # entries of each kind kept in the process memo, the oldest are dropped first
+
+# kind -> {key: value}; filled by cached() and by PlanCache.load()
+_memo = {"names": {}, "fk_calls": {}, "sequential": {}, "usage": {}, "code": {}}
+# the PlanCache of the config being generated, it records the entries the config uses
+_recording = None
+
+
+def _store(values, key, value):
+    if len(values) >= MAX_ENTRIES:
+        del values[next(iter(values))]
+    values[key] = value
+
+
+def cached(kind, key, compute):
+    """Value of compute() for key, computed once per process (or per cache file)."""
+    values = _memo[kind]
+    try:
+        value = values[key]
+    except KeyError:
+        value = compute()
+        _store(values, key, value)
+    if _recording is not None:
+        _recording.record(kind, key, value)
+    return value
+
+
+def clear():
+    """Forget everything cached in this process (the cache files stay)."""
+    global _recording
+    for values in _memo.values():
+        values.clear()
+    _recording = None
+
+
+def compiled(source, filename="<string>"):
+    """compile(source, filename, "exec"), cached by source text."""
+    return cached("code", (filename, source), lambda: compile(source, filename, "exec"))
+
+
+def columns_key(columns):
+    """Key of a column list for the analyses that only read column names, data and primary key flags."""
+    return tuple((c.get("column_name"), str(c.get("data")), bool(c.get("is_primary_key"))) for c in columns)
+
+
+def tables_key(tables):
+    return tuple((t.get("table_name"), columns_key(t.get("columns", []))) for t in tables)
+
+
+def config_hash(text):
+    """Key of a cache file: the config text, the tablefaker version and the Python version (marshal is version specific)."""
+    key = f"{CACHE_FORMAT}|{__version__}|{sys.implementation.cache_tag}|".encode("utf-8") + text
+    return hashlib.sha256(key).hexdigest()
+
+
+def config_text(config):
+    """Bytes identifying a config given as a dict."""
+    return json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+
+
+class PlanCache:
+    """
+    On-disk cache of the work done on a config before its first row.
+
+    One file per config under the cache directory (.tablefaker_cache by
+    default), named by config_hash of the config text. It holds the parsed
+    config, so the YAML is not parsed again, and the cached() entries the
+    config used: the names each expression reads (the column DAG), the
+    literal foreign_key calls, parent usage, the sequential tables and the
+    compiled expressions as marshalled code objects. Entries are recorded
+    while the config is the latest one opened, so a file holds only its own
+    config's entries. A changed config, tablefaker version or Python version
+    gets a new file. A PlanCache pickles as its file path, so a worker process
+    started with spawn loads the file itself.
+    """
+
+    def __init__(self, directory, text):
+        global _recording
+        self.directory = directory
+        self.file_path = path.join(directory, config_hash(text) + ".pickle")
+        self.config = None   # pickled config as parsed from the file, before generation changes it
+        self.stored = False  # the cache file exists and holds everything recorded so far
+        self.memo = {kind: {} for kind in _memo}
+        self.load()
+        _recording = self
+
+    def __getstate__(self):
+        # code objects do not pickle: a copy sent to a worker process reads the cache file again
+        return {"directory": self.directory, "file_path": self.file_path}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.config = None
+        self.stored = False
+        self.memo = {kind: {} for kind in _memo}
+        self.load()
+
+    def record(self, kind, key, value):
+        values = self.memo[kind]
+        if key not in values:
+            values[key] = value
+            self.stored = False
+
+    def load(self):
+        if not path.isfile(self.file_path):
+            return
+        try:
+            with open(self.file_path, "rb") as f:
+                content = pickle.load(f)
+            memo = content["memo"]
+            memo["code"] = {key: marshal.loads(value) for key, value in memo["code"].items()}
+        except (OSError, EOFError, KeyError, ValueError, TypeError, pickle.UnpicklingError):
+            # a broken cache file is rebuilt
+            return
+        self.config = content["config"]
+        for kind, values in memo.items():
+            self.memo[kind].update(values)
+            for key, value in values.items():
+                _store(_memo[kind], key, value)
+        self.stored = True
+
+    def set_config(self, config):
+        """Keep a copy of a config parsed on a cache miss, saved with the analyses."""
+        self.config = pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+        self.stored = False
+
+    def parsed_config(self):
+        """A fresh copy of the cached config, None on a miss."""
+        return pickle.loads(self.config) if self.stored else None
+
+    def save(self):
+        """Write the cache file when something new was recorded since it was loaded, then stop recording."""
+        global _recording
+        if _recording is self:
+            _recording = None
+        if self.stored:
+            return
+        memo = {kind: dict(values) for kind, values in self.memo.items()}
+        memo["code"] = {key: marshal.dumps(value) for key, value in memo["code"].items()}
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump({"config": self.config, "memo": memo}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.file_path)
+        self.stored = True
+        self.memo = {kind: {} for kind in _memo}
@@ -0,0 +1,180 @@
+# per-column profiler: wall time and call counts of column expressions, plugin functions and export stages
+import functools
+import inspect
+import json
+import os
+import time
+from contextlib import contextmanager
+from os import path
+
+
+def _share(seconds, total):
+    return seconds / total if total > 0 else 0.0
+
+
+class Profiler:
+    """
+    Cumulative wall time and call counts of a run.
+
+    Column expressions are timed in generate_fake_row, plugin functions
+    (tf_expose exports, functions of python_import modules and custom
+    functions) while a column expression calls them, and export stages
+    (vectorized columns, row generation, type conversion, writing) once per
+    chunk. With sample < 1 only every round(1 / sample)-th row is timed and
+    row level times are extrapolated, so a profile can be left on for large
+    runs. report() returns everything sorted by time, with the share of the
+    column time of every column and plugin function and the share of the
+    run time of every stage.
+    """
+
+    def __init__(self, sample=1.0):
+        if isinstance(sample, bool) or not isinstance(sample, (int, float)) or not 0 < sample <= 1:
+            raise Exception(f"Wrong profile_sample = {sample}. profile_sample must be a number in (0, 1]")
+        self.every = max(1, round(1 / sample))  # row ids divisible by every are timed
+        self.active = False                     # a sampled row is being generated
+        self.columns = {}                       # (table, column) -> [seconds, calls]
+        self.plugins = {}                       # function name -> [seconds, calls]
+        self.stages = {}                        # (table, stage) -> [seconds, calls]
+        self.expressions = {}                   # (table, column) -> data expression
+        self.start = time.perf_counter()
+        self.seconds = None
+
+    def sampled(self, row_id):
+        return row_id % self.every == 0
+
+    def add_column(self, table_name, column_name, seconds):
+        entry = self.columns.get((table_name, column_name))
+        if entry is None:
+            self.columns[(table_name, column_name)] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def add_plugin(self, name, seconds):
+        entry = self.plugins.get(name)
+        if entry is None:
+            self.plugins[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def add_stage(self, table_name, stage, seconds):
+        entry = self.stages.setdefault((table_name, stage), [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    @contextmanager
+    def stage(self, table_name, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(table_name, stage, time.perf_counter() - started)
+
+    def pop_entries(self):
+        """Entries collected since the previous call (by a worker process, for merge())."""
+        entries = (self.columns, self.plugins, self.stages, self.expressions)
+        self.columns, self.plugins, self.stages, self.expressions = {}, {}, {}, {}
+        return entries
+
+    def merge(self, entries):
+        columns, plugins, stages, expressions = entries
+        for own, other in ((self.columns, columns), (self.plugins, plugins), (self.stages, stages)):
+            for key, (seconds, calls) in other.items():
+                entry = own.setdefault(key, [0.0, 0])
+                entry[0] += seconds
+                entry[1] += calls
+        self.expressions.update(expressions)
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.start
+
+    def report(self):
+        seconds = self.seconds if self.seconds is not None else time.perf_counter() - self.start
+        # row level entries only cover the sampled rows
+        columns = [{"table": table, "column": column, "expression": self.expressions.get((table, column)),
+                    "calls": calls, "seconds": total * self.every, "mean_us": 1e6 * total / calls}
+                   for (table, column), (total, calls) in self.columns.items()]
+        column_seconds = sum(entry["seconds"] for entry in columns)
+        plugins = [{"function": name, "calls": calls, "seconds": total * self.every, "mean_us": 1e6 * total / calls}
+                   for name, (total, calls) in self.plugins.items()]
+        stages = [{"table": table, "stage": stage, "calls": calls, "seconds": total}
+                  for (table, stage), (total, calls) in self.stages.items()]
+        for entry in columns + plugins:
+            entry["share"] = _share(entry["seconds"], column_seconds)
+        for entry in stages:
+            entry["share"] = _share(entry["seconds"], seconds)
+        return {
+            "sample": 1 / self.every,
+            "seconds": seconds,
+            "column_seconds": column_seconds,
+            "columns": sorted(columns, key=lambda entry: -entry["seconds"]),
+            "plugins": sorted(plugins, key=lambda entry: -entry["seconds"]),
+            "stages": sorted(stages, key=lambda entry: -entry["seconds"]),
+        }
+
+    def format_text(self, report=None, limit=20):
+        """The report as a text table, at most limit lines per section."""
+        report = report or self.report()
+        sampled = "every row" if self.every == 1 else f"1 row in {self.every}, times extrapolated"
+        lines = [f"profile of {report['seconds']:.2f}s ({sampled}), column expressions {report['column_seconds']:.3f}s"]
+        if report["columns"]:
+            lines.append(f"  {'share':>6} {'seconds':>9} {'calls':>9} {'mean us':>9}  column")
+            for entry in report["columns"][:limit]:
+                expression = " ".join(str(entry["expression"]).split())
+                if len(expression) > 60:
+                    expression = expression[:57] + "..."
+                lines.append(f"  {100 * entry['share']:5.1f}% {entry['seconds']:9.3f} {entry['calls']:9d} {entry['mean_us']:9.1f}  "
+                             f"{entry['table']}.{entry['column']} = {expression}")
+        if report["plugins"]:
+            lines.append(f"  {'share':>6} {'seconds':>9} {'calls':>9} {'mean us':>9}  plugin function (within column time)")
+            for entry in report["plugins"][:limit]:
+                lines.append(f"  {100 * entry['share']:5.1f}% {entry['seconds']:9.3f} {entry['calls']:9d} {entry['mean_us']:9.1f}  {entry['function']}")
+        if report["stages"]:
+            lines.append(f"  {'share':>6} {'seconds':>9} {'calls':>9} {'':>9}  export stage (share of run time)")
+            for entry in report["stages"][:limit]:
+                lines.append(f"  {100 * entry['share']:5.1f}% {entry['seconds']:9.3f} {entry['calls']:9d} {'':>9}  {entry['table']} {entry['stage']}")
+        return "\n".join(lines)
+
+    def write(self, report_path):
+        """Write the report as JSON, atomically."""
+        directory = path.dirname(path.abspath(report_path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{report_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.report(), f, indent=2, default=str)
+        os.replace(temp_path, report_path)
+
+
+def timed(profiler_of, name, function):
+    """function timed while a sampled row is generated; profiler_of returns the profiler of the current run."""
+    @functools.wraps(function)
+    def timed_function(*args, **kwargs):
+        profiler = profiler_of()
+        if profiler is None or not profiler.active:
+            return function(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.add_plugin(name, time.perf_counter() - started)
+    return timed_function
+
+
+class ProfiledModule:
+    """A python_import module whose functions are timed when a column expression calls them through the module."""
+
+    def __init__(self, module, wrap):
+        self._module = module
+        self._wrap = wrap  # (name, function) -> timed function
+        self._functions = {}
+
+    def __getattr__(self, name):
+        function = self._functions.get(name)
+        if function is not None:
+            return function
+        value = getattr(self._module, name)
+        if inspect.isfunction(value) and value.__module__ == self._module.__name__:
+            function = self._functions[name] = self._wrap(f"{self._module.__name__.split('.')[-1]}.{name}", value)
+            return function
+        return value
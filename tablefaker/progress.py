@@ -0,0 +1,139 @@
+# throttled progress reporting: rows/sec and ETA per table and for the whole run
+import sys
+import time
+from datetime import timedelta
+from . import util
+
+TTY_INTERVAL = 0.2         # seconds between redraws of the progress bar
+LOG_INTERVAL = 10.0        # seconds between progress log lines when stdout is not a terminal or logs are json
+CALLBACK_INTERVAL = 0.5    # seconds between events sent to a callback
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "-"
+    return str(timedelta(seconds=int(seconds)))
+
+
+class TableProgress:
+    """Rows generated so far for one table of a run. add() is called for every row, so it only counts."""
+    __slots__ = ("progress", "table_name", "total", "rows", "start_time", "next_check", "finished")
+
+    def __init__(self, progress, table_name, total):
+        self.progress = progress
+        self.table_name = table_name
+        self.total = total
+        self.rows = 0
+        self.start_time = time.monotonic()
+        self.next_check = 1    # row count at which the clock is read again
+        self.finished = False
+
+    def add(self, rows=1):
+        self.rows += rows
+        if self.rows >= self.next_check:
+            self.progress._check(self)
+
+    def rows_per_sec(self, now):
+        elapsed = now - self.start_time
+        return self.rows / elapsed if elapsed > 0 else None
+
+
+class Progress:
+    """
+    Progress of a run, reported at most once per interval.
+
+    report is True to draw a progress bar on a terminal (a log line every
+    LOG_INTERVAL seconds when stdout is not a terminal), False for no output,
+    or a callable receiving an event dict instead of any terminal output.
+    An event has the table, its rows and total, rows_per_sec and eta (seconds)
+    of the table, the same for the whole run as run_rows, run_total,
+    run_rows_per_sec and run_eta, and finished when the table is done.
+    Every table also sends an event when its last row is generated.
+    """
+
+    def __init__(self, report=True, row_counts=None, interval=None):
+        self.callback = report if callable(report) else None
+        # terminal output follows the log level (--quiet), a bar is only drawn for text logs on a terminal
+        self.enabled = bool(report) and (self.callback is not None or util.logger.isEnabledFor(util.INFO))
+        self.tty = self.callback is None and util.log_format() == "text" and sys.stdout.isatty()
+        if interval is None:
+            interval = CALLBACK_INTERVAL if self.callback else TTY_INTERVAL if self.tty else LOG_INTERVAL
+        self.interval = interval
+        self.planned = dict(row_counts or {})  # table -> rows the run generates
+        self.tables = {}
+        self.start_time = time.monotonic()
+        self.next_report = self.start_time + interval
+
+    def table(self, table_name, row_count):
+        """Progress of a table, started with row_count rows when the run did not plan it."""
+        tracker = self.tables.get(table_name)
+        if tracker is None:
+            total = self.planned.setdefault(table_name, row_count)
+            tracker = self.tables[table_name] = TableProgress(self, table_name, total)
+        return tracker
+
+    def add(self, table_name, rows):
+        """Count rows generated outside this process (worker chunks, checkpointed chunks)."""
+        if rows > 0:
+            self.table(table_name, rows).add(rows)
+
+    def skip(self, table_name):
+        """Count the planned rows of a table generated before this run (restored from a checkpoint)."""
+        self.add(table_name, self.planned.get(table_name, 0))
+
+    def _check(self, tracker):
+        now = time.monotonic()
+        rate = tracker.rows_per_sec(now)
+        # read the clock again after about a tenth of the interval, at the latest on the last row;
+        # the step at most doubles the rows so far, as the rate of the first rows is a rough guess
+        step = min(max(1, int((rate or 0) * self.interval / 10)), max(1, tracker.rows))
+        tracker.next_check = tracker.rows + step
+        if tracker.total > tracker.rows:
+            tracker.next_check = min(tracker.next_check, tracker.total)
+        if tracker.rows >= tracker.total:
+            tracker.total = tracker.rows
+            self.planned[tracker.table_name] = tracker.rows
+            if not tracker.finished:
+                tracker.finished = True
+                self._report(tracker, now)
+                return
+        if now >= self.next_report:
+            self._report(tracker, now)
+
+    def event(self, tracker, now=None):
+        now = time.monotonic() if now is None else now
+        rate = tracker.rows_per_sec(now)
+        run_rows = sum(t.rows for t in self.tables.values())
+        run_total = max(run_rows, sum(self.planned.values()))
+        elapsed = now - self.start_time
+        run_rate = run_rows / elapsed if elapsed > 0 else None
+        return {
+            "table": tracker.table_name,
+            "rows": tracker.rows,
+            "total": tracker.total,
+            "rows_per_sec": rate,
+            "eta": (tracker.total - tracker.rows) / rate if rate else None,
+            "run_rows": run_rows,
+            "run_total": run_total,
+            "run_rows_per_sec": run_rate,
+            "run_eta": (run_total - run_rows) / run_rate if run_rate else None,
+            "finished": tracker.finished,
+        }
+
+    def _report(self, tracker, now):
+        self.next_report = now + self.interval
+        if not self.enabled:
+            return
+        event = self.event(tracker, now)
+        if self.callback is not None:
+            self.callback(event)
+            return
+        rate = f"{event['rows_per_sec'] or 0:,.0f} rows/s"
+        run_percent = 100 * event["run_rows"] / event["run_total"] if event["run_total"] else 100.0
+        run = f"run {run_percent:.1f}% ETA {format_eta(event['run_eta'])}"
+        if self.tty:
+            util.progress_bar(event["rows"], max(event["total"], 1), f"Table:{event['table']} • {rate} • ETA {format_eta(event['eta'])} • {run}")
+        else:
+            percent = 100 * event["rows"] / event["total"] if event["total"] else 100.0
+            util.log(f"progress {event['table']} {event['rows']}/{event['total']} {percent:.1f}% {rate} ETA {format_eta(event['eta'])} | {run}",
+                     fields={"event": "progress", **event})
@@ -0,0 +1,243 @@
+# counter-based random numbers: the value for a row depends only on a stream key and the row id
+import hashlib
+import math
+import random
+import numpy as np
+from faker import Faker
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+MIX1 = 0xBF58476D1CE4E5B9
+MIX2 = 0x94D049BB133111EB
+
+
+def stream_key(*parts):
+    """64-bit key of a random stream, from the parts identifying it."""
+    key = "|".join(map(str, parts)).encode("utf-8")
+    return int.from_bytes(hashlib.md5(key).digest()[:8], "little")
+
+
+def mix(key, counter):
+    """64-bit integer for one counter (splitmix64 of key + counter)."""
+    z = (key + ((counter + 1) & MASK64) * GOLDEN_GAMMA) & MASK64
+    z = ((z ^ (z >> 30)) * MIX1) & MASK64
+    z = ((z ^ (z >> 27)) * MIX2) & MASK64
+    return z ^ (z >> 31)
+
+
+def uniform(key, counter):
+    """Uniform float in [0, 1) for one counter."""
+    return (mix(key, counter) >> 11) * (1.0 / (1 << 53))
+
+
+def uniforms(key, counters):
+    """Uniform floats in [0, 1) for an array of counters, equal to uniform(key, c) for each c."""
+    counters = np.asarray(counters, dtype=np.int64).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        z = np.uint64(key) + (counters + np.uint64(1)) * np.uint64(GOLDEN_GAMMA)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(MIX1)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(MIX2)
+    z ^= z >> np.uint64(31)
+    return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table: draws index i with probability weights[i] / sum(weights)
+    in O(1) per draw after an O(n) build.
+    """
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        n = len(weights)
+        if n == 0:
+            raise Exception("AliasTable needs at least one weight")
+        total = weights.sum()
+        if not np.isfinite(total) or total <= 0 or (weights < 0).any():
+            raise Exception("AliasTable weights must be non-negative with a positive sum")
+        scaled = (weights * (n / total)).tolist()
+        probability = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # whatever is left is 1.0 up to rounding
+        self.probability = np.array(probability, dtype=np.float64)
+        self.alias = np.array(alias, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.alias)
+
+    def sample(self, u):
+        """Indexes for an array of uniforms in [0, 1): the integer part of u * n picks a column, the fraction the coin."""
+        x = np.asarray(u, dtype=np.float64) * len(self.alias)
+        column = np.minimum(x.astype(np.int64), len(self.alias) - 1)
+        coin = x - column
+        return np.where(coin < self.probability[column], column, self.alias[column])
+
+
+class Streams:
+    """
+    Random numbers for column expressions, available as `rng`.
+
+    Every (seed, table, column, row id) cell has its own counter-based stream,
+    so a row's values can be computed without generating the rows before it
+    and do not depend on chunks, workers or other columns. select() points
+    the object at a cell; the engines call it before evaluating a column
+    that uses rng.
+    """
+
+    DRAWS_PER_CELL = 1 << 20
+
+    def __init__(self, seed, table_name):
+        self.seed = seed
+        self.table_name = table_name
+        self.column_keys = {}
+        self.key = None
+        self.counter = 0
+        self.select("", 0)
+
+    def column_key(self, column_name):
+        key = self.column_keys.get(column_name)
+        if key is None:
+            key = self.column_keys[column_name] = stream_key(self.seed, self.table_name, column_name)
+        return key
+
+    def select(self, column_name, row_id):
+        """Start the stream of one cell; returns self, e.g. Streams(seed, table).select(column, row_id).random()."""
+        self.key = self.column_key(column_name)
+        self.counter = row_id * self.DRAWS_PER_CELL
+        return self
+
+    def uniforms(self, column_name, row_ids, draw=0):
+        """The draw-th random() of a column for many rows at once, as a NumPy array."""
+        counters = np.asarray(row_ids, dtype=np.int64) * self.DRAWS_PER_CELL + draw
+        return uniforms(self.column_key(column_name), counters)
+
+    def random(self):
+        """Float in [0, 1)."""
+        value = uniform(self.key, self.counter)
+        self.counter += 1
+        return value
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        """Integer in [a, b], both included."""
+        span = b - a + 1
+        return a + min(int(self.random() * span), span - 1)
+
+    def choice(self, seq):
+        return seq[min(int(self.random() * len(seq)), len(seq) - 1)]
+
+    def gauss(self, mu=0.0, sigma=1.0):
+        # Box-Muller, 1 - random() keeps the logarithm finite
+        radius = math.sqrt(-2.0 * math.log(1.0 - self.random()))
+        return mu + sigma * radius * math.cos(2.0 * math.pi * self.random())
+
+
+class RowGenerator:
+    """
+    Stand-in for the numpy.random.Generator methods the vectorized engine uses
+    (random, integers). The n-th draw of every row comes from the counter-based
+    stream of its cell, so a row gets the same values in any chunk.
+    """
+
+    def __init__(self, key, row_ids):
+        self.key = key
+        self.counters = np.asarray(row_ids, dtype=np.int64) * Streams.DRAWS_PER_CELL
+        self.draw = 0
+
+    def random(self, size=None):
+        u = uniforms(self.key, self.counters + self.draw)
+        self.draw += 1
+        return u
+
+    def integers(self, low, high, size=None, endpoint=False):
+        span = high - low + (1 if endpoint else 0)
+        return low + np.minimum((self.random() * span).astype(np.int64), span - 1)
+
+
+class CellRandom(random.Random):
+    """
+    random.Random whose draws come from the counter-based stream of the selected
+    cell. Seekable mode binds it as `random` in column expressions and as the
+    random of the table's Faker, so selecting a cell costs no reseeding.
+    """
+
+    def __init__(self, seed, table_name):
+        self.seed_value = seed
+        self.table_name = table_name
+        self.column_keys = {}
+        self.key = 0
+        self.counter = 0
+        super().__init__(0)
+
+    def select(self, column_name, row_id):
+        key = self.column_keys.get(column_name)
+        if key is None:
+            key = self.column_keys[column_name] = stream_key(self.seed_value, self.table_name, column_name, "random")
+        self.key = key
+        self.counter = row_id * Streams.DRAWS_PER_CELL
+        self.gauss_next = None
+        return self
+
+    def random(self):
+        value = uniform(self.key, self.counter)
+        self.counter += 1
+        return value
+
+    def getrandbits(self, k):
+        if 0 < k <= 64:
+            bits = mix(self.key, self.counter)
+            self.counter += 1
+            return bits >> (64 - k)
+        words = (k + 63) // 64
+        bits = 0
+        for _ in range(words):
+            bits = (bits << 64) | mix(self.key, self.counter)
+            self.counter += 1
+        return bits >> (words * 64 - k)
+
+    def __getattr__(self, name):
+        # module attributes used through the `random` name (random.Random, ...)
+        return getattr(random, name)
+
+
+class CellSeeds:
+    """
+    Randomness of the cells of a table in seekable mode.
+
+    Before a column of a row runs, its cell is selected: `random` and Faker draw
+    from a CellRandom stream of (seed, table, column, row id), and columns
+    calling custom functions or plugins also get the global random,
+    numpy.random and Faker generators reseeded from the cell. A value then
+    depends only on its cell: any range of rows can be generated without the
+    rows before it, and adding a column does not change the others.
+    """
+
+    def __init__(self, seed, table_name, drawing_columns, reseeded_columns):
+        self.random = CellRandom(seed, table_name)
+        self.columns = set(drawing_columns) | set(reseeded_columns)
+        self.seed_keys = {name: stream_key(seed, table_name, name, "seed") for name in reseeded_columns}
+
+    def reseeds(self, column_name):
+        """True when a column draws random values, so its cell must be selected before it runs."""
+        return column_name in self.columns
+
+    def select(self, column_name, row_id):
+        if column_name not in self.columns:
+            return
+        self.random.select(column_name, row_id)
+        seed_key = self.seed_keys.get(column_name)
+        if seed_key is not None:
+            value = mix(seed_key, row_id)
+            random.seed(value)
+            np.random.seed(value >> 32)
+            Faker.seed(value)
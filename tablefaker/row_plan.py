@@ -0,0 +1,146 @@
+# per-table evaluation plan built once from the column expression ASTs
+import ast
+from . import plan_cache
+
+
+def _function_source(command):
+    """Wrap a multi-line `return` block the same way generate_table does."""
+    inner_code = "\n".join(["    " + line for line in command.split("\n")])
+    return f"def _tf_plan_func():\n{inner_code}"
+
+
+def _is_function_block(command):
+    return isinstance(command, str) and "return " in command
+
+
+def _copy_from_fk_column(call):
+    """Return the foreign key column literal of a copy_from_fk(...) call, if any."""
+    if not isinstance(call.func, ast.Name) or call.func.id != "copy_from_fk":
+        return None
+    fk_arg = call.args[1] if len(call.args) > 1 else None
+    for keyword in call.keywords:
+        if keyword.arg == "fk_col":
+            fk_arg = keyword.value
+    if isinstance(fk_arg, ast.Constant) and isinstance(fk_arg.value, str):
+        return fk_arg.value
+    return None
+
+
+def referenced_names(command):
+    """
+    Return the set of names an expression reads from the evaluation environment.
+
+    Multi-line `return` blocks are analyzed as a function body, so names that are
+    assigned inside the block are local and are not reported. The foreign key
+    column passed to copy_from_fk(...) as a string literal is reported as well,
+    because copy_from_fk reads it from the current row. The result is a frozenset
+    shared by every caller, parsed once per expression text.
+    """
+    if not isinstance(command, str):
+        return frozenset(_referenced_names(command))
+    return plan_cache.cached("names", command, lambda: frozenset(_referenced_names(command)))
+
+
+def _referenced_names(command):
+    try:
+        if _is_function_block(command):
+            tree = ast.parse(_function_source(command))
+        else:
+            tree = ast.parse(f"result = {command}")
+    except SyntaxError:
+        # compile() in generate_table reports the real error
+        return set()
+
+    loaded = set()
+    stored = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Load):
+                loaded.add(node.id)
+            else:
+                stored.add(node.id)
+        elif isinstance(node, ast.Call):
+            fk_col = _copy_from_fk_column(node)
+            if fk_col is not None:
+                loaded.add(fk_col)
+
+    if _is_function_block(command):
+        return loaded - stored
+    return loaded
+
+
+def _legacy_phase(col, col_names):
+    """
+    Phase of a column in the two-phase evaluation that came before the plan: 0 for primary
+    keys, foreign keys and expressions that mention no other column name as a substring,
+    1 otherwise. The substring test has false positives (the name fax in fake.phone_number()),
+    but it decided the order of the random draws of seeded configs, so it is kept as the tie-break.
+    """
+    expr = str(col["data"])
+    if col.get("is_primary_key", False) or "foreign_key(" in expr or not expr:
+        return 0
+    for col_name in col_names:
+        if col_name != col["column_name"] and col_name in expr:
+            return 1
+    return 0
+
+
+class RowPlan:
+    """
+    Evaluation order of a table's columns.
+
+    The plan is a dependency DAG over column names (taken from the expression
+    ASTs) ordered topologically. Among columns that are ready to run, the phase
+    of the former two-phase evaluation decides first (see _legacy_phase), then
+    config order, so only columns that really read a later column move and
+    seeded configs keep drawing their random values in the same order.
+    """
+
+    def __init__(self, table_name, columns):
+        self.table_name = table_name
+        self.source_columns = columns
+        self.dependencies = {}   # column_name -> set of column names it reads
+        self.columns = []        # column dicts in evaluation order
+        self.pk_columns = [c["column_name"] for c in columns if c.get("is_primary_key")]
+        self._build(columns)
+
+    def _build(self, columns):
+        col_names = {c["column_name"] for c in columns}
+        positions = {}
+        for index, col in enumerate(columns):
+            positions.setdefault(col["column_name"], []).append(index)
+
+        priorities = []
+        remaining = []
+        dependents = [[] for _ in columns]
+        for index, col in enumerate(columns):
+            column_name = col["column_name"]
+            command = col["data"]
+            deps = (referenced_names(command) & col_names) - {column_name}
+            self.dependencies[column_name] = deps
+
+            phase = _legacy_phase(col, col_names)
+            priorities.append((phase, index))
+
+            dep_positions = [p for dep in deps for p in positions[dep]]
+            remaining.append(len(dep_positions))
+            for p in dep_positions:
+                dependents[p].append(index)
+
+        ready = sorted((i for i, count in enumerate(remaining) if count == 0), key=priorities.__getitem__)
+        while ready:
+            index = ready.pop(0)
+            self.columns.append(columns[index])
+            for dependent in dependents[index]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+            ready.sort(key=priorities.__getitem__)
+
+        if len(self.columns) != len(columns):
+            cycle = [c["column_name"] for i, c in enumerate(columns) if remaining[i] > 0]
+            raise Exception(f"Circular dependency between columns of table {self.table_name}: {', '.join(cycle)}")
+
+    def is_for(self, columns):
+        """True when the plan was built for this exact column list."""
+        return self.source_columns is columns
@@ -0,0 +1,199 @@
+# run statistics: timings, rows/sec, bytes written, CPU and peak memory, without blocking
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from datetime import datetime
+from os import path
+import psutil
+from . import __version__
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SAMPLE_INTERVAL = 0.05  # seconds between the RSS samples of a running run
+
+
+def path_size(file_path):
+    """Size in bytes of a file, or of all files under a directory (deltalake)."""
+    if path.isfile(file_path):
+        return path.getsize(file_path)
+    total = 0
+    for directory, _, files in os.walk(file_path):
+        for name in files:
+            try:
+                total += path.getsize(path.join(directory, name))
+            except OSError:
+                pass
+    return total
+
+
+def process_peak_rss_bytes():
+    """Peak resident memory of this process over its lifetime, None when unknown (Windows)."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+
+
+def _sample_rss(stats_ref, stopped):
+    """Sample the RSS of a run until it finishes or its RunStats is released."""
+    while not stopped.wait(SAMPLE_INTERVAL):
+        stats = stats_ref()
+        if stats is None:
+            return
+        stats.sampled_peak_rss = max(stats.sampled_peak_rss, stats.process.memory_info().rss)
+        del stats
+
+
+def _rate(rows, seconds):
+    return rows / seconds if seconds > 0 else None
+
+
+class RunStats:
+    """
+    Statistics of one run, collected at table and chunk boundaries.
+
+    CPU usage is the delta of the process CPU times since the previous
+    sample, so nothing sleeps to measure it. Peak memory is the largest
+    RSS sampled during the run, by a thread once start_sampling() is
+    called and at table and chunk boundaries, so an earlier run of the
+    process does not count. Worker processes are started for each table
+    and report their own lifetime peak with their chunks. report() returns
+    everything as a dict and write() saves it as a JSON run report.
+    """
+
+    def __init__(self, file_type=None):
+        self.process = psutil.Process()
+        self.file_type = file_type
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.cpu_start = self._cpu_seconds()
+        self.last_sample = (self.start, self.cpu_start)
+        self.sampled_peak_rss = self.process.memory_info().rss
+        self.tables = {}  # table name -> table stats, in run order
+        self.finished_at = None
+        self.workers = False  # chunks were exported by worker processes
+        self.sampling = None  # event stopping the sampling thread
+        self.sampler = None
+
+    def start_sampling(self):
+        """Sample the RSS in a thread until finish(), for the peak memory of the run."""
+        self.sampling = threading.Event()
+        self.sampler = threading.Thread(target=_sample_rss, args=(weakref.ref(self), self.sampling), daemon=True)
+        self.sampler.start()
+
+    def clock(self):
+        return time.perf_counter()
+
+    def _cpu_seconds(self):
+        times = self.process.cpu_times()
+        # worker processes count once they have exited
+        return times.user + times.system + getattr(times, "children_user", 0) + getattr(times, "children_system", 0)
+
+    def sample(self):
+        """(rss bytes, process CPU percent since the previous sample); CPU over 100% means several cores."""
+        now, cpu = time.perf_counter(), self._cpu_seconds()
+        previous_time, previous_cpu = self.last_sample
+        self.last_sample = (now, cpu)
+        rss = self.process.memory_info().rss
+        self.sampled_peak_rss = max(self.sampled_peak_rss, rss)
+        elapsed = now - previous_time
+        return rss, 100 * (cpu - previous_cpu) / elapsed if elapsed > 0 else 0.0
+
+    def peak_rss(self):
+        """Largest RSS of this process sampled during the run."""
+        return self.sampled_peak_rss
+
+    def worker_peak_rss(self):
+        """Peak RSS of the largest worker process of the run, None without workers."""
+        if not self.workers:
+            return None
+        peaks = [chunk["peak_rss_bytes"] for stats in self.tables.values() for chunk in stats["chunks"] if "peak_rss_bytes" in chunk]
+        return max(peaks, default=None)
+
+    def table(self, table_name):
+        stats = self.tables.get(table_name)
+        if stats is None:
+            stats = self.tables[table_name] = {"table": table_name, "rows": 0, "seconds": 0.0, "bytes_written": 0, "files": [], "chunks": []}
+        return stats
+
+    def record_chunk(self, table_name, chunk_index, rows, seconds, file_path=None):
+        """A chunk exported to file_path (a file, or the deltalake directory shared by the chunks)."""
+        rss = self.process.memory_info().rss
+        self.sampled_peak_rss = max(self.sampled_peak_rss, rss)
+        chunk = {"chunk": chunk_index, "rows": rows, "seconds": round(seconds, 6), "rows_per_sec": _rate(rows, seconds), "file": file_path, "rss_bytes": rss}
+        if file_path is not None and path.isfile(file_path):
+            chunk["bytes_written"] = path.getsize(file_path)
+        return self.add_chunk(table_name, chunk)
+
+    def add_chunk(self, table_name, chunk):
+        """Add the stats of a chunk, recorded here or by a worker process."""
+        stats = self.table(table_name)
+        stats["bytes_written"] += chunk.get("bytes_written", 0)
+        if chunk["file"] is not None and chunk["file"] not in stats["files"]:
+            stats["files"].append(chunk["file"])
+        stats["chunks"].append(chunk)
+        stats["rows"] += chunk["rows"]
+        return chunk
+
+    def record_table(self, table_name, seconds, rows=None, restored=False):
+        """A finished table; rows defaults to the rows of its chunks."""
+        stats = self.table(table_name)
+        stats["seconds"] = round(seconds, 6)
+        if rows is not None:
+            stats["rows"] = rows
+        for file_path in stats["files"]:
+            if path.isdir(file_path):
+                # deltalake: the chunks appended to one directory
+                stats["bytes_written"] = path_size(file_path)
+        stats["rows_per_sec"] = _rate(stats["rows"], seconds)
+        if restored:
+            stats["restored"] = True
+        return stats
+
+    def stop_sampling(self):
+        """Stop the sampling thread, at the end of the run or when it fails or is abandoned."""
+        if self.sampler is not None:
+            self.sampling.set()
+            self.sampler.join()
+
+    def finish(self):
+        self.stop_sampling()
+        self.finished_at = datetime.now()
+        self.sample()
+
+    def report(self):
+        end, cpu_end = (time.perf_counter(), self._cpu_seconds()) if self.finished_at is None else self.last_sample
+        seconds = end - self.start
+        cpu_seconds = cpu_end - self.cpu_start
+        rows = sum(stats["rows"] for stats in self.tables.values() if not stats.get("restored"))
+        return {
+            "tablefaker_version": __version__,
+            "file_type": self.file_type,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "seconds": round(seconds, 6),
+            "rows": rows,
+            "rows_per_sec": _rate(rows, seconds),
+            "bytes_written": sum(stats["bytes_written"] for stats in self.tables.values()),
+            "cpu_seconds": round(cpu_seconds, 6),
+            "cpu_percent": 100 * cpu_seconds / seconds if seconds > 0 else None,
+            "peak_rss_bytes": self.peak_rss(),
+            "worker_peak_rss_bytes": self.worker_peak_rss(),
+            "tables": list(self.tables.values()),
+        }
+
+    def write(self, report_path):
+        """Write the run report as JSON, atomically."""
+        directory = path.dirname(path.abspath(report_path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{report_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.report(), f, indent=2, default=str)
+        os.replace(temp_path, report_path)
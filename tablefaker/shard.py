@@ -0,0 +1,47 @@
+# shards (--shard i/N): each of N processes or machines exports the i-th slice of every table
+from . import parallel
+
+
+def parse_shard(shard):
+    """(index, count) from "i/N" or an (i, N) pair, with 1 <= i <= N."""
+    try:
+        if isinstance(shard, str):
+            index, count = (int(part) for part in shard.split("/"))
+        else:
+            index, count = shard
+    except (TypeError, ValueError):
+        raise Exception(f"Wrong shard = {shard}. shard must be i/N, e.g. 2/8")
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in (index, count)) or not 1 <= index <= count:
+        raise Exception(f"Wrong shard = {shard}. shard must be i/N with 1 <= i <= N")
+    return index, count
+
+
+def shard_range(row_count, index, count):
+    """First row and row count of shard index (1-based) of count; the shards of a table cover its rows in order."""
+    start = row_count * (index - 1) // count
+    stop = row_count * index // count
+    return start, stop - start
+
+
+def shard_suffix(index, count):
+    """Suffix of the export file names of a shard, e.g. _shard2of8."""
+    return f"_shard{index}of{count}"
+
+
+def read_tables(tables, plugins=False):
+    """
+    Names of the tables whose keys or rows a later table reads. Every shard
+    generates all rows of these tables (exporting only its slice), so foreign
+    keys of its slice of the child tables resolve as in a single run. With
+    plugins, or a table name that is not a literal, every table is read.
+    """
+    names = [table["table_name"] for table in tables]
+    if plugins:
+        return set(names)
+    read = set()
+    for table in tables:
+        referenced = parallel.referenced_tables(table)
+        if referenced is None:
+            return set(names)
+        read |= referenced
+    return read
@@ -0,0 +1,204 @@
+# streaming SQL export: batched multi-row INSERT statements or a Postgres COPY block, values formatted column by column
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+
+DIALECTS = ["postgres", "mysql", "sqlite", "snowflake"]
+SQL_FORMATS = ["insert", "copy"]
+DEFAULT_SQL_BATCH_SIZE = 1000  # rows per INSERT statement
+FORMAT_ROWS = 10000            # rows formatted at once, bounds the memory of the formatted strings
+
+# identifier quotes of each dialect; without a dialect identifiers are written as provided
+IDENTIFIER_QUOTES = {"postgres": '"', "sqlite": '"', "snowflake": '"', "mysql": "`"}
+# boolean literals of each dialect, None is the literal of the export without a dialect
+BOOLEAN_LITERALS = {None: ("True", "False"), "postgres": ("TRUE", "FALSE"), "snowflake": ("TRUE", "FALSE"),
+                    "mysql": ("TRUE", "FALSE"), "sqlite": ("1", "0")}
+COPY_ESCAPES = [("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r")]
+
+
+def quote_identifier(name, dialect=None):
+    """An identifier quoted for dialect, every part of a dotted name on its own; parts already quoted are kept."""
+    if dialect is None:
+        return name
+    quote = IDENTIFIER_QUOTES[dialect]
+    parts = []
+    for part in str(name).split("."):
+        if part.startswith((quote, "[")):
+            parts.append(part)
+        else:
+            parts.append(quote + part.replace(quote, quote * 2) + quote)
+    return ".".join(parts)
+
+
+def _kind(values):
+    """How the non-null values of a column are formatted."""
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return "boolean"
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return "number"
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return "text"
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind == "string":
+        return "string"
+    if kind in ("integer", "floating", "mixed-integer-float", "decimal"):
+        return "number"
+    if kind == "boolean":
+        return "boolean"
+    if kind in ("date", "datetime", "datetime64"):
+        return "text"
+    return "mixed"
+
+
+def _quote(strings, dialect):
+    if dialect == "mysql":
+        # MySQL reads backslash escapes in string literals
+        strings = strings.str.replace("\\", "\\\\", regex=False)
+    return "'" + strings.str.replace("'", "''", regex=False) + "'"
+
+
+def _literal(value, dialect):
+    if isinstance(value, (bool, np.bool_)):
+        return BOOLEAN_LITERALS[dialect][0 if value else 1]
+    if isinstance(value, (int, float, Decimal, np.integer, np.floating)):
+        return str(value)
+    text = str(value).replace("'", "''")
+    if dialect == "mysql":
+        text = text.replace("\\", "\\\\")
+    return f"'{text}'"
+
+
+def _copy_field(value):
+    if isinstance(value, (bool, np.bool_)):
+        return "t" if value else "f"
+    text = str(value)
+    for character, escaped in COPY_ESCAPES:
+        text = text.replace(character, escaped)
+    return text
+
+
+def _format_column(series, null, format_values):
+    """Object array of the formatted values of a column, null where the value is missing."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    missing = series.isna().to_numpy()
+    formatted = np.full(len(series), null, dtype=object)
+    if missing.all():
+        return formatted
+    values = series[~missing] if missing.any() else series
+    formatted[~missing] = format_values(values, _kind(values))
+    return formatted
+
+
+def sql_literals(series, dialect=None):
+    """The SQL literal of every value of a column (NULL, numbers, quoted strings and dates), as an object array."""
+    true, false = BOOLEAN_LITERALS[dialect]
+
+    def format_values(values, kind):
+        if kind == "number":
+            return values.astype(str).to_numpy(dtype=object)
+        if kind == "boolean":
+            return np.where(values.astype(bool).to_numpy(), true, false).astype(object)
+        if kind in ("string", "text"):
+            return _quote(values.astype(str), dialect).to_numpy(dtype=object)
+        return np.array([_literal(value, dialect) for value in values], dtype=object)
+
+    return _format_column(series, "NULL", format_values)
+
+
+def copy_fields(series):
+    """Every value of a column in the text format of COPY ... FROM stdin (\\N for nulls, t/f for booleans)."""
+    def format_values(values, kind):
+        if kind == "number":
+            return values.astype(str).to_numpy(dtype=object)
+        if kind == "boolean":
+            return np.where(values.astype(bool).to_numpy(), "t", "f").astype(object)
+        if kind in ("string", "text"):
+            strings = values.astype(str)
+            for character, escaped in COPY_ESCAPES:
+                strings = strings.str.replace(character, escaped, regex=False)
+            return strings.to_numpy(dtype=object)
+        return np.array([_copy_field(value) for value in values], dtype=object)
+
+    return _format_column(series, "\\N", format_values)
+
+
+def _join_columns(columns, separator, row_count):
+    """Join the formatted columns of every row with separator, one string per row."""
+    if not columns:
+        return np.full(row_count, "", dtype=object)
+    rows = columns[0]
+    for column in columns[1:]:
+        rows = rows + separator + column
+    return rows
+
+
+class SqlWriter:
+    """
+    Streams a table into a SQL script, one DataFrame batch at a time.
+
+    The insert format writes INSERT statements of at most batch_size rows,
+    so no statement grows with the table and statement boundaries do not
+    depend on how the rows were batched. The copy format writes one
+    Postgres COPY ... FROM stdin block, which psql loads much faster.
+    Values are formatted column by column; with a dialect, identifiers are
+    quoted and booleans use the dialect's literals.
+    """
+
+    def __init__(self, file_path, table_name, batch_size=DEFAULT_SQL_BATCH_SIZE, dialect=None, sql_format="insert"):
+        self.file = open(file_path, "w")
+        self.table_name = table_name
+        self.batch_size = batch_size
+        self.dialect = dialect
+        self.sql_format = sql_format
+        self.statement_rows = 0   # rows of the open INSERT statement
+        self.header = None
+        self.copy_open = False
+
+    def _header(self, columns):
+        if self.header is None:
+            table = quote_identifier(self.table_name, self.dialect)
+            names = ", ".join(quote_identifier(column, self.dialect) for column in columns)
+            if self.sql_format == "copy":
+                self.header = f"COPY {table} ({names}) FROM stdin;\n"
+            else:
+                self.header = f"INSERT INTO {table}\n({names})\nVALUES\n"
+        return self.header
+
+    def write(self, data_frame):
+        for start in range(0, len(data_frame), FORMAT_ROWS):
+            self._write_rows(data_frame.iloc[start:start + FORMAT_ROWS])
+
+    def _write_rows(self, data_frame):
+        header = self._header(data_frame.columns)
+        series = [data_frame.iloc[:, i] for i in range(data_frame.shape[1])]
+        if self.sql_format == "copy":
+            if not self.copy_open:
+                self.file.write(header)
+                self.copy_open = True
+            lines = _join_columns([copy_fields(column) for column in series], "\t", len(data_frame))
+            self.file.write("\n".join(lines))
+            self.file.write("\n")
+            return
+
+        rows = "(" + _join_columns([sql_literals(column, self.dialect) for column in series], ", ", len(data_frame)) + ")"
+        start = 0
+        while start < len(rows):
+            if self.statement_rows == 0:
+                self.file.write(header)
+            else:
+                self.file.write(",\n")
+            end = min(len(rows), start + self.batch_size - self.statement_rows)
+            self.file.write(",\n".join(rows[start:end]))
+            self.statement_rows += end - start
+            start = end
+            if self.statement_rows == self.batch_size:
+                self.file.write(";\n")
+                self.statement_rows = 0
+
+    def close(self):
+        if self.statement_rows:
+            self.file.write(";\n")
+        if self.copy_open:
+            self.file.write("\\.\n")
+        self.file.close()
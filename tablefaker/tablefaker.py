@@ -1,6 +1,23 @@
 from . import config
 from . import util
 from .plugin_loader import PluginManager
+from .row_plan import RowPlan, referenced_names
+from .codegen import build_row_function, CodegenUnsupported
+from .vectorize import find_vector_columns, generate_vector_columns
+from . import parallel
+from . import batch_writer
+from . import sql_writer
+from . import db_loader
+from . import shard as sharding
+from . import checkpoint as checkpoints
+from .typed_columns import ColumnBuilder
+from .parent_cache import ParentUsage, ParentCache, PrimaryKeyValues, literal_foreign_key_calls
+from . import rng
+from . import plan_cache
+from .progress import Progress
+from .run_stats import RunStats
+from .profiler import Profiler, ProfiledModule, timed
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from faker import Faker
@@ -9,27 +26,73 @@ from os import path
 from datetime import date, datetime, timedelta, time, timezone, tzinfo, UTC, MINYEAR, MAXYEAR
 import importlib
 import importlib.util
-import sys, math, gc, psutil, string
+import sys, math, gc, string
+import contextlib
+import functools
+import inspect
 import hashlib
 import ast
 
+ENGINES = ["interpreter", "codegen", "vectorized"]
+# names of the evaluation environment that draw nothing from the global random, numpy.random or Faker generators
+SEEKABLE_NAMES = {"random", "fake", "row_id", "rng", "foreign_key", "copy_from_fk", "get_table", "datetime", "date", "timedelta", "time",
+                  "timezone", "tzinfo", "UTC", "MINYEAR", "MAXYEAR", "math", "string", "result", "command"}
+
+def _stops_sampling(method):
+    """
+    Stop the RSS sampling of the run a method starts when it returns or raises,
+    or, for a generator, when it is exhausted, closed or garbage collected.
+    """
+    if inspect.isgeneratorfunction(method):
+        @functools.wraps(method)
+        def generator(self, *args, **kwargs):
+            try:
+                yield from method(self, *args, **kwargs)
+            finally:
+                self.run_stats.stop_sampling()
+        return generator
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.run_stats.stop_sampling()
+    return wrapper
+
+
 class TableFaker:
     def __init__(self):
         self.reset_start_time()
+        self.seed = None
         self.primary_key_cache = {}
         self.primary_key_seed = None
-        self.parent_rows = {}          # table -> {pk_value: full_row_dict}
+        self.parent_rows = {}          # table -> ParentCache (referenced attributes by pk value)
         self.fake_by_locale = {}       # locale -> Faker
         self._current_row = None       # for copy_from_fk access during phase B
         self.generated_rows = {}       # table_name -> list of row dicts (for get_table)
         self.unique_fk_used = {}       # (child_table, parent_table, parent_column) -> set of used PK values
+        self.unique_fk_orders = {}     # (child_table, foreign_key signature) -> [parent keys, their count, permutation, cursor]
         self._current_child_table = None  # set during generate_table for is_unique tracking
+        self.row_plans = {}            # table_name -> RowPlan (column evaluation order)
+        self._parent_usage = None      # (configurator, ParentUsage) of the current run
+        self.fk_prefetch = {}          # foreign_key signature -> (first row id, keys drawn for the chunk)
+        self._row_streams = None       # rng.Streams of the table being generated, when columns use rng
+        self._row_streams_columns = set()
+        self.fk_samplers = {}          # foreign_key signature -> (parent keys, parent cache, their sizes, rng.AliasTable)
+        self._cell_seeds = None        # rng.CellSeeds of the table being generated in seekable mode
+        self._checkpoint = None        # checkpoint.Checkpoint of the current to_target run
+        self._run_environment = None   # (configurator, eval environment shared by every table and chunk of the run)
+        self._progress = Progress()    # progress reporting of the current run
+        self.run_stats = RunStats()    # timings, rows/sec, bytes written and memory of the current (or last) run
+        self.profiler = None           # Profiler of the current (or last) run with profile=True or a report path
     
     def reset_start_time(self):
         self.start_time = datetime.now()
     
     def _apply_seed(self, seed):
         """Apply seed to random, numpy, and Faker for determinism."""
+        self.seed = seed
         if seed is None:
             return
         random.seed(seed)
@@ -52,28 +115,416 @@ class TableFaker:
 
         New parameter order: (parent_table, fk_col, parent_attr)
         """
-        fk_val = self._current_row[fk_col]
+        return self._copy_from_fk_value(parent_table, self._current_row[fk_col], parent_attr)
+
+    def _copy_from_fk_value(self, parent_table, fk_val, parent_attr):
+        """Copy attribute from the parent row whose key is fk_val."""
         try:
-            return self.parent_rows[parent_table][fk_val][parent_attr]
+            return self.parent_rows[parent_table].value(fk_val, parent_attr)
         except KeyError:
             raise RuntimeError(f"Missing parent row for {parent_table}.{parent_attr} with key={fk_val}")
 
+    def _get_parent_usage(self, configurator):
+        """Parent attributes read by the config, worked out once per configuration."""
+        if self._parent_usage is None or self._parent_usage[0] is not configurator:
+            infer = configurator.config.get("config", {}).get("infer_entity_attrs_by_name", False)
+            tables = configurator.config["tables"]
+            usage = plan_cache.cached("usage", (plan_cache.tables_key(tables), infer), lambda: ParentUsage(tables, infer))
+            self._parent_usage = (configurator, usage)
+        return self._parent_usage[1]
+
+    def _get_parent_cache(self, table_name, pk_cols, columns, usage):
+        """ParentCache of a table, None when no child reads its rows."""
+        if not pk_cols:
+            return None
+        attributes = usage.attributes_of(table_name)
+        column_names = list(dict.fromkeys(c["column_name"] for c in columns))
+        if attributes is not None:
+            column_names = [name for name in column_names if name in attributes]
+            if not column_names:
+                return None
+        cache = self.parent_rows.get(table_name)
+        if cache is None:
+            cache = ParentCache(pk_cols, column_names)
+            self.parent_rows[table_name] = cache
+        return cache
+
+    def _get_row_plan(self, table_name, columns):
+        """Get the cached evaluation plan of a table, building it on first use."""
+        plan = self.row_plans.get(table_name)
+        if plan is None or not plan.is_for(columns):
+            plan = RowPlan(table_name, columns)
+            self.row_plans[table_name] = plan
+        return plan
+
+    def _cache_primary_key(self, table_name, column_name, value):
+        """Record a generated primary key value for foreign_key lookups."""
+        self._primary_keys(table_name, column_name).append(value)
+
+    def _primary_keys(self, table_name, column_name):
+        """PrimaryKeyValues of a table column, created on first use."""
+        return self.primary_key_cache.setdefault(table_name, {}).setdefault(column_name, PrimaryKeyValues())
+
+    def _get_engine(self, configurator, kwargs):
+        """Row engine from kwargs (programmatic/CLI) or config, interpreter by default."""
+        engine = kwargs.get("engine") or configurator.config.get("config", {}).get("engine") or "interpreter"
+        if engine not in ENGINES:
+            raise Exception(f"Wrong engine = {engine}. Supported engines: {ENGINES}")
+        return engine
+
+    def _build_row_function(self, table_name, plan, variables, column_timer=None):
+        """Generate the table's row function, or None when it must use the interpreter."""
+        pk_appenders = {}
+        for pk_col in plan.pk_columns:
+            pk_appenders[pk_col] = lambda value, pk_col=pk_col: self._cache_primary_key(table_name, pk_col, value)
+        try:
+            return build_row_function(plan, variables, pk_appenders, self._copy_from_fk_value, self._row_streams, self._cell_seeds, column_timer)
+        except CodegenUnsupported as error:
+            util.log(f"{table_name} uses interpreter engine: {error}", util.FOREGROUND_COLOR.YELLOW, util.WARNING)
+            return None
+
+    def _stream_seed(self):
+        """Seed of the counter-based random streams: the config seed, or entropy drawn once per TableFaker."""
+        if self.seed is not None:
+            return self.seed
+        if not hasattr(self, "_unseeded_entropy"):
+            self._unseeded_entropy = np.random.SeedSequence().entropy
+        return self._unseeded_entropy
+
+    def _vector_rng_factory(self, table_name, start_row_id, row_ids=None):
+        """
+        NumPy generators for vectorized columns, keyed by (seed, table, column, first row of the chunk).
+        With row_ids (seekable mode) every row draws from the stream of its own cell instead.
+        """
+        if row_ids is not None:
+            return lambda column_name: rng.RowGenerator(rng.stream_key(self._stream_seed(), table_name, column_name, "random"), row_ids)
+        if self.seed is None:
+            entropy = self._stream_seed()
+        else:
+            entropy = self._stable_seed("vectorized", self.seed)
+
+        def rng_for_column(column_name):
+            key = (self._stable_seed(table_name), self._stable_seed(column_name), start_row_id)
+            return np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=key))
+        return rng_for_column
+
+    def _is_seekable(self, configurator, kwargs):
+        """Seekable mode from kwargs (programmatic/CLI) or config."""
+        seekable = kwargs.get("seekable")
+        if seekable is None:
+            seekable = configurator.config.get("config", {}).get("seekable", False)
+        if not isinstance(seekable, bool):
+            raise Exception(f"Wrong seekable = {seekable}. seekable must be true or false")
+        return seekable
+
+    def _get_cell_seeds(self, table_name, columns, variables):
+        """rng.CellSeeds of a table, from the names every column reads."""
+        column_names = {c["column_name"] for c in columns}
+        drawing_columns = set()
+        reseeded_columns = set()
+        for col in columns:
+            names = referenced_names(col["data"]) - column_names
+            if "random" in names or "fake" in names:
+                drawing_columns.add(col["column_name"])
+            if any(name in variables and name not in SEEKABLE_NAMES for name in names):
+                # custom functions and plugins draw from the global generators
+                reseeded_columns.add(col["column_name"])
+        return rng.CellSeeds(self._stream_seed(), table_name, drawing_columns, reseeded_columns)
+
+    def _get_workers(self, configurator, kwargs):
+        """Worker process count from kwargs (programmatic/CLI) or config, None when not set."""
+        workers = kwargs.get("workers")
+        if workers is None:
+            workers = configurator.config.get("config", {}).get("workers")
+        if workers is None:
+            return None
+        if not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+            raise Exception(f"Wrong workers = {workers}. workers must be a positive integer")
+        return workers
+
+    def _seed_chunk(self, table_name, chunk_index):
+        """Seed random, numpy, and Faker for one export chunk from (seed, table, chunk index)."""
+        chunk_seed = self._stable_seed(self.seed, table_name, chunk_index)
+        random.seed(chunk_seed)
+        np.random.seed(chunk_seed)
+        Faker.seed(chunk_seed)
+
+    def export_chunk(self, file_type, table, configurator, chunk_index, start_row_id, row_count, file_path, kwargs):
+        """Generate and export one chunk of a table, seeded independently of the other chunks."""
+        started = self.run_stats.clock()
+        self._seed_chunk(table["table_name"], chunk_index)
+        self._export_rows(file_type, table, configurator, start_row_id, row_count, file_path, kwargs)
+        self.run_stats.record_chunk(table["table_name"], chunk_index, row_count, self.run_stats.clock() - started, file_path)
+        util.log(f"data is exported to {file_path}", util.FOREGROUND_COLOR.GREEN, fields={"table": table["table_name"], "file": file_path})
+
+    def _get_batch_size(self, configurator, kwargs):
+        """Batch size from kwargs (programmatic) or config, None when not set."""
+        batch_size = kwargs.get("batch_size")
+        if batch_size is None:
+            batch_size = configurator.config.get("config", {}).get("batch_size")
+        if batch_size is None:
+            return None
+        if not isinstance(batch_size, int) or isinstance(batch_size, bool) or batch_size < 1:
+            raise Exception(f"Wrong batch_size = {batch_size}. batch_size must be a positive integer")
+        return batch_size
+
+    def _get_sql_options(self, configurator, kwargs):
+        """SqlWriter options from kwargs (programmatic/CLI) or config: sql_batch_size, sql_dialect and sql_format."""
+        config_options = configurator.config.get("config", {})
+
+        def option(name, default):
+            value = kwargs.get(name)
+            if value is None:
+                value = config_options.get(name)
+            return default if value is None else value
+
+        batch_size = option("sql_batch_size", sql_writer.DEFAULT_SQL_BATCH_SIZE)
+        if not isinstance(batch_size, int) or isinstance(batch_size, bool) or batch_size < 1:
+            raise Exception(f"Wrong sql_batch_size = {batch_size}. sql_batch_size must be a positive integer")
+        dialect = option("sql_dialect", None)
+        if dialect is not None and dialect not in sql_writer.DIALECTS:
+            raise Exception(f"Wrong sql_dialect = {dialect}. Supported dialects: {sql_writer.DIALECTS}")
+        sql_format = option("sql_format", "insert")
+        if sql_format not in sql_writer.SQL_FORMATS:
+            raise Exception(f"Wrong sql_format = {sql_format}. Supported formats: {sql_writer.SQL_FORMATS}")
+        if sql_format == "copy" and dialect not in (None, "postgres"):
+            raise Exception(f"sql_format = copy is the Postgres COPY format, it can not be used with sql_dialect = {dialect}")
+        return {"batch_size": batch_size, "dialect": dialect, "sql_format": sql_format}
+
+    def _iter_table_batches(self, table, configurator, internal_start_row_id, internal_row_count, batch_size, kwargs, arrow=False):
+        """
+        Generate rows [internal_start_row_id, internal_start_row_id + internal_row_count) of a table as
+        DataFrames (pyarrow Tables when arrow is True) of at most batch_size rows.
+        """
+        generate = self.generate_arrow_table if arrow else self.generate_table
+        row_count = table['row_count'] if "row_count" in table else 10
+        row_count = min(row_count - internal_start_row_id, internal_row_count)
+        for offset in range(0, row_count, batch_size):
+            df = generate(table, configurator, internal_start_row_id + offset, min(batch_size, row_count - offset), **kwargs)
+            yield df
+
+    def _export_rows(self, file_type, table, configurator, internal_start_row_id, internal_row_count, file_path, kwargs):
+        """Generate and export rows of a table to one file, streaming batches when batch_size is set."""
+        batch_size = self._get_batch_size(configurator, kwargs)
+        sql_options = self._get_sql_options(configurator, kwargs) if file_type == "sql" else None
+        if batch_size is None:
+            # parquet and deltalake are written from Arrow tables built without a DataFrame
+            generate = self.generate_arrow_table if batch_writer.writes_arrow(file_type) else self.generate_table
+            df = generate(table, configurator, internal_start_row_id, internal_row_count, **kwargs)
+            with self._stage(table["table_name"], "write"):
+                self.call_export_function(df, file_type, file_path, sql_options)
+            del df
+            gc.collect()
+            return
+
+        writer = batch_writer.get_batch_writer(file_type, self, file_path, sql_options)
+        try:
+            for df in self._iter_table_batches(table, configurator, internal_start_row_id, internal_row_count, batch_size, kwargs, writer.arrow):
+                with self._stage(table["table_name"], "write"):
+                    writer.write(df)
+                del df
+            if writer.batch_count == 0:
+                # no rows: the empty table is written, so the file is the one of the export without batches
+                generate = self.generate_arrow_table if writer.arrow else self.generate_table
+                writer.write(generate(table, configurator, internal_start_row_id, 0, **kwargs))
+        finally:
+            writer.close()
+        gc.collect()
+
+    def _export_chunks(self, file_type, table, configurator, chunks, workers, kwargs):
+        """
+        Export the chunks of a table with per-chunk seeds, on a process pool when workers > 1.
+        The output does not depend on the number of workers, workers=1 writes the files of workers=N;
+        it differs from an export without workers, which keeps one random stream for the table.
+        """
+        table_name = table["table_name"]
+        if self.seed is None:
+            # chunk seeds need a common base, also across worker processes
+            self.seed = random.SystemRandom().randrange(2**32)
+
+        # the rate of the table counts from its first chunk, also when chunks finish in workers
+        self._progress.table(table_name, sum(chunk[2] for chunk in chunks))
+        reason = parallel.sequential_reason(table)
+        if workers > 1 and len(chunks) > 1 and reason is not None:
+            util.log(f"{table_name} chunks are generated sequentially: {reason}", util.FOREGROUND_COLOR.YELLOW, util.WARNING)
+        # chunks of sequential tables depend on the chunks before them, such a table is checkpointed once it is done
+        checkpoint = self._checkpoint if reason is None else None
+        if checkpoint is not None and any(checkpoint.has_chunk(table_name, chunk[0]) for chunk in chunks):
+            util.log(f"{table_name} resumes after the chunks exported before the checkpoint", util.FOREGROUND_COLOR.CYAN)
+        if workers == 1 or len(chunks) <= 1 or reason is not None:
+            for chunk in chunks:
+                if checkpoint is None:
+                    self.export_chunk(file_type, table, configurator, *chunk, kwargs)
+                    continue
+                if checkpoint.has_chunk(table_name, chunk[0]):
+                    caches = checkpoint.load_chunk(table_name, chunk[0])
+                    self._progress.add(table_name, chunk[2])
+                else:
+                    caches = self._export_chunk_caches(file_type, table, configurator, chunk, kwargs)
+                    checkpoint.save_chunk(table_name, chunk[0], caches)
+                self._merge_chunk_caches(table_name, *caches)
+            return
+
+        pending = [chunk for chunk in chunks if checkpoint is None or not checkpoint.has_chunk(table_name, chunk[0])]
+        state = parallel.worker_state(self, table, configurator, file_type, kwargs)
+        self.run_stats.workers = True
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(pending))), initializer=parallel.init_worker, initargs=(state,)) as executor:
+            futures = {chunk[0]: executor.submit(parallel.export_chunk, *chunk) for chunk in pending}
+            # merge in chunk order so the key caches match a sequential run
+            for chunk in chunks:
+                if chunk[0] in futures:
+                    *caches, chunk_stats, profile = futures[chunk[0]].result()
+                    self.run_stats.add_chunk(table_name, chunk_stats)
+                    if profile is not None:
+                        self.profiler.merge(profile)
+                    if checkpoint is not None:
+                        checkpoint.save_chunk(table_name, chunk[0], caches)
+                else:
+                    caches = checkpoint.load_chunk(table_name, chunk[0])
+                # rows generated in a worker or before the checkpoint
+                self._progress.add(table_name, chunk[2])
+                self._merge_chunk_caches(table_name, *caches)
+
+    def _export_chunk_caches(self, file_type, table, configurator, chunk, kwargs):
+        """Export one chunk starting from empty caches for its own table, like a worker, and return the caches it filled."""
+        table_name = table["table_name"]
+        caches = (self.primary_key_cache, self.parent_rows, self.generated_rows)
+        saved = [cache.pop(table_name, None) for cache in caches]
+        try:
+            self.export_chunk(file_type, table, configurator, *chunk, kwargs)
+            return self.primary_key_cache.pop(table_name, {}), self.parent_rows.pop(table_name, None), self.generated_rows.pop(table_name, None)
+        finally:
+            for cache, value in zip(caches, saved):
+                if value is not None:
+                    cache[table_name] = value
+
+    def _merge_chunk_caches(self, table_name, primary_keys, parent_cache, rows):
+        """Append the key caches of a chunk (from a worker or a checkpoint) to the caches of its table."""
+        for pk_col, values in primary_keys.items():
+            self._primary_keys(table_name, pk_col).extend(values)
+        if parent_cache is not None:
+            if table_name in self.parent_rows:
+                self.parent_rows[table_name].extend(parent_cache)
+            else:
+                self.parent_rows[table_name] = parent_cache
+        if rows is not None:
+            self.generated_rows[table_name] = rows
+
+    def _save_table_checkpoint(self, table_name):
+        """Record a finished table in the checkpoint, with its key caches and the fake.unique values drawn so far."""
+        # Faker marks every key with a sentinel object that does not survive pickling, it is added back on restore
+        unique_values = {
+            locale: {key: values - {fake.unique._sentinel} for key, values in fake.unique._seen.items()}
+            for locale, fake in self.fake_by_locale.items()
+        }
+        caches = (self.primary_key_cache.get(table_name, {}), self.parent_rows.get(table_name), self.generated_rows.get(table_name))
+        self._checkpoint.save_table(table_name, (caches, unique_values))
+
+    def _restore_table_checkpoint(self, table_name):
+        """Restore the caches of a table exported before the checkpoint instead of generating it again."""
+        caches, unique_values = self._checkpoint.load_table(table_name)
+        self._merge_chunk_caches(table_name, *caches)
+        for locale, seen in unique_values.items():
+            unique = self._get_fake(locale).unique
+            unique._seen = {key: values | {unique._sentinel} for key, values in seen.items()}
+
+    def _start_run(self, kwargs, tables, row_counts=None, file_type=None):
+        """Start the progress and stats of a run generating tables, all of their rows unless row_counts has fewer."""
+        planned = {table["table_name"]: table['row_count'] if "row_count" in table else 10 for table in tables}
+        planned.update(row_counts or {})
+        self._progress = Progress(kwargs.get("progress", True), planned, kwargs.get("progress_interval"))
+        self.run_stats = RunStats(file_type)
+        self.run_stats.start_sampling()
+        self.profiler = Profiler(kwargs.get("profile_sample", 1.0)) if kwargs.get("profile") else None
+
+    def _stage(self, table_name, stage):
+        """Time an export stage of a table when profiling."""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.stage(table_name, stage)
+
+    def _finish_run(self, configurator, kwargs):
+        """Save the plan cache, log the run summary and write the run report (run_report=path)."""
+        configurator.save_plan_cache()
+        self.run_stats.finish()
+        report = self.run_stats.report()
+        if util.logger.isEnabledFor(util.INFO):
+            summary = {key: value for key, value in report.items() if key != "tables"}
+            rate = f"{report['rows_per_sec']:,.0f}" if report["rows_per_sec"] else "-"
+            util.log(f"{report['rows']} rows in {report['seconds']:.2f}s ({rate} rows/s), {report['bytes_written'] / (1024 * 1024):.2f} MB written, "
+                     f"peak memory {report['peak_rss_bytes'] / (1024 * 1024):.2f} MB", util.FOREGROUND_COLOR.GREEN, fields=summary)
+        if kwargs.get("run_report"):
+            self.run_stats.write(kwargs["run_report"])
+            util.log(f"run report is written to {kwargs['run_report']}", util.FOREGROUND_COLOR.GREEN)
+        if self.profiler is not None:
+            self.profiler.finish()
+            profile = self.profiler.report()
+            if util.logger.isEnabledFor(util.INFO):
+                util.log(self.profiler.format_text(profile), util.FOREGROUND_COLOR.CYAN, fields={"event": "profile", "profile": profile})
+            if isinstance(kwargs["profile"], str):
+                self.profiler.write(kwargs["profile"])
+                util.log(f"profile is written to {kwargs['profile']}", util.FOREGROUND_COLOR.GREEN)
+
     def print_sys_stats(self):
+        if not util.logger.isEnabledFor(util.INFO):
+            return
         end_time = datetime.now()
         elapsed_time = end_time - self.start_time
         minutes, seconds = divmod(elapsed_time.seconds, 60)
         seconds = f"{seconds:02}"
         milliseconds = f"{elapsed_time.microseconds // 1000:03}"
 
-        memory_usage = psutil.Process().memory_info().rss / (1024 * 1024)
-        memory_usage = f"{memory_usage:.2f} MB"
-
-        cpu_usage = psutil.cpu_percent(interval=1)  # Measure over 1 second
+        # CPU of this process since the previous sample, without waiting
+        rss, cpu_usage = self.run_stats.sample()
+        memory_usage = f"{rss / (1024 * 1024):.2f} MB"
         cpu_usage = f"{cpu_usage:.2f}%"
 
         util.log(f"Elapsed:{minutes}:{seconds}:{milliseconds}, Memory:{memory_usage}, CPU:{cpu_usage}", util.FOREGROUND_COLOR.GREEN)
 
-    def to_target(self, file_type, config_source, target_file_path, table_name=None, seed=None, infer_attrs=None, **kwargs) :
+    def _generate_unexported_rows(self, table, configurator, internal_start_row_id, internal_row_count, kwargs, batch_size=None):
+        """
+        Generate rows of a table only to fill its key caches (rows of other shards, or tables
+        before the one requested, that later tables read), without building their DataFrames.
+        """
+        row_count = table['row_count'] if "row_count" in table else 10
+        internal_row_count = min(internal_row_count, row_count - internal_start_row_id)
+        if internal_row_count <= 0:
+            return
+        batch_size = batch_size or self._get_batch_size(configurator, kwargs) or internal_row_count
+        seekable = self._is_seekable(configurator, kwargs)
+        for offset in range(0, internal_row_count, batch_size):
+            builder = self._generate_columns(table, configurator, internal_start_row_id + offset, min(batch_size, internal_row_count - offset), **kwargs)
+            if not seekable:
+                builder.flush()
+                self._draw_null_positions(table, builder.start_row_id, builder.row_count)
+            del builder
+        gc.collect()
+
+    def _draw_null_positions(self, table, start_row_id, row_count):
+        """
+        Draw the null positions _finished_series draws for row_count rows of a table outside
+        seekable mode, so numpy.random is where it would be after the table's DataFrame.
+        """
+        for column in table['columns']:
+            if "null_percentage" in column:
+                null_percentage = util.parse_null_percentage(column["null_percentage"])
+                np.random.choice(row_count, size=self._null_count(table, start_row_id, row_count, null_percentage), replace=False)
+
+    def _apply_infer_attrs(self, configurator, infer_attrs):
+        # Override infer_entity_attrs_by_name if provided via CLI
+        if infer_attrs is not None:
+            # Convert string 'true'/'false' to boolean
+            infer_bool = infer_attrs.lower() == 'true' if isinstance(infer_attrs, str) else infer_attrs
+            if "config" not in configurator.config:
+                configurator.config["config"] = {}
+            configurator.config["config"]["infer_entity_attrs_by_name"] = infer_bool
+
+    @_stops_sampling
+    def to_target(self, file_type, config_source, target_file_path, table_name=None, seed=None, infer_attrs=None, shard=None, checkpoint=None, resume=False, **kwargs) :
+        if file_type == "database":
+            if shard is not None or checkpoint is not None:
+                raise Exception("shard and checkpoint are not supported by the database target")
+            return self.to_database(config_source, target_file_path, table_name, seed, infer_attrs, **kwargs)
         if target_file_path is None:
             target_file_path = "."
         
@@ -81,35 +532,82 @@ class TableFaker:
             raise Exception(f"Wrong file_type = {file_type}")
         
         result = {}
-        configurator = config.Config(config_source)
+        configurator = config.Config(config_source, kwargs.get("cache_dir"))
         
         # Use CLI-provided seed if available, otherwise use config seed
         if seed is None:
             seed = configurator.config.get("config", {}).get("seed")
-        self._apply_seed(seed)
         
-        # Override infer_entity_attrs_by_name if provided via CLI
-        if infer_attrs is not None:
-            # Convert string 'true'/'false' to boolean
-            infer_bool = infer_attrs.lower() == 'true' if isinstance(infer_attrs, str) else infer_attrs
-            if "config" not in configurator.config:
-                configurator.config["config"] = {}
-            configurator.config["config"]["infer_entity_attrs_by_name"] = infer_bool
+        self._apply_infer_attrs(configurator, infer_attrs)
+
+        self._checkpoint = None
+        if resume and checkpoint is None:
+            raise Exception("resume needs the checkpoint directory of the interrupted run")
+        if checkpoint is not None:
+            options = {k: v for k, v in kwargs.items() if k in ("engine", "seekable", "batch_size", "sql_batch_size", "sql_dialect", "sql_format")}
+            run_fingerprint = checkpoints.fingerprint(configurator.config, file_type, path.abspath(target_file_path), table_name, seed, shard, options)
+            self._checkpoint = checkpoints.Checkpoint(checkpoint, run_fingerprint, seed, resume)
+            # an unseeded run resumes with the seed drawn by the interrupted run
+            seed = self._checkpoint.seed
+        self._apply_seed(seed)
         
         tables = configurator.config["tables"]
+
+        if shard is not None:
+            # every shard must derive the same values for the same rows
+            shard_index, shard_count = sharding.parse_shard(shard)
+            if self.seed is None:
+                raise Exception("shard needs a seed, in the config or as an argument, so that all shards generate the same dataset")
+            kwargs["seekable"] = True
+            read_tables = sharding.read_tables(tables, bool(configurator.get_python_import()))
+
+        run_tables = [table for table in tables if table_name is None or table["table_name"] == table_name]
+        if not (path.isdir(target_file_path) or file_type == "deltalake"):
+            run_tables = run_tables[:1] # a single file holds the first table
+        row_counts = {}
+        if shard is not None:
+            for table in run_tables:
+                total_row_count = table['row_count'] if "row_count" in table else 10
+                slice_start, slice_count = sharding.shard_range(total_row_count, shard_index, shard_count)
+                if table["table_name"] in read_tables:
+                    row_counts[table["table_name"]] = total_row_count
+                elif parallel.sequential_reason(table) is not None:
+                    row_counts[table["table_name"]] = slice_start + slice_count
+                else:
+                    row_counts[table["table_name"]] = slice_count
+        self._start_run(kwargs, run_tables, row_counts, file_type)
         
         for table in tables:
             if table_name is not None and table["table_name"] != table_name:
                 continue #skip other tables
 
+            single_file_target = not (path.isdir(target_file_path) or file_type == "deltalake")
+            if self._checkpoint is not None and self._checkpoint.table_done(table["table_name"]):
+                self._restore_table_checkpoint(table["table_name"])
+                self._progress.skip(table["table_name"])
+                self.run_stats.record_table(table["table_name"], 0, table['row_count'] if "row_count" in table else 10, restored=True)
+                util.log(f"{table['table_name']} was exported before the checkpoint", util.FOREGROUND_COLOR.CYAN)
+                if single_file_target:
+                    break # if single table is requested
+                result[table_name] = self._checkpoint.file_path(table["table_name"], None)
+                continue
+
+            table_started = self.run_stats.clock()
             row_count = table['row_count'] if "row_count" in table else 10
+            start_row_id = 0
+            if shard is not None:
+                total_row_count = row_count
+                start_row_id, row_count = sharding.shard_range(total_row_count, shard_index, shard_count)
+                if table["table_name"] in read_tables or parallel.sequential_reason(table) is not None:
+                    # rows before the slice: keys for later tables, and state of tables generated in row order
+                    self._generate_unexported_rows(table, configurator, 0, start_row_id, kwargs)
             export_file_count = table["export_file_count"] if "export_file_count" in table else 1
             export_file_row_count = table["export_file_row_count"] if "export_file_row_count" in table else sys.maxsize
             if export_file_count > 1:
                 export_file_row_count = math.ceil(row_count / export_file_count)
             
 
-            if path.isdir(target_file_path) or file_type == "deltalake":
+            if not single_file_target:
 
                 if file_type == "deltalake" and table["table_name"] == table_name and not path.exists(target_file_path) and path.exists(path.dirname(path.normpath(target_file_path)) + "/"):
                     # in delta lake format, if the latest folder does not exists, assume it is requested delta lake folder
@@ -118,62 +616,262 @@ class TableFaker:
                 else:
                     custom_export_name = table.get("export_file_name")
                     export_base_name = custom_export_name or table["table_name"]
+                    if shard is not None:
+                        export_base_name += sharding.shard_suffix(shard_index, shard_count)
                     if custom_export_name:
                         file_name = export_base_name + util.get_file_extension(file_type)
                     else:
                         file_name = util.get_temp_filename(export_base_name) + util.get_file_extension(file_type)
                     temp_file_path = path.join(target_file_path, file_name)
+                if self._checkpoint is not None:
+                    # the timestamped name of the interrupted run
+                    temp_file_path = self._checkpoint.file_path(table["table_name"], temp_file_path)
 
-                self.to_target_file(file_type, temp_file_path, table_name, kwargs, result, configurator, table, export_file_row_count, row_count, export_base_name)
+                self.to_target_file(file_type, temp_file_path, table_name, kwargs, result, configurator, table, export_file_row_count, row_count, export_base_name, start_row_id)
                 result[table_name] = temp_file_path
             else:
                 export_base_name = table.get("export_file_name") or table["table_name"]
-                self.to_target_file(file_type, target_file_path, table_name, kwargs, result, configurator, table, export_file_row_count, row_count, export_base_name)
+                self.to_target_file(file_type, target_file_path, table_name, kwargs, result, configurator, table, export_file_row_count, row_count, export_base_name, start_row_id)
+
+            if shard is not None and table["table_name"] in read_tables:
+                # rows after the slice, for the foreign keys of later tables
+                self._generate_unexported_rows(table, configurator, start_row_id + row_count, total_row_count - start_row_id - row_count, kwargs)
+            self.run_stats.record_table(table["table_name"], self.run_stats.clock() - table_started)
+            if self._checkpoint is not None:
+                self._save_table_checkpoint(table["table_name"])
+            if single_file_target:
                 break # if single table is requested
         
+        self._checkpoint = None
+        self._finish_run(configurator, kwargs)
+        return result
+
+    @_stops_sampling
+    def to_database(self, config_source, target, table_name=None, seed=None, infer_attrs=None, if_exists="fail", **kwargs):
+        """
+        Generate the tables straight into a database, see db_loader.DatabaseLoader for the targets.
+
+        Tables are loaded parents first (db_loader.load_order) and streamed in batches of
+        batch_size rows (default 10000), so no table is held as one DataFrame. With table_name,
+        the tables loaded before it are generated only to fill the key caches. Returns the
+        loaded row count of every table.
+        """
+        if target is None:
+            raise Exception("database target needs a sqlite:/// or SQLAlchemy URL, a sqlite file path or a DB-API connection")
+        result = {}
+        configurator = config.Config(config_source, kwargs.get("cache_dir"))
+        if seed is None:
+            seed = configurator.config.get("config", {}).get("seed")
+        self._apply_infer_attrs(configurator, infer_attrs)
+        self._apply_seed(seed)
+        batch_size = self._get_batch_size(configurator, kwargs) or db_loader.DEFAULT_LOAD_BATCH_SIZE
+
+        tables = db_loader.load_order(configurator.config["tables"])
+        if table_name is not None:
+            table_names = [table["table_name"] for table in tables]
+            if table_name not in table_names:
+                raise Exception(f"Table {table_name} not found")
+            tables = tables[:table_names.index(table_name) + 1]
+        self._start_run(kwargs, [table for table in tables if table_name is None or table["table_name"] == table_name], file_type="database")
+        loader = db_loader.DatabaseLoader(target, if_exists, kwargs.get("sql_dialect") or configurator.config.get("config", {}).get("sql_dialect"))
+        try:
+            for table in tables:
+                if table_name is not None and table["table_name"] != table_name:
+                    self._generate_unexported_rows(table, configurator, 0, table['row_count'] if "row_count" in table else 10, kwargs)
+                    continue
+                started, row_count = self.run_stats.clock(), 0
+                loader.start_table(table.get("export_file_name") or table["table_name"], table["columns"])
+                for df in self._iter_table_batches(table, configurator, 0, sys.maxsize, batch_size, kwargs):
+                    with self._stage(table["table_name"], "write"):
+                        loader.write(df)
+                    row_count += len(df)
+                    del df
+                with self._stage(table["table_name"], "write"):
+                    loader.finish_table()
+                self.run_stats.record_table(table["table_name"], self.run_stats.clock() - started, row_count)
+                util.log(f"{table['table_name']} is loaded into the database", util.FOREGROUND_COLOR.GREEN, fields={"table": table["table_name"], "rows": row_count})
+                result[table["table_name"]] = row_count
+        except BaseException:
+            loader.rollback()
+            raise
+        finally:
+            loader.close()
+        self._finish_run(configurator, kwargs)
         return result
 
+    @_stops_sampling
     def to_pandas(self, config_source:str, table_name=None, **kwargs):
         result = {}
-        configurator = config.Config(config_source)
+        configurator = config.Config(config_source, kwargs.get("cache_dir"))
         seed = configurator.config.get("config", {}).get("seed")
         self._apply_seed(seed)
         tables = configurator.config["tables"]
+        self._start_run(kwargs, [table for table in tables if table_name is None or table["table_name"] == table_name])
         for table in tables:
             if table_name is not None and table["table_name"] != table_name:
                 continue #skip other tables
             self.reset_start_time()
+            started = self.run_stats.clock()
             df = self.generate_table(table, configurator, **kwargs)
+            self.run_stats.record_table(table["table_name"], self.run_stats.clock() - started, len(df))
             self.print_sys_stats()
             result[table["table_name"]] = df
+        self._finish_run(configurator, kwargs)
+        return result
+
+    @_stops_sampling
+    def to_arrow(self, config_source, table_name=None, **kwargs):
+        """Like to_pandas, with a pyarrow.Table per table (parquet_type applied) instead of a DataFrame."""
+        result = {}
+        configurator = config.Config(config_source, kwargs.get("cache_dir"))
+        seed = configurator.config.get("config", {}).get("seed")
+        self._apply_seed(seed)
+        tables = configurator.config["tables"]
+        self._start_run(kwargs, [table for table in tables if table_name is None or table["table_name"] == table_name])
+        for table in tables:
+            if table_name is not None and table["table_name"] != table_name:
+                continue #skip other tables
+            self.reset_start_time()
+            started = self.run_stats.clock()
+            arrow_table = self.generate_arrow_table(table, configurator, **kwargs)
+            self.run_stats.record_table(table["table_name"], self.run_stats.clock() - started, arrow_table.num_rows)
+            self.print_sys_stats()
+            result[table["table_name"]] = arrow_table
+        self._finish_run(configurator, kwargs)
         return result
 
-    def to_target_file(self, file_type, target_file_path, table_name, kwargs, result, configurator, table, export_file_row_count, row_count, export_base_name=None):
-        internal_row_id = 0
-        internal_row_count = min(export_file_row_count, sys.maxsize)
+    @_stops_sampling
+    def iter_batches(self, config_source, table_name, batch_size=10000, output="pandas", **kwargs):
+        """
+        Generate a table batch by batch instead of as one DataFrame.
+
+        Yields DataFrames (output="pandas") or pyarrow RecordBatches (output="arrow")
+        of at most batch_size rows. Tables defined before table_name are generated
+        first, without being yielded, so foreign keys to them resolve.
+        """
+        if output not in ["pandas", "arrow"]:
+            raise Exception(f"Wrong output = {output}. Supported outputs: ['pandas', 'arrow']")
+        configurator = config.Config(config_source, kwargs.get("cache_dir"))
+        batch_size = self._get_batch_size(configurator, {"batch_size": batch_size})
+        seed = configurator.config.get("config", {}).get("seed")
+        self._apply_seed(seed)
+
+        tables = configurator.config["tables"]
+        if table_name not in [table["table_name"] for table in tables]:
+            raise Exception(f"Table {table_name} not found")
+        table_names = [table["table_name"] for table in tables]
+        self._start_run(kwargs, tables[:table_names.index(table_name) + 1])
+        for table in tables:
+            if table["table_name"] != table_name:
+                # the tables before the requested one only fill the key caches
+                self._generate_unexported_rows(table, configurator, 0, sys.maxsize, kwargs, batch_size)
+                continue
+            # the requested table is built as Arrow directly
+            started, row_count = self.run_stats.clock(), 0
+            for df in self._iter_table_batches(table, configurator, 0, sys.maxsize, batch_size, kwargs, output == "arrow"):
+                row_count += len(df)
+                if output == "pandas":
+                    yield df
+                else:
+                    yield from df.to_batches()
+            # the time includes the consumer of the batches
+            self.run_stats.record_table(table_name, self.run_stats.clock() - started, row_count)
+            self._finish_run(configurator, kwargs)
+            break
+
+    @_stops_sampling
+    def generate_rows(self, config_source, table_name, start, stop, output="pandas", **kwargs):
+        """
+        Generate rows [start, stop) of a table (0-based positions) in seekable mode.
+
+        Every value is derived from (seed, table, column, row id), so the rows are
+        the same as in a seekable run generating the whole table, without the rows
+        before start. Returns a DataFrame (output="pandas") or a pyarrow.Table
+        (output="arrow"). Tables defined before table_name are generated first,
+        without being returned, so foreign keys resolve. A table whose rows depend
+        on the rows before them (see workers) is generated from its first row.
+        """
+        if output not in ["pandas", "arrow"]:
+            raise Exception(f"Wrong output = {output}. Supported outputs: ['pandas', 'arrow']")
+        if not isinstance(start, int) or not isinstance(stop, int) or start < 0 or stop < start:
+            raise Exception(f"Wrong row range = [{start}, {stop}). start and stop must be integers with 0 <= start <= stop")
+        configurator = config.Config(config_source, kwargs.get("cache_dir"))
+        seed = configurator.config.get("config", {}).get("seed")
+        self._apply_seed(seed)
+        kwargs["seekable"] = True
+
+        tables = configurator.config["tables"]
+        if table_name not in [table["table_name"] for table in tables]:
+            raise Exception(f"Table {table_name} not found")
+        table_names = [table["table_name"] for table in tables]
+        requested = tables[table_names.index(table_name)]
+        requested_row_count = requested['row_count'] if "row_count" in requested else 10
+        self._start_run(kwargs, tables[:table_names.index(table_name) + 1], {table_name: max(0, min(stop, requested_row_count) - start)})
+        generate = self.generate_arrow_table if output == "arrow" else self.generate_table
+        for table in tables:
+            if table["table_name"] != table_name:
+                self._generate_columns(table, configurator, **kwargs)
+                continue
+            row_count = table['row_count'] if "row_count" in table else 10
+            stop = min(stop, row_count)
+            start = min(start, stop)
+            reason = parallel.sequential_reason(table)
+            started = self.run_stats.clock()
+            if reason is None or start == 0:
+                rows = generate(table, configurator, start, stop - start, **kwargs)
+            else:
+                util.log(f"{table_name} rows are generated from its first row: {reason}", util.FOREGROUND_COLOR.YELLOW, util.WARNING)
+                all_rows = generate(table, configurator, 0, stop, **kwargs)
+                if output == "arrow":
+                    rows = all_rows.slice(start)
+                else:
+                    rows = all_rows.iloc[start:].reset_index(drop=True)
+                    rows.Name = all_rows.Name
+            self.run_stats.record_table(table_name, self.run_stats.clock() - started, len(rows))
+            self._finish_run(configurator, kwargs)
+            return rows
+
+    def to_target_file(self, file_type, target_file_path, table_name, kwargs, result, configurator, table, export_file_row_count, row_count, export_base_name=None, start_row_id=0):
+        """Export row_count rows of a table from start_row_id, in files of at most export_file_row_count rows."""
         file_count = math.ceil(row_count / export_file_row_count)
+        chunks = []  # (chunk index, first internal row id, row count, file path)
         total_exported_row_count = 0
         for i in range(file_count):
-                    #internal_row_count = export_file_row_count
             internal_row_count = min(export_file_row_count, row_count - total_exported_row_count)
-            self.reset_start_time()
-            df = self.generate_table(table, configurator, internal_row_id, internal_row_count, **kwargs)
             if file_count > 1:
                 file_extension = util.get_file_extension(file_type)
                 target_dir = path.dirname(target_file_path)
                 temp_file_path = path.join(target_dir, export_base_name + "_" + str(i+1) + file_extension)
             else:
                 temp_file_path = target_file_path
-            self.call_export_function(df, file_type, temp_file_path)
-            del df
-            gc.collect()
-            util.log(f"data is exported to {temp_file_path}", util.FOREGROUND_COLOR.GREEN)
+            chunks.append((i, start_row_id + total_exported_row_count, internal_row_count, temp_file_path))
+            total_exported_row_count = total_exported_row_count + internal_row_count
+
+        workers = self._get_workers(configurator, kwargs)
+        # without workers the chunks continue the random stream of the table, so they split the rows of a
+        # single-file export; with workers (1 included) they are seeded one by one, see _export_chunks
+        if workers is None and self._checkpoint is not None:
+            # checkpointed chunks are seeded one by one, so a resumed chunk does not need the random state of the previous ones
+            workers = 1
+        if workers is not None:
+            if chunks:
+                self.reset_start_time()
+                self._export_chunks(file_type, table, configurator, chunks, workers, kwargs)
+                self.print_sys_stats()
+                result[table_name] = chunks[-1][3]
+            return
+
+        for i, internal_row_id, internal_row_count, temp_file_path in chunks:
+            self.reset_start_time()
+            started = self.run_stats.clock()
+            self._export_rows(file_type, table, configurator, internal_row_id, internal_row_count, temp_file_path, kwargs)
+            self.run_stats.record_chunk(table["table_name"], i, internal_row_count, self.run_stats.clock() - started, temp_file_path)
+            util.log(f"data is exported to {temp_file_path}", util.FOREGROUND_COLOR.GREEN, fields={"table": table["table_name"], "file": temp_file_path})
             self.print_sys_stats()
             result[table_name] = temp_file_path
-            internal_row_id = internal_row_id + internal_row_count
-            total_exported_row_count = total_exported_row_count + internal_row_count
 
-    def call_export_function(self, data_frame: pd.DataFrame, file_type, target_file_path):
+    def call_export_function(self, data_frame, file_type, target_file_path, sql_options=None):
+        """Write a DataFrame to a file; parquet and deltalake also take a pyarrow.Table."""
         if file_type == "csv":
             data_frame.to_csv(target_file_path, index=False)
         elif file_type == "json":
@@ -183,21 +881,28 @@ class TableFaker:
         elif file_type == "parquet":
             self._to_parquet_internal(data_frame, target_file_path)
         elif file_type == "sql":
-            self.to_sql_internal(data_frame, target_file_path)
+            self.to_sql_internal(data_frame, target_file_path, sql_options)
         elif file_type == "deltalake":
             self.to_deltalake_internal(data_frame, target_file_path)
         else:
             raise Exception(f"Wrong file_type = {file_type}")
 
-    def _to_parquet_internal(self, data_frame: pd.DataFrame, target_file_path):
-        import pyarrow as pa
+    def _to_parquet_internal(self, data_frame, target_file_path):
         import pyarrow.parquet as pq
+        table = self._to_arrow_table(data_frame)
+        pq.write_table(table, target_file_path)
+
+    def _to_arrow_table(self, data_frame):
+        """A pyarrow.Table as is, a DataFrame converted and cast to its parquet schema."""
+        import pyarrow as pa
+        if isinstance(data_frame, pa.Table):
+            return data_frame
         table = pa.Table.from_pandas(data_frame, preserve_index=False)
         parquet_schema_map = data_frame.attrs.get('parquet_schema')
         if parquet_schema_map:
             pa_schema = self._build_parquet_schema(data_frame, parquet_schema_map)
             table = table.cast(pa_schema, safe=False)
-        pq.write_table(table, target_file_path)
+        return table
 
     def _build_parquet_schema(self, data_frame: pd.DataFrame, schema_map: dict):
         import pyarrow as pa
@@ -256,48 +961,138 @@ class TableFaker:
             return pa.decimal128(int(m.group(1)), int(m.group(2)))
         raise Exception(f"Unknown parquet_type '{type_str}'. Supported types: {list(simple.keys())} and decimal128(precision, scale)")
 
-    def to_deltalake_internal(self, data_frame: pd.DataFrame, target_file_path):
+    def to_deltalake_internal(self, data_frame, target_file_path):
         if importlib.util.find_spec("deltalake"):
             deltalake = __import__("deltalake")
             deltalake.writer.write_deltalake(target_file_path, data_frame, mode="overwrite")
         else:
             raise Exception("deltalake package is not installed. install it with pip install deltalake")
 
-    def to_sql_internal(self, data_frame: pd.DataFrame, target_file_path):
-
-        table_name = data_frame.Name
-        # Keep identifier formatting as provided by config for DB-dialect compatibility.
-        insert_script = f'INSERT INTO {table_name}\n({", ".join(data_frame.columns)})\nVALUES\n'
-
-        # Iterate over DataFrame rows and create insert statements
-        for _, row in data_frame.iterrows():
-            value_list = []
-            for value in row:
-                if value is None:
-                    value_list.append("NULL")
-                elif value is pd.NA:
-                    value_list.append("NULL")
-                elif isinstance(value, (str, date, datetime)):
-                    escaped = str(value).replace("'", "''")
-                    value_list.append(f"'{escaped}'")
-                else:
-                    value_list.append(str(value))
+    def to_sql_internal(self, data_frame: pd.DataFrame, target_file_path, sql_options=None):
+        """Write a DataFrame as a SQL script, see sql_writer.SqlWriter and _get_sql_options."""
+        writer = sql_writer.SqlWriter(target_file_path, data_frame.Name, **(sql_options or {}))
+        try:
+            writer.write(data_frame)
+        finally:
+            writer.close()
 
-            values = ', '.join(value_list)
-            insert_script += f"({values}),\n"
+    def generate_table(self,table, configurator, internal_start_row_id=0, internal_row_count=sys.maxsize, **kwargs) -> pd.DataFrame:
+        table_name = table['table_name']
+        builder = self._generate_columns(table, configurator, internal_start_row_id, internal_row_count, **kwargs)
+        with self._stage(table_name, "convert"):
+            series = dict(self._finished_series(builder, table, self._is_seekable(configurator, kwargs)))
+            if series:
+                df = pd.DataFrame({name: series[name] for name in builder.column_names})
+            else:
+                df = pd.DataFrame(index=pd.RangeIndex(builder.row_count))
+        df.Name = table_name
+        parquet_schema_map = self._parquet_schema_map(table)
+        if parquet_schema_map:
+            df.attrs['parquet_schema'] = parquet_schema_map
 
-        # Remove the trailing comma and newline
-        insert_script = insert_script.rstrip(',\n')
+        util.log(f"{table_name} pandas dataframe created", util.FOREGROUND_COLOR.GREEN)
+        return df
 
-        # Write the insert script to the target file
-        with open(target_file_path, 'w') as file:
-            file.write(insert_script + ';')
+    def generate_arrow_table(self, table, configurator, internal_start_row_id=0, internal_row_count=sys.maxsize, **kwargs):
+        """
+        Generate a table as a pyarrow.Table instead of a DataFrame.
 
-    def generate_table(self,table, configurator, internal_start_row_id=0, internal_row_count=sys.maxsize, **kwargs) -> pd.DataFrame:
-        locale = None
-        if "config" in configurator.config and "locale" in configurator.config["config"]:
-            locale = configurator.config["config"]["locale"]
+        Columns are converted one at a time from their generated values into
+        Arrow arrays with their parquet_type applied, so neither a DataFrame of
+        the whole table nor a cast copy of the whole Arrow table is built.
+        """
+        import pyarrow as pa
+        from pyarrow import pandas_compat
+        table_name = table['table_name']
+        builder = self._generate_columns(table, configurator, internal_start_row_id, internal_row_count, **kwargs)
+        with self._stage(table_name, "convert"):
+            parquet_schema_map = self._parquet_schema_map(table)
+            arrays = {}
+            empty_columns = {}  # dtypes for the pandas metadata
+            for name, column in self._finished_series(builder, table, self._is_seekable(configurator, kwargs)):
+                try:
+                    array = pa.array(column, from_pandas=True)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as error:
+                    error.args += (f"Conversion failed for column {name} with type {column.dtype}",)
+                    raise
+                if name in parquet_schema_map:
+                    array = array.cast(self._parse_parquet_type(parquet_schema_map[name]), safe=False)
+                arrays[name] = array
+                empty_columns[name] = column.iloc[:0]
+                del column
+
+            names = builder.column_names
+            metadata = None
+            if not parquet_schema_map:
+                # the pandas metadata pa.Table.from_pandas writes; casting to a parquet schema drops it
+                metadata = pandas_compat.construct_metadata([empty_columns[name] for name in names], pd.DataFrame(), names, [], [], False,
+                                                            [arrays[name].type for name in names])
+            arrow_table = pa.Table.from_arrays([arrays.pop(name) for name in names], names=names, metadata=metadata)
+        util.log(f"{table_name} arrow table created", util.FOREGROUND_COLOR.GREEN)
+        return arrow_table
+
+    @staticmethod
+    def _parquet_schema_map(table):
+        return {col['column_name']: col['parquet_type'] for col in table['columns'] if 'parquet_type' in col}
+
+    def _finished_series(self, builder, table, seekable=False):
+        """
+        Yield (column_name, Series) with the declared type and null_percentage of
+        every column applied, in config order. A column's buffer is released when
+        its Series is built, so callers converting one column at a time never
+        hold the whole table twice.
+
+        In seekable mode every row is null with probability null_percentage, drawn
+        from the stream of its cell, instead of nulls being spread over the chunk.
+        """
+        columns = table['columns']
+        # declared types were built during generation, the other columns get the best fitting type
+        typed_columns = builder.typed_columns()
+        last_definition = {column['column_name']: i for i, column in enumerate(columns)}
+        series = {}
+        for i, column in enumerate(columns):
+            column_name = column['column_name']
+            if column_name not in series:
+                series[column_name] = builder.pop_series(column_name)
+            if "type" in column:
+                util.log(f"Converting Column {column_name} to {column['type']}", util.FOREGROUND_COLOR.MAGENTA, util.DEBUG)
+                if column_name not in typed_columns:
+                    series[column_name] = series[column_name].astype(column['type'])
+            if "null_percentage" in column:
+                null_percentage = util.parse_null_percentage(column["null_percentage"])
+                if seekable:
+                    key = rng.stream_key(self._stream_seed(), table['table_name'], column_name, "null_percentage")
+                    null_indices = series[column_name].index[rng.uniforms(key, builder.row_ids()) < null_percentage]
+                    num_nulls = len(null_indices)
+                else:
+                    num_nulls = self._null_count(table, builder.start_row_id, builder.row_count, null_percentage)
+                    null_indices = np.random.choice(series[column_name].index, size=num_nulls, replace=False)
+                if num_nulls > 0:
+                    # unlike a DataFrame, a Series turns int64 into float64 even when no index is selected
+                    series[column_name].loc[null_indices] = None
+            if last_definition[column_name] == i:
+                yield column_name, series.pop(column_name)
 
+    def _null_count(self, table, start_row_id, row_count, null_percentage):
+        """
+        Nulls of row_count rows from start_row_id: the share of the rows of the table up to
+        their end minus the share before them, so the batches and files of a table add up to
+        the nulls of one DataFrame of it.
+        """
+        offset = start_row_id - (table['start_row_id'] if "start_row_id" in table else 1)
+        return int((offset + row_count) * null_percentage) - int(offset * null_percentage)
+
+    def _get_run_environment(self, configurator, locale, kwargs):
+        """
+        Evaluation environment of a run: plugins from python_import, community
+        and fake_provider providers, custom functions and get_table.
+
+        Built once per configuration rather than per table or chunk, so plugin
+        modules are imported once and keep their module-level state between
+        chunks, and providers are added to the Faker once.
+        """
+        if self._run_environment is not None and self._run_environment[0] is configurator:
+            return self._run_environment[1]
         fake = self._get_fake(locale)
         python_import = configurator.get_python_import()
         
@@ -340,9 +1135,8 @@ class TableFaker:
             "math": math,
             "string": string,
             "fake": fake,
-            "result": [],
             "foreign_key": self.foreign_key,
-            "copy_from_fk": self._copy_from_fk
+            "copy_from_fk": self._copy_from_fk,
         }
         
         # Helper function for plugins to access generated table data
@@ -362,6 +1156,34 @@ class TableFaker:
                 func = kwargs["custom_function"]
                 variables[func.__name__] = func
 
+        if self.profiler is not None:
+            # plugin and custom functions are timed when a sampled row calls them
+            wrap = functools.partial(timed, lambda: self.profiler)
+            for module in plugins.modules:
+                module_name = module.__name__.split(".")[-1]
+                if variables.get(module_name) is module:
+                    variables[module_name] = ProfiledModule(module, wrap)
+            custom_functions = kwargs.get("custom_function", [])
+            custom_functions = custom_functions if isinstance(custom_functions, list) else [custom_functions]
+            for name in list(plugins.exports) + [func.__name__ for func in custom_functions]:
+                variables[name] = wrap(name, variables[name])
+
+        self._run_environment = (configurator, variables)
+        return variables
+
+    def _generate_columns(self, table, configurator, internal_start_row_id=0, internal_row_count=sys.maxsize, **kwargs):
+        """Generate the rows of a table into a ColumnBuilder."""
+        locale = None
+        if "config" in configurator.config and "locale" in configurator.config["config"]:
+            locale = configurator.config["config"]["locale"]
+
+        fake = self._get_fake(locale)
+        # plugins, providers and custom functions are loaded once per run, each table gets a copy
+        variables = dict(self._get_run_environment(configurator, locale, kwargs))
+        # plugins and custom functions may shadow result and rng
+        variables.setdefault("result", [])
+        variables.setdefault("rng", rng.Streams(self._stream_seed(), table["table_name"]))
+
         table_name = table['table_name']
         row_count = table['row_count'] if "row_count" in table else 10
         row_count = min(row_count, internal_row_count)
@@ -417,58 +1239,136 @@ class TableFaker:
             
             if command and isinstance(command, str) and "return " in command:
                 func_inner_code = "\n".join(["    " + line for line in command.split("\n")])
+                # the name is still drawn from random, seeded output depends on the draws
                 func_name = f"func_" + ''.join(random.choices(string.ascii_lowercase, k=5))
-                func_code = f"def {func_name}():\n{func_inner_code}"
                 namespace = {}
-                exec(func_code, variables, namespace)
-                func = namespace[func_name]
-                variables[func_name] = func
-                command = f"{func_name}()"
+                # compiled under a fixed name, so the cached code is keyed on the block alone
+                exec(plan_cache.compiled(f"def _tf_column_func():\n{func_inner_code}"), variables, namespace)
+                variables[func_name] = namespace["_tf_column_func"]
+                compiled_commands[column_name] = compile(f"result = {func_name}()", "<string>", "exec")
+                continue
             
-            compiled_commands[column_name] = compile(f"result = {command}", "<string>", "exec")
+            compiled_commands[column_name] = plan_cache.compiled(f"result = {command}")
 
+        plan = self._get_row_plan(table_name, columns)
+        # columns reading rng get the stream of their (seed, table, column, row_id) cell selected before they run
+        streams = variables.get("rng")
+        column_names = {c["column_name"] for c in columns}
+        self._row_streams = streams if isinstance(streams, rng.Streams) and "rng" not in column_names else None
+        self._row_streams_columns = {c["column_name"] for c in columns if "rng" in referenced_names(c["data"])}
+        seekable = self._is_seekable(configurator, kwargs)
+        self._cell_seeds = self._get_cell_seeds(table_name, columns, variables) if seekable else None
+        if seekable and variables.get("random") is random:
+            variables["random"] = self._cell_seeds.random
+        engine = self._get_engine(configurator, kwargs)
+        row_function = None
+        vector_values = {}
+        if engine == "codegen":
+            row_function = self._build_row_function(table_name, plan, variables)
+        elif engine == "vectorized":
+            vector_columns = find_vector_columns(plan, variables)
+            if vector_columns:
+                row_ids = np.arange(start_row_id, start_row_id + row_count, dtype=np.int64)
+                rng_for_column = self._vector_rng_factory(table_name, start_row_id, row_ids if seekable else None)
+                with self._stage(table_name, "vectorized columns"):
+                    vector_values = generate_vector_columns(vector_columns, row_ids, rng_for_column, self._row_streams)
+                for pk_col in plan.pk_columns:
+                    if pk_col in vector_values:
+                        self._primary_keys(table_name, pk_col).extend(vector_values[pk_col])
+        vector_rows = zip(*vector_values.values())
+        all_vectorized = bool(vector_values) and len(vector_values) == len(columns)
 
-        rows = []
-        pk_cols = [c["column_name"] for c in columns if c.get("is_primary_key")]
+        pk_cols = plan.pk_columns
+        usage = self._get_parent_usage(configurator)
+        parent_cache = self._get_parent_cache(table_name, pk_cols, columns, usage)
+        builder = ColumnBuilder(plan.columns, start_row_id)
         
-        # Initialize generated_rows for this table
-        self.generated_rows[table_name] = rows
+        # Initialize generated_rows for this table (only kept when get_table reads it)
+        rows = None
+        if usage.keeps_rows(table_name):
+            rows = self.generated_rows[table_name] = []
         
         # Track current child table for is_unique foreign key support
         self._current_child_table = table_name
+        progress = self._progress.table(table_name, row_count)
+        self._prefetch_foreign_keys(table_name, columns, start_row_id, row_count)
         
-        for row_id in range(start_row_id, start_row_id+row_count):
-            util.progress_bar(row_id-start_row_id+1, row_count, f"Table:{table_name}")
-            variables["row_id"] = row_id
-            self.primary_key_seed = row_id
-            new_row = self.generate_fake_row(table_name, columns, variables, compiled_commands)
-            rows.append(new_row)
-            # Cache full parent row indexed by all PK columns
-            if pk_cols:
-                self.parent_rows.setdefault(table_name, {})
-                for pk_col in pk_cols:
-                    self.parent_rows[table_name][new_row[pk_col]] = new_row
-
-        df = pd.DataFrame(rows)
-        df = df.convert_dtypes()  # auto set best fitting type
-        df.Name = table['table_name']
-        for column in columns:
-            column_name = column['column_name']
-            if "type" in column:
-                util.log(f"Converting Column {column_name} to {column['type']}", util.FOREGROUND_COLOR.MAGENTA)
-                df[column_name] = df[column_name].astype(column['type'])
-            if "null_percentage" in column:
-                null_percentage = util.parse_null_percentage(column["null_percentage"])
-                num_nulls = int(row_count * null_percentage)
-                null_indices = np.random.choice(df.index, size=num_nulls, replace=False)
-                df.loc[null_indices, column_name] = None
+        if all_vectorized:
+            # every column came from the vectorized engine, no per-row evaluation left
+            builder.add_columns(vector_values)
+            progress.add(row_count)
+            if rows is not None or parent_cache is not None:
+                names = list(vector_values)
+                for values in zip(*vector_values.values()):
+                    new_row = dict(zip(names, values))
+                    if rows is not None:
+                        rows.append(new_row)
+                    if parent_cache is not None:
+                        parent_cache.add_row(new_row)
+            row_count_to_generate = 0
+        else:
+            row_count_to_generate = row_count
 
-        parquet_schema_map = {col['column_name']: col['parquet_type'] for col in columns if 'parquet_type' in col}
-        if parquet_schema_map:
-            df.attrs['parquet_schema'] = parquet_schema_map
+        profiler = self.profiler
+        sample_every = 0
+        if profiler is not None:
+            sample_every = profiler.every
+            profiler.expressions.update({(table_name, c["column_name"]): c["data"] for c in columns})
+        sampled_row_function = None
+        if sample_every and row_function is not None:
+            column_timer = lambda column_name, seconds: profiler.add_column(table_name, column_name, seconds)
+            sampled_row_function = self._build_row_function(table_name, plan, variables, column_timer)
+        rows_started = self.run_stats.clock()
 
-        util.log(f"{table_name} pandas dataframe created", util.FOREGROUND_COLOR.GREEN)
-        return df
+        # in seekable mode Faker draws from the stream of the selected cell too
+        fake_randoms = None
+        if self._cell_seeds is not None:
+            fake_randoms = [factory.random for factory in fake.factories]
+            for factory in fake.factories:
+                factory.random = self._cell_seeds.random
+        try:
+            for row_id in range(start_row_id, start_row_id+row_count_to_generate):
+                progress.add()
+                variables["row_id"] = row_id
+                self.primary_key_seed = row_id
+                prefilled = dict(zip(vector_values, next(vector_rows))) if vector_values else None
+                if sample_every and row_id % sample_every == 0:
+                    # sampled rows are timed column by column, through the engine that generates the others
+                    profiler.active = True
+                    try:
+                        if sampled_row_function is None:
+                            new_row = self.generate_fake_row(table_name, columns, variables, compiled_commands, plan, prefilled)
+                        else:
+                            new_row = sampled_row_function(row_id)
+                    finally:
+                        profiler.active = False
+                elif row_function is None:
+                    new_row = self.generate_fake_row(table_name, columns, variables, compiled_commands, plan, prefilled)
+                else:
+                    new_row = row_function(row_id)
+                builder.add_row(new_row)
+                if rows is not None:
+                    rows.append(new_row)
+                # Cache the referenced parent attributes indexed by all PK columns
+                if parent_cache is not None:
+                    parent_cache.add_row(new_row)
+        except (AttributeError, NameError) as error:
+            if row_function is None:
+                raise
+            raise row_function.column_error(error)
+        finally:
+            self.fk_prefetch = {}
+            self._row_streams = None
+            self._cell_seeds = None
+            if fake_randoms is not None:
+                for factory, previous in zip(fake.factories, fake_randoms):
+                    factory.random = previous
+            if parent_cache is not None:
+                parent_cache.flush()
+            if profiler is not None and row_count_to_generate:
+                profiler.add_stage(table_name, "rows", self.run_stats.clock() - rows_started)
+
+        return builder
 
     def foreign_key(self, table_name, column_name, distribution="uniform",
                     param=None, parent_attr=None, weights=None, is_unique=False):
@@ -484,83 +1384,189 @@ class TableFaker:
             weights: Weight mapping for weighted_parent distribution
             is_unique: If True, each parent key is used at most once per child table
         """
+        if not is_unique and self.fk_prefetch:
+            # drawn for the whole chunk by _prefetch_foreign_keys
+            signature = self._fk_signature(table_name, column_name, distribution, param, parent_attr, weights, is_unique)
+            prefetched = self.fk_prefetch.get(signature)
+            if prefetched is not None and self.primary_key_seed is not None:
+                start_row_id, values = prefetched
+                offset = self.primary_key_seed - start_row_id
+                if 0 <= offset < len(values):
+                    return values[offset]
+
         if table_name not in self.primary_key_cache:
             raise Exception(f"Table {table_name} not found while looking for primary key")
         if column_name not in self.primary_key_cache[table_name]:
             raise Exception(f"Column {column_name} not found in table {table_name} while looking for primary key")
         
-        pk_values = self.primary_key_cache[table_name][column_name]
-        
-        # Filter out already-used values when is_unique is enabled
         if is_unique:
-            unique_key = (self._current_child_table, table_name, column_name)
-            used = self.unique_fk_used.setdefault(unique_key, set())
-            pk_values = [v for v in pk_values if v not in used]
-            if len(pk_values) == 0:
-                raise Exception(
-                    f"All primary key values in {table_name}.{column_name} have been used. "
-                    f"Child table has more rows than available unique parent keys."
-                )
-        
+            return self._unique_foreign_key(table_name, column_name, distribution, param, parent_attr, weights)
+
+        pk_values = self.primary_key_cache[table_name][column_name].array()
         n = len(pk_values)
         if n == 0:
             raise Exception(f"No keys in {table_name}.{column_name}")
         
-        # Create independent RNG per FK call for determinism
-        seed = self._stable_seed(self.primary_key_seed, table_name, column_name, distribution, param, parent_attr, is_unique)
-        rnd = random.Random(seed)
-        
+        row_ids = [0 if self.primary_key_seed is None else self.primary_key_seed]
+        index = self._draw_foreign_key_indexes(table_name, column_name, distribution, param, parent_attr, weights, is_unique, pk_values, row_ids)[0]
+        selected = pk_values[index]
+        return selected if pk_values.dtype == object else selected.item()
+
+    def _unique_foreign_key(self, table_name, column_name, distribution, param, parent_attr, weights):
+        """
+        Next unused parent key of the child table being generated.
+
+        Each (child table, parent column, distribution) walks its own permutation of
+        the parent keys with a cursor. The set of used values is shared per
+        (child table, parent column), so several unique calls on the same parent
+        never hand out the same key; already used keys are skipped.
+        """
+        keys = self.primary_key_cache[table_name][column_name]
+        unique_key = (self._current_child_table, table_name, column_name)
+        used = self.unique_fk_used.setdefault(unique_key, set())
+        signature = (self._current_child_table,) + self._fk_signature(table_name, column_name, distribution, param, parent_attr, weights, True)
+        state = self.unique_fk_orders.get(signature)
+        if state is None or state[0] is not keys or state[1] != len(keys):
+            # new parent keys: start over on a permutation of all of them, used keys are skipped
+            order = self._unique_foreign_key_order(signature, table_name, column_name, distribution, param, parent_attr, weights, keys.array())
+            state = [keys, len(keys), order, 0]
+            self.unique_fk_orders[signature] = state
+        values, order = keys.array(), state[2]
+        while state[3] < len(order):
+            selected = values[order[state[3]]]
+            state[3] += 1
+            if values.dtype != object:
+                selected = selected.item()
+            if selected not in used:
+                used.add(selected)
+                return selected
+        raise Exception(
+            f"All primary key values in {table_name}.{column_name} have been used. "
+            f"Child table has more rows than available unique parent keys."
+        )
+
+    def _unique_foreign_key_order(self, signature, table_name, column_name, distribution, param, parent_attr, weights, pk_values):
+        """
+        Order in which unique foreign keys hand out parent positions: a random
+        permutation for uniform, a weighted sample without replacement
+        (Efraimidis-Spirakis: ascending -log(u) / weight) for zipf and weighted_parent.
+        """
+        n = len(pk_values)
+        u = rng.uniforms(rng.stream_key(self._stream_seed(), *signature), np.arange(n, dtype=np.int64))
+        if distribution == "uniform":
+            return np.argsort(u, kind="stable")
+        if distribution not in ("zipf", "weighted_parent"):
+            raise Exception(f"Unknown distribution {distribution}")
+        key_weights = self._foreign_key_weights(table_name, distribution, param, parent_attr, weights, pk_values)
+        if (key_weights < 0).any():
+            raise Exception(f"{distribution} weights of {table_name}.{column_name} must be non-negative")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            arrival = -np.log1p(-u) / key_weights
+        # keys with weight 0 come after all the others
+        arrival = np.where(key_weights > 0, arrival, np.inf)
+        return np.argsort(arrival, kind="stable")
+
+    def _fk_signature(self, table_name, column_name, distribution, param, parent_attr, weights, is_unique):
+        weights_key = None if weights is None else repr(sorted(weights.items(), key=repr))
+        return (table_name, column_name, distribution, param, parent_attr, weights_key, is_unique)
+
+    def _draw_foreign_key_indexes(self, table_name, column_name, distribution, param, parent_attr, weights, is_unique, pk_values, row_ids):
+        """
+        Positions in pk_values selected for the given child row ids.
+
+        Every row draws from a counter-based stream keyed by the call arguments and
+        the row id, so a row gets the same key whether it is drawn alone or with
+        the rest of its chunk.
+        """
+        n = len(pk_values)
+        key = rng.stream_key(self._stream_seed(), table_name, column_name, distribution, param, parent_attr, is_unique)
+        u = rng.uniforms(key, row_ids)
+
         if distribution == "uniform":
-            idx = rnd.randrange(n)
-            selected = pk_values[idx]
-        elif distribution == "zipf":
+            return np.minimum((u * n).astype(np.int64), n - 1)
+        if distribution not in ("zipf", "weighted_parent"):
+            raise Exception(f"Unknown distribution {distribution}")
+        return self._foreign_key_sampler(table_name, column_name, distribution, param, parent_attr, weights).sample(u)
+
+    def _foreign_key_weights(self, table_name, distribution, param, parent_attr, weights, pk_values):
+        """Weight of every parent key for the zipf and weighted_parent distributions."""
+        n = len(pk_values)
+        if distribution == "zipf":
             a = float(param) if param is not None else 1.2
             # weights proportional to 1/(i+1)^a over existing order
-            w = [1.0 / ((i + 1) ** a) for i in range(n)]
-            total = sum(w)
-            r = rnd.random() * total
-            cum = 0.0
-            selected = pk_values[-1]
-            for i, wi in enumerate(w):
-                cum += wi
-                if r <= cum:
-                    selected = pk_values[i]
-                    break
-        elif distribution == "weighted_parent":
-            if parent_attr is None or weights is None:
-                raise Exception("weighted_parent requires parent_attr and weights")
-            parent_map = self.parent_rows.get(table_name, {})
-            # map index -> weight via parent attribute
-            mapped = []
-            for i, pk in enumerate(pk_values):
-                row = parent_map.get(pk)
-                val = None if row is None else row.get(parent_attr)
-                mapped.append(float(weights.get(str(val), 1.0)))
-            total = sum(mapped)
-            r = rnd.random() * total
-            cum = 0.0
-            selected = pk_values[-1]
-            for i, wi in enumerate(mapped):
-                cum += wi
-                if r <= cum:
-                    selected = pk_values[i]
-                    break
-        else:
-            raise Exception(f"Unknown distribution {distribution}")
-        
-        # Track used value for is_unique
-        if is_unique:
-            used.add(selected)
-        
-        return selected
+            return 1.0 / np.arange(1, n + 1, dtype=np.float64) ** a
+        if parent_attr is None or weights is None:
+            raise Exception("weighted_parent requires parent_attr and weights")
+        parent_cache = self.parent_rows.get(table_name)
+        # map index -> weight via parent attribute
+        mapped = np.empty(n, dtype=np.float64)
+        for i, pk in enumerate(pk_values.tolist() if isinstance(pk_values, np.ndarray) else pk_values):
+            val = None if parent_cache is None else parent_cache.get(pk, parent_attr)
+            mapped[i] = float(weights.get(str(val), 1.0))
+        return mapped
+
+    def _foreign_key_sampler(self, table_name, column_name, distribution, param, parent_attr, weights):
+        """
+        Alias table of a zipf or weighted_parent distribution over all keys of a parent column.
+        Built once per parent table state and rebuilt when the parent gains rows or is replaced.
+        """
+        keys = self.primary_key_cache[table_name][column_name]
+        parent_cache = self.parent_rows.get(table_name) if distribution == "weighted_parent" else None
+        counts = (len(keys), 0 if parent_cache is None else len(parent_cache))
+        signature = self._fk_signature(table_name, column_name, distribution, param, parent_attr, weights, False)
+        cached = self.fk_samplers.get(signature)
+        if cached is not None and cached[0] is keys and cached[1] is parent_cache and cached[2] == counts:
+            return cached[3]
+        key_weights = self._foreign_key_weights(table_name, distribution, param, parent_attr, weights, keys.array())
+        if (key_weights < 0).any() or not key_weights.sum() > 0:
+            raise Exception(f"{distribution} weights of {table_name}.{column_name} must be non-negative with a positive sum")
+        sampler = rng.AliasTable(key_weights)
+        self.fk_samplers[signature] = (keys, parent_cache, counts, sampler)
+        return sampler
+
+    def _prefetch_foreign_keys(self, table_name, columns, start_row_id, row_count):
+        """
+        Draw every foreign_key(...) call with literal arguments for a whole chunk at once.
+        Calls that cannot be drawn up front (unique keys, keys of the table itself,
+        errors) are left to foreign_key, which raises as before when it is reached.
+        """
+        self.fk_prefetch = {}
+        if row_count <= 0:
+            return
+        row_ids = np.arange(start_row_id, start_row_id + row_count, dtype=np.int64)
+        for arguments in literal_foreign_key_calls(columns):
+            parent_table, parent_column = arguments["table_name"], arguments["column_name"]
+            distribution = arguments.get("distribution", "uniform")
+            param, parent_attr, weights = arguments.get("param"), arguments.get("parent_attr"), arguments.get("weights")
+            if arguments.get("is_unique") or parent_table == table_name:
+                continue
+            signature = self._fk_signature(parent_table, parent_column, distribution, param, parent_attr, weights, False)
+            if signature in self.fk_prefetch:
+                continue
+            try:
+                pk_values = self.primary_key_cache[parent_table][parent_column].array()
+                if len(pk_values) == 0:
+                    continue
+                indexes = self._draw_foreign_key_indexes(parent_table, parent_column, distribution, param, parent_attr, weights, False, pk_values, row_ids)
+            except Exception:
+                continue
+            self.fk_prefetch[signature] = (start_row_id, pk_values[indexes].tolist())
 
-    def generate_fake_row(self, table_name:str, columns:dict, variables:dict, compiled_commands:dict=None):
+    def generate_fake_row(self, table_name:str, columns:dict, variables:dict, compiled_commands:dict=None, plan:RowPlan=None, prefilled:dict=None):
         """
-        Generate a fake row using two-phase evaluation.
-        Phase A: PK columns and foreign_key columns
-        Phase B: remaining columns (including copy_from_fk)
+        Generate a fake row following the table's evaluation plan.
+        Columns run in dependency order, so a column (including copy_from_fk)
+        always sees the values of the columns it references.
+        Columns in prefilled (already generated by the vectorized engine) are not evaluated again.
+        While the profiler samples the row, every column expression is timed.
         """
+        if plan is None:
+            plan = self._get_row_plan(table_name, columns)
+
         result = {}
+        if prefilled:
+            result.update(prefilled)
+            variables.update(prefilled)
         
         def _exec_col(col):
             """Execute a single column's data expression."""
@@ -569,6 +1575,10 @@ class TableFaker:
             command = col["data"]
             variables["command"] = command
             is_primary_key = col.get("is_primary_key", False)
+            if self._row_streams is not None and column_name in self._row_streams_columns:
+                self._row_streams.select(column_name, variables["row_id"])
+            if self._cell_seeds is not None:
+                self._cell_seeds.select(column_name, variables["row_id"])
             
             try:
                 exec(code, variables)
@@ -584,47 +1594,22 @@ class TableFaker:
             result[column_name] = generated_value
             
             if is_primary_key:
-                if table_name not in self.primary_key_cache:
-                    self.primary_key_cache[table_name] = {}
-                if column_name not in self.primary_key_cache[table_name]:
-                    self.primary_key_cache[table_name][column_name] = []
-                self.primary_key_cache[table_name][column_name].append(generated_value)
-        
-        # Phase A: PK columns without dependencies and columns with foreign_key
-        # Phase B: columns that depend on other columns (including PKs with dependencies)
-        phase_a = []
-        phase_b = []
-        col_names = {c["column_name"] for c in columns}
+                self._cache_primary_key(table_name, column_name, generated_value)
         
-        for col in columns:
-            expr = str(col["data"])
-            has_fk = "foreign_key(" in expr
-            is_pk = col.get("is_primary_key", False)
-            
-            # Check if expression references other column names
-            has_dependencies = False
-            if not has_fk and expr:
-                # Check if any column name appears in the expression
-                for col_name in col_names:
-                    if col_name != col["column_name"] and col_name in expr:
-                        has_dependencies = True
-                        break
-            
-            # Phase A: independent PKs, foreign keys, and expressions with no column dependencies
-            # Phase B: expressions that reference other columns
-            if (is_pk or has_fk or not has_dependencies):
-                phase_a.append(col)
-            else:
-                phase_b.append(col)
-        
-        for col in phase_a:
-            _exec_col(col)
-        
-        # Make current row visible to copy_from_fk during phase B
+        profiler = self.profiler if self.profiler is not None and self.profiler.active else None
+
+        # Make current row visible to copy_from_fk
         self._current_row = result
         try:
-            for col in phase_b:
+            for col in plan.columns:
+                if prefilled and col["column_name"] in prefilled:
+                    continue
+                if profiler is None:
+                    _exec_col(col)
+                    continue
+                started = self.run_stats.clock()
                 _exec_col(col)
+                profiler.add_column(table_name, col["column_name"], self.run_stats.clock() - started)
         finally:
             self._current_row = None
         
@@ -635,6 +1620,18 @@ def to_pandas(config_source:str, table_name=None, **kwargs):
     table_faker = TableFaker()
     return table_faker.to_pandas(config_source, table_name, **kwargs)
 
+def to_arrow(config_source, table_name=None, **kwargs):
+    table_faker = TableFaker()
+    return table_faker.to_arrow(config_source, table_name, **kwargs)
+
+def generate_rows(config_source, table_name, start, stop, output="pandas", **kwargs):
+    table_faker = TableFaker()
+    return table_faker.generate_rows(config_source, table_name, start, stop, output, **kwargs)
+
+def iter_batches(config_source, table_name, batch_size=10000, output="pandas", **kwargs):
+    table_faker = TableFaker()
+    return table_faker.iter_batches(config_source, table_name, batch_size, output, **kwargs)
+
 def to_csv(config_source, target_file_path=None, table_name=None, **kwargs) :
     table_faker = TableFaker()
     return table_faker.to_target("csv", config_source, target_file_path, table_name, **kwargs)
@@ -663,6 +1660,10 @@ def to_target(file_type, config_source, target_file_path, table_name=None, **kwa
     table_faker = TableFaker()
     return table_faker.to_target(file_type, config_source, target_file_path, table_name, **kwargs)
 
+def to_database(config_source, target, table_name=None, **kwargs):
+    table_faker = TableFaker()
+    return table_faker.to_database(config_source, target, table_name, **kwargs)
+
 def yaml_to_json(config_source, target_file_path=None):
     conf = config.Config(config_source)
     conf.to_json(target_file_path)
@@ -0,0 +1,165 @@
+# column buffers filled while rows are generated: declared types go straight into typed arrays
+import array
+from operator import itemgetter
+import numpy as np
+import pandas as pd
+
+ARRAY_TYPECODES = {
+    np.dtype(np.int8): "b", np.dtype(np.int16): "h", np.dtype(np.int32): "i", np.dtype(np.int64): "q",
+    np.dtype(np.uint8): "B", np.dtype(np.uint16): "H", np.dtype(np.uint32): "I", np.dtype(np.uint64): "Q",
+    np.dtype(np.float32): "f", np.dtype(np.float64): "d", np.dtype(np.bool_): "B",
+}
+FLUSH_ROWS = 65536  # row dicts collected before they are split into the column buffers
+
+
+class ColumnBuffer:
+    """Values of one column; the dtype is inferred with convert_dtypes when the frame is built."""
+
+    typed = False
+
+    def __init__(self):
+        self.values = []
+
+    def extend(self, values):
+        self.values.extend(values)
+
+    def to_series(self):
+        return pd.Series(self.values, dtype=object).infer_objects().convert_dtypes()
+
+
+class TypedColumnBuffer(ColumnBuffer):
+    """
+    Values of a column with a NumPy `type` (int32, float, bool, ...) kept in an
+    array.array of that type, so a big column does not hold one Python object
+    per value. The first values array.array rejects (None, a float in an int
+    column, an int that overflows) turn the column back into a plain list
+    converted the untyped way, so the result always equals convert_dtypes()
+    followed by astype(type).
+    """
+
+    def __init__(self, dtype):
+        self.dtype = dtype
+        self.buffer = array.array(ARRAY_TYPECODES[dtype])
+        self.values = None  # list once some values did not fit the buffer
+        self.typed = True
+
+    def extend(self, values):
+        if self.values is None:
+            # array "B" takes any small int, a bool column only takes bools
+            if self.dtype != np.bool_ or set(map(type, values)) <= {bool}:
+                try:
+                    self.buffer.fromlist(values)
+                    return
+                except (TypeError, OverflowError):
+                    pass
+            self.values = [bool(v) for v in self.buffer] if self.dtype == np.bool_ else self.buffer.tolist()
+            self.buffer = None
+            self.typed = False
+        self.values.extend(values)
+
+    def to_series(self):
+        if self.values is not None:
+            return super().to_series()
+        return pd.Series(np.frombuffer(self.buffer, dtype=self.dtype))
+
+
+class StringColumnBuffer(ColumnBuffer):
+    """Values of a `type: string` column, built into a pandas string array without inference."""
+
+    def __init__(self):
+        super().__init__()
+        self.typed = True
+
+    def extend(self, values):
+        if self.typed:
+            self.typed = set(map(type, values)) <= {str}
+        self.values.extend(values)
+
+    def to_series(self):
+        if self.typed:
+            return pd.Series(pd.array(self.values, dtype="string"))
+        return super().to_series()
+
+
+def column_buffer(type_name):
+    """Buffer for a column with the given `type` (None for untyped columns)."""
+    if type_name == "string":
+        return StringColumnBuffer()
+    if not isinstance(type_name, str):
+        return ColumnBuffer()
+    try:
+        dtype = np.dtype(type_name)
+    except TypeError:
+        # pandas extension types (Int64, category, ...) are converted after inference
+        return ColumnBuffer()
+    if dtype not in ARRAY_TYPECODES:
+        return ColumnBuffer()
+    return TypedColumnBuffer(dtype)
+
+
+class ColumnBuilder:
+    """
+    Collects the rows of a table and builds its DataFrame column by column.
+
+    Rows are split into per-column buffers every FLUSH_ROWS rows. Columns whose
+    `type` maps onto a NumPy dtype go into typed arrays and `type: string`
+    columns into a string array, so only untyped columns go through dtype
+    inference and no object frame of the whole table is built.
+    """
+
+    def __init__(self, columns, start_row_id=0):
+        names = [c["column_name"] for c in columns]
+        types = {}
+        for col in columns:
+            name = col["column_name"]
+            # a name defined twice keeps the generic path and the astype of every definition
+            types[name] = col.get("type") if names.count(name) == 1 else None
+        self.column_names = list(dict.fromkeys(names))
+        self.buffers = {name: column_buffer(types[name]) for name in self.column_names}
+        self.rows = []
+        self.row_count = 0
+        self.start_row_id = start_row_id
+
+    def add_row(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= FLUSH_ROWS:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        for name, buffer in self.buffers.items():
+            buffer.extend(list(map(itemgetter(name), self.rows)))
+        self.row_count += len(self.rows)
+        self.rows = []
+
+    def add_columns(self, values):
+        """Add whole columns at once ({column_name: list of values})."""
+        self.flush()
+        for name, buffer in self.buffers.items():
+            buffer.extend(values[name])
+        self.row_count += len(next(iter(values.values()))) if values else 0
+
+    def row_ids(self):
+        """Row ids of the rows added so far, as a NumPy array."""
+        self.flush()
+        return np.arange(self.start_row_id, self.start_row_id + self.row_count, dtype=np.int64)
+
+    def typed_columns(self):
+        """Names of the columns that already have their declared type."""
+        self.flush()
+        return {name for name, buffer in self.buffers.items() if buffer.typed}
+
+    def pop_series(self, name):
+        """Series of one column; its buffer is released."""
+        self.flush()
+        return self.buffers.pop(name).to_series()
+
+    def to_data_frame(self):
+        self.flush()
+        if not self.buffers:
+            return pd.DataFrame(index=pd.RangeIndex(self.row_count))
+        data = {}
+        for name in list(self.buffers):
+            data[name] = self.pop_series(name)
+        return pd.DataFrame(data)
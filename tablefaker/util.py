@@ -1,5 +1,6 @@
-import inspect
 import datetime
+import json
+import logging
 import sys
 import shutil
 import re
@@ -53,13 +54,108 @@ class TEXT_ATTRIBUTES:
     RESET = '\033[0m'
 
 
-def log(message, message_color=FOREGROUND_COLOR.RESET):
-    caller_function = ""
-    for func in reversed(inspect.stack()):
-        if func.function != "log":
-            caller_function = func.function
-
-    print(f"[tablefaker][{caller_function}] - {message_color}{message}{FOREGROUND_COLOR.RESET}")
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+LOG_FORMATS = ["text", "json"]
+
+logger = logging.getLogger("tablefaker")
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to sys.stdout as it is when a record is emitted, so a replaced stdout (tests, notebooks) gets the logs."""
+    def __init__(self):
+        super().__init__()
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class TextFormatter(logging.Formatter):
+    """[tablefaker][calling function] - colored message"""
+    def format(self, record):
+        color = getattr(record, "color", FOREGROUND_COLOR.RESET)
+        return f"[tablefaker][{record.funcName}] - {color}{record.getMessage()}{FOREGROUND_COLOR.RESET}"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, function, message and the fields passed to log()."""
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "function": record.funcName,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+_log_format = "text"
+_handler = None  # the handler added by configure_logging
+
+
+def configure_logging(level=None, log_format=None, quiet=False, stream=None):
+    """
+    Configure the tablefaker logger and add its own handler, writing to stdout.
+
+    Until it is called (the CLI does), the logger only has a NullHandler and its
+    records propagate to the handlers of the application. level is a logging level
+    (default INFO, WARNING when quiet), log_format "text" (colored lines) or "json"
+    (one object per line for log collectors), stream a file to write to instead of
+    stdout. quiet also turns off the progress bar. Calling it again replaces the
+    handler it added; handlers added by the application are kept.
+    """
+    global _log_format, _handler
+    if log_format is not None:
+        if log_format not in LOG_FORMATS:
+            raise Exception(f"Wrong log_format = {log_format}. Supported formats: {LOG_FORMATS}")
+        _log_format = log_format
+    if level is None and quiet:
+        level = WARNING
+    if level is None and logger.level == logging.NOTSET:
+        level = INFO
+    if level is not None:
+        logger.setLevel(level)
+    if stream is not None or _handler not in logger.handlers:
+        # the handler is found by identity, the application may have added or removed others
+        if _handler is not None:
+            logger.removeHandler(_handler)
+        _handler = _StdoutHandler() if stream is None else logging.StreamHandler(stream)
+        logger.addHandler(_handler)
+    _handler.setFormatter(JsonFormatter() if _log_format == "json" else TextFormatter())
+
+
+def logging_options():
+    """
+    (level, log_format) of the tablefaker logger, to configure worker processes the same way;
+    None when configure_logging was not called.
+    """
+    if _handler is None:
+        return None
+    return logger.level, _log_format
+
+
+def log_format():
+    return _log_format
+
+
+def log(message, message_color=FOREGROUND_COLOR.RESET, level=INFO, fields=None):
+    """Log a message from the calling function; fields are added to json log lines."""
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"color": message_color, "fields": fields}, stacklevel=2)
+
+
+logger.addHandler(logging.NullHandler())
 
 def get_temp_filename(file_name=None):
     if file_name == None:
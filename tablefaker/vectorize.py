@@ -0,0 +1,357 @@
+# vectorized column generation: whole columns as NumPy arrays for recognizable expressions
+import ast
+import numpy as np
+from .rng import Streams
+
+ARITHMETIC_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.FloorDiv: np.floor_divide,
+    ast.Mod: np.mod,
+}
+ZERO_DIVISOR_OPERATORS = (ast.Div, ast.FloorDiv, ast.Mod)
+INT64_MIN, INT64_MAX = int(np.iinfo(np.int64).min), int(np.iinfo(np.int64).max)
+INT64_LIMIT = 2.0 ** 63  # float64 results at or beyond it do not fit in int64
+
+
+class NotVectorizable(Exception):
+    """Raised when an expression (or its value for a chunk) has to go through the per-row path."""
+
+
+def _number(node):
+    """Numeric literal, including negative numbers."""
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_number(node.operand)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return node.value
+    raise NotVectorizable("expected a numeric literal")
+
+
+def _integer(node):
+    value = _number(node)
+    if not isinstance(value, int):
+        raise NotVectorizable("expected an integer literal")
+    if not INT64_MIN <= value <= INT64_MAX:
+        raise NotVectorizable("integer literal out of the int64 range")
+    return value
+
+
+def _call_arguments(call, names, defaults):
+    """Bind positional and keyword arguments of a call to literal-only parameters."""
+    if len(call.args) > len(names):
+        raise NotVectorizable("too many arguments")
+    bound = dict(defaults)
+    for name, arg in zip(names, call.args):
+        bound[name] = arg
+    for keyword in call.keywords:
+        if keyword.arg not in names:
+            raise NotVectorizable(f"unsupported keyword {keyword.arg}")
+        bound[keyword.arg] = keyword.value
+    for name in names:
+        if name not in bound:
+            raise NotVectorizable(f"missing argument {name}")
+    return bound
+
+
+def _dotted_name(node):
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _round(values, digits=None):
+    """
+    Python's round over an array, values included.
+
+    Floats are scaled by 10**digits and rounded half to even with np.rint. The
+    scaling is inexact, so the values whose scaled fraction is within its error
+    of a half go through Python's round, which decides on the exact value (2.675
+    is below 2.675 in binary, round(2.675, 2) is 2.67 where np.round gives 2.68).
+    """
+    values = np.asarray(values)
+    if values.dtype == object:
+        # literals and random.choice values: NumPy picks the numeric dtype Python's round works on
+        values = np.array(values.tolist())
+    if values.dtype.kind == "b":
+        values = values.astype(np.int64)
+    if values.dtype.kind in "iu":
+        # round of an int is an int, unchanged for digits >= 0, else rounded half to even
+        if digits is None or digits >= 0:
+            return values
+        if -digits > 18:
+            raise NotVectorizable("round to more digits than int64 has")
+        unit = 10 ** -digits
+        quotient = np.floor_divide(values, unit)
+        remainder = values - quotient * unit
+        up = (2 * remainder > unit) | ((2 * remainder == unit) & (quotient % 2 == 1))
+        return _checked_int64((quotient + up) * unit, (quotient + up).astype(float) * unit)
+    if values.dtype.kind != "f":
+        raise NotVectorizable("round of a value that is not a number")
+    if digits is None:
+        # np.rint rounds the exact value half to even, like round(x); nan and inf raise per row
+        if not np.all(np.isfinite(values)):
+            raise NotVectorizable("round of a value that is not a finite number")
+        return _checked_int64(np.rint(values), np.rint(values))
+    if abs(digits) > 22:
+        # 10**digits is no longer exact in float64
+        return np.array([round(value, digits) for value in values.tolist()])
+    scaled = values * 10.0 ** digits if digits >= 0 else values / 10.0 ** -digits
+    result = np.rint(scaled)
+    result = result / 10.0 ** digits if digits >= 0 else result * 10.0 ** -digits
+    with np.errstate(invalid="ignore"):
+        fraction = np.abs(scaled - np.floor(scaled) - 0.5)
+        unsure = (fraction <= np.abs(scaled) * 2.0 ** -50) | (np.abs(scaled) >= 2.0 ** 52)
+    for i in np.flatnonzero(unsure):
+        result[i] = round(float(values[i]), digits)
+    return result
+
+
+def _checked_int64(result, exact):
+    if np.any(np.abs(exact) >= INT64_LIMIT):
+        raise NotVectorizable("integer out of the int64 range")
+    return result.astype(np.int64)
+
+
+class VectorColumn:
+    """A column whose values for a whole chunk come from one NumPy expression."""
+
+    def __init__(self, column_name, tree):
+        self.column_name = column_name
+        self.tree = tree
+
+    def evaluate(self, row_ids, rng, values, streams=None):
+        """Return the column values for row_ids as a NumPy array."""
+        try:
+            return _Evaluator(row_ids, rng, values, streams, self.column_name).visit(self.tree.body)
+        except OverflowError:
+            # an integer out of the int64 range, Python ints have none
+            raise NotVectorizable("integer out of the int64 range")
+
+
+class _Checker:
+    """Validate that an expression only uses vectorizable forms."""
+
+    def __init__(self, vector_names, reserved):
+        self.vector_names = vector_names
+        self.reserved = reserved
+
+    def check(self, node):
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, int) and not isinstance(node.value, bool) and not INT64_MIN <= node.value <= INT64_MAX:
+                raise NotVectorizable("integer literal out of the int64 range")
+            return
+        if isinstance(node, ast.Name):
+            if node.id == "row_id" or node.id in self.vector_names:
+                return
+            raise NotVectorizable(f"name {node.id} is not a vectorized column")
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            return self.check_operand(node.operand)
+        if isinstance(node, ast.BinOp) and type(node.op) in ARITHMETIC_OPERATORS:
+            self.check_operand(node.left)
+            self.check_operand(node.right)
+            return
+        if isinstance(node, ast.Call):
+            return self.check_call(node)
+        raise NotVectorizable(f"unsupported expression {type(node).__name__}")
+
+    def check_operand(self, node):
+        """Operands of arithmetic: NumPy applies its own rules to other literals ('ab' * 2 raises)."""
+        if isinstance(node, ast.Constant) and (not isinstance(node.value, (int, float)) or isinstance(node.value, bool)):
+            raise NotVectorizable(f"arithmetic on the literal {node.value!r}")
+        self.check(node)
+
+    def check_call(self, call):
+        name = _dotted_name(call.func)
+        root = name.split(".")[0] if name else None
+        if root in self.reserved:
+            raise NotVectorizable(f"{root} is shadowed")
+        if name == "random.randint":
+            args = _call_arguments(call, ["a", "b"], {})
+            _integer(args["a"]), _integer(args["b"])
+        elif name == "random.uniform":
+            args = _call_arguments(call, ["a", "b"], {})
+            _number(args["a"]), _number(args["b"])
+        elif name == "random.choice":
+            args = _call_arguments(call, ["seq"], {})
+            seq = args["seq"]
+            if not isinstance(seq, (ast.List, ast.Tuple)) or not seq.elts:
+                raise NotVectorizable("random.choice needs a non-empty literal list")
+            for element in seq.elts:
+                if not isinstance(element, ast.Constant) and not isinstance(element, ast.UnaryOp):
+                    raise NotVectorizable("random.choice needs literal elements")
+                if isinstance(element, ast.UnaryOp):
+                    _number(element)
+        elif name == "fake.random_int":
+            args = _call_arguments(call, ["min", "max", "step"], {"min": ast.Constant(0), "max": ast.Constant(9999), "step": ast.Constant(1)})
+            _integer(args["min"]), _integer(args["max"])
+            if _integer(args["step"]) <= 0:
+                raise NotVectorizable("fake.random_int step must be positive")
+        elif name == "rng.random":
+            _call_arguments(call, [], {})
+        elif name in ("rng.randint", "rng.uniform"):
+            args = _call_arguments(call, ["a", "b"], {})
+            (_integer if name == "rng.randint" else _number)(args["a"])
+            (_integer if name == "rng.randint" else _number)(args["b"])
+        elif name == "round":
+            if call.keywords or len(call.args) not in (1, 2):
+                raise NotVectorizable("round takes a value and optional digits")
+            self.check(call.args[0])
+            if len(call.args) == 2:
+                _integer(call.args[1])
+        else:
+            raise NotVectorizable(f"unsupported call {name}")
+
+
+class _Evaluator:
+    """Evaluate a checked expression for a whole chunk."""
+
+    def __init__(self, row_ids, rng, values, streams=None, column_name=None):
+        self.row_ids = row_ids
+        self.size = len(row_ids)
+        self.rng = rng
+        self.values = values  # column_name -> ndarray of already vectorized columns
+        self.streams = streams
+        self.column_name = column_name
+        self.draw = 0         # rng.* calls visited so far, in Python evaluation order
+
+    def _stream_uniforms(self):
+        """The next rng.random() of every row, equal to what Streams returns row by row."""
+        u = self.streams.uniforms(self.column_name, self.row_ids, self.draw)
+        self.draw += 1
+        return u
+
+    def visit(self, node):
+        if isinstance(node, ast.Constant):
+            array = np.empty(self.size, dtype=object)
+            array.fill(node.value)
+            return array
+        if isinstance(node, ast.Name):
+            if node.id in self.values:
+                return self.values[node.id]
+            if node.id == "row_id":
+                return self.row_ids
+            # the referenced column went through the per-row path for this chunk
+            raise NotVectorizable(f"{node.id} is not vectorized in this chunk")
+        if isinstance(node, ast.UnaryOp):
+            operand = self.visit(node.operand)
+            if isinstance(node.op, ast.USub) and np.asarray(operand).dtype.kind == "i" and np.any(operand == INT64_MIN):
+                raise NotVectorizable("integer out of the int64 range")
+            return np.negative(operand) if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp):
+            left = self._operand(node.left)
+            right = self._operand(node.right)
+            if isinstance(node.op, ZERO_DIVISOR_OPERATORS) and np.any(np.asarray(right) == 0):
+                # Python raises ZeroDivisionError per row; let the per-row path report it
+                raise NotVectorizable("division by zero")
+            operator = ARITHMETIC_OPERATORS[type(node.op)]
+            result = operator(left, right)
+            if np.asarray(result).dtype.kind in "iu" and not isinstance(node.op, ast.Mod):
+                # int64 wraps around where Python ints grow; the float64 result shows where it would
+                exact = operator(np.asarray(left, dtype=float), np.asarray(right, dtype=float))
+                if np.any(np.abs(exact) >= INT64_LIMIT):
+                    raise NotVectorizable("integer out of the int64 range")
+            return np.broadcast_to(result, (self.size,)) if np.ndim(result) == 0 else result
+        return self.visit_call(node)
+
+    def _operand(self, node):
+        """Literals stay scalars so NumPy keeps numeric dtypes."""
+        if isinstance(node, ast.Constant) or (isinstance(node, ast.UnaryOp) and isinstance(node.operand, ast.Constant)):
+            try:
+                return _number(node)
+            except NotVectorizable:
+                return node.value if isinstance(node, ast.Constant) else self.visit(node)
+        return self.visit(node)
+
+    def visit_call(self, call):
+        name = _dotted_name(call.func)
+        if name == "random.randint":
+            args = _call_arguments(call, ["a", "b"], {})
+            return self.rng.integers(_integer(args["a"]), _integer(args["b"]), size=self.size, endpoint=True)
+        if name == "random.uniform":
+            args = _call_arguments(call, ["a", "b"], {})
+            a, b = _number(args["a"]), _number(args["b"])
+            return a + (b - a) * self.rng.random(self.size)
+        if name == "random.choice":
+            args = _call_arguments(call, ["seq"], {})
+            choices = np.empty(len(args["seq"].elts), dtype=object)
+            for i, element in enumerate(args["seq"].elts):
+                choices[i] = element.value if isinstance(element, ast.Constant) else _number(element)
+            return choices[self.rng.integers(0, len(choices), size=self.size)]
+        if name == "fake.random_int":
+            args = _call_arguments(call, ["min", "max", "step"], {"min": ast.Constant(0), "max": ast.Constant(9999), "step": ast.Constant(1)})
+            low, high, step = _integer(args["min"]), _integer(args["max"]), _integer(args["step"])
+            return low + step * self.rng.integers(0, (high - low) // step, size=self.size, endpoint=True)
+        if name == "rng.random":
+            return self._stream_uniforms()
+        if name == "rng.uniform":
+            args = _call_arguments(call, ["a", "b"], {})
+            a, b = _number(args["a"]), _number(args["b"])
+            return a + (b - a) * self._stream_uniforms()
+        if name == "rng.randint":
+            args = _call_arguments(call, ["a", "b"], {})
+            a, b = _integer(args["a"]), _integer(args["b"])
+            span = b - a + 1
+            return a + np.minimum((self._stream_uniforms() * span).astype(np.int64), span - 1)
+        if name == "round":
+            return _round(self.visit(call.args[0]), _integer(call.args[1]) if len(call.args) == 2 else None)
+        raise NotVectorizable(f"unsupported call {name}")
+
+
+def generate_vector_columns(vector_columns, row_ids, rng_for_column, streams=None):
+    """
+    Evaluate vector columns for one chunk in plan order.
+
+    Returns {column_name: list of Python values}. A column whose values cannot be
+    produced for this chunk (for example a zero divisor) is left out together with
+    the vector columns depending on it, so the per-row path generates them.
+    """
+    arrays = {}
+    for column_name, vector_column in vector_columns.items():
+        try:
+            arrays[column_name] = vector_column.evaluate(row_ids, rng_for_column(column_name), arrays, streams)
+        except NotVectorizable:
+            continue
+    return {name: array.tolist() for name, array in arrays.items()}
+
+
+def find_vector_columns(plan, variables):
+    """
+    Return {column_name: VectorColumn} for the columns of a plan that can be
+    generated as whole NumPy columns, in plan order.
+
+    A column qualifies when its expression is built only from row_id, literals,
+    random.randint/uniform/choice, fake.random_int, rng.random/randint/uniform,
+    round(...) and arithmetic over other vectorized columns. Names the config
+    rebinds (a column called `random`, a plugin exporting `round`) disable the
+    matching forms.
+    """
+    column_names = [c["column_name"] for c in plan.columns]
+    reserved = {name for name in ("random", "fake", "round", "rng") if name in column_names}
+    if not isinstance(variables.get("rng"), Streams):
+        reserved.add("rng")
+    if "round" in variables:
+        reserved.add("round")
+    if "random" in variables and getattr(variables["random"], "__name__", None) != "random":
+        reserved.add("random")
+    if "row_id" in column_names or len(set(column_names)) != len(column_names):
+        return {}
+
+    vector_columns = {}
+    for col in plan.columns:
+        command = col["data"]
+        if isinstance(command, (list, dict)) or (isinstance(command, str) and "return " in command):
+            continue
+        try:
+            tree = ast.parse(f"{command}", mode="eval")
+            _Checker(vector_columns, reserved).check(tree.body)
+        except (SyntaxError, NotVectorizable):
+            continue
+        vector_columns[col["column_name"]] = VectorColumn(col["column_name"], tree)
+    return vector_columns
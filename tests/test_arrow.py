@@ -0,0 +1,98 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import tablefaker as tablefaker_package
+from tablefaker import tablefaker
+from tablefaker.tablefaker import TableFaker
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 8},
+    "tables": [
+        {
+            "table_name": "stores",
+            "row_count": 12,
+            "columns": [
+                {"column_name": "store_id", "data": "row_id", "is_primary_key": True, "type": "int32"},
+                {"column_name": "city", "data": "fake.city()", "type": "string"},
+            ],
+        },
+        {
+            "table_name": "sales",
+            "row_count": 57,
+            "columns": [
+                {"column_name": "sale_id", "data": "row_id", "is_primary_key": True, "parquet_type": "int32"},
+                {"column_name": "store_id", "data": 'foreign_key("stores", "store_id")'},
+                {"column_name": "amount", "data": "round(random.uniform(1, 500), 2)", "parquet_type": "decimal128(8, 2)"},
+                {"column_name": "quantity", "data": "random.randint(1, 9)", "type": "int16", "null_percentage": 0.2},
+                {"column_name": "note", "data": "fake.word()"},
+            ],
+        },
+    ],
+}
+
+
+def _config():
+    return copy.deepcopy(CONFIG)
+
+
+def test_to_arrow_is_exported():
+    assert tablefaker_package.to_arrow is tablefaker.to_arrow
+
+
+def test_to_arrow_matches_pandas_conversion():
+    """Without parquet_type the Arrow table equals pa.Table.from_pandas of the DataFrame, pandas metadata included."""
+    tables = tablefaker.to_arrow(_config(), table_name="stores")
+    frames = tablefaker.to_pandas(_config(), table_name="stores")
+    expected = pa.Table.from_pandas(frames["stores"], preserve_index=False)
+    assert tables["stores"].equals(expected, check_metadata=True)
+    assert tables["stores"].schema.field("store_id").type == pa.int32()
+
+
+def test_to_arrow_applies_parquet_type():
+    tables = tablefaker.to_arrow(_config())
+    sales = tables["sales"]
+    assert sales.num_rows == 57
+    assert sales.column_names == ["sale_id", "store_id", "amount", "quantity", "note"]
+    assert sales.schema.field("sale_id").type == pa.int32()
+    assert sales.schema.field("amount").type == pa.decimal128(8, 2)
+    assert sales.column("quantity").null_count == int(57 * 0.2)
+
+    frames = tablefaker.to_pandas(_config())
+    assert sales.column("sale_id").to_pylist() == frames["sales"]["sale_id"].tolist()
+    assert set(sales.column("store_id").to_pylist()) <= set(frames["stores"]["store_id"])
+
+
+def test_parquet_export_matches_pandas_conversion(tmp_path):
+    """The parquet file written from the Arrow table equals the one written through a DataFrame."""
+    TableFaker().to_target("parquet", _config(), str(tmp_path))
+    exported = pq.read_table(next(tmp_path.glob("sales*.parquet")))
+
+    table_faker = TableFaker()
+    expected = table_faker._to_arrow_table(table_faker.to_pandas(_config())["sales"])
+    assert exported.equals(expected, check_metadata=True)
+
+
+def test_iter_batches_arrow_output_has_parquet_types():
+    batches = list(tablefaker.iter_batches(_config(), "sales", batch_size=20, output="arrow"))
+    assert [batch.num_rows for batch in batches] == [20, 20, 17]
+    assert all(batch.schema.field("amount").type == pa.decimal128(8, 2) for batch in batches)
+
+
+def test_null_percentage_without_nulls_keeps_type():
+    """A null_percentage that rounds down to no nulls leaves an int column as int."""
+    config = _config()
+    config["tables"][1]["row_count"] = 3
+    sales = tablefaker.to_arrow(config)["sales"]
+    assert sales.schema.field("quantity").type == pa.int16()
+    assert tablefaker.to_pandas(config)["sales"]["quantity"].dtype == "int16"
+
+
+def test_arrow_conversion_error_names_column():
+    config = _config()
+    config["tables"][0]["columns"].append({"column_name": "mixed", "data": "row_id if row_id % 2 else 'a'"})
+    with pytest.raises(pa.ArrowInvalid, match="column mixed"):
+        tablefaker.to_arrow(config, table_name="stores")
@@ -0,0 +1,142 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import pandas as pd
+import pytest
+from tablefaker.tablefaker import TableFaker
+from tablefaker import config, tablefaker, util
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 21},
+    "tables": [
+        {
+            "table_name": "customers",
+            "row_count": 25,
+            "columns": [
+                {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "name", "data": "fake.first_name()"},
+                {"column_name": "note", "data": "\"it's\""},
+            ],
+        },
+        {
+            "table_name": "orders",
+            "row_count": 43,
+            "columns": [
+                {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id")'},
+                {"column_name": "customer_name", "data": 'copy_from_fk("customers", "customer_id", "name")'},
+                {"column_name": "amount", "data": "round(random.uniform(1, 100), 2)"},
+            ],
+        },
+    ],
+}
+
+
+def _export(tmp_path, file_type, name, **kwargs):
+    target = tmp_path / name
+    target.mkdir()
+    TableFaker().to_target(file_type, copy.deepcopy(CONFIG), str(target), **kwargs)
+    return [target / f for f in sorted(os.listdir(target))]
+
+
+@pytest.mark.parametrize("file_type", ["csv", "json", "sql"])
+def test_batched_text_export_matches_full_export(tmp_path, file_type):
+    full = _export(tmp_path, file_type, "full")
+    batched = _export(tmp_path, file_type, "batched", batch_size=10)
+    assert len(full) == len(batched) == 2
+    for full_file, batched_file in zip(full, batched):
+        assert full_file.read_text() == batched_file.read_text()
+
+
+def test_batched_parquet_export_matches_full_export(tmp_path):
+    full = _export(tmp_path, "parquet", "full")
+    batched = _export(tmp_path, "parquet", "batched", batch_size=10)
+    for full_file, batched_file in zip(full, batched):
+        assert pd.read_parquet(full_file).equals(pd.read_parquet(batched_file))
+
+
+def test_iter_batches_sizes():
+    batches = list(tablefaker.iter_batches(copy.deepcopy(CONFIG), "orders", batch_size=20))
+    assert [len(batch) for batch in batches] == [20, 20, 3]
+    order_ids = pd.concat(batches)["order_id"].tolist()
+    assert order_ids == list(range(1, 44))
+
+
+def test_iter_batches_arrow():
+    batches = list(tablefaker.iter_batches(copy.deepcopy(CONFIG), "customers", batch_size=10, output="arrow"))
+    assert [batch.num_rows for batch in batches] == [10, 10, 5]
+    assert batches[0].schema.names == ["customer_id", "name", "note"]
+
+
+@pytest.mark.parametrize("file_type", ["csv", "json", "parquet", "excel", "sql"])
+def test_batched_empty_export_matches_full_export(tmp_path, file_type):
+    files = []
+    for name, kwargs in [("full", {}), ("batched", {"batch_size": 10})]:
+        tf = TableFaker()
+        configurator = config.Config(copy.deepcopy(CONFIG))
+        table = configurator.config["tables"][0]
+        tf._start_run({"progress": False}, [table])
+        file_path = tmp_path / f"{name}{util.get_file_extension(file_type)}"
+        tf._export_rows(file_type, table, configurator, 0, 0, str(file_path), kwargs)
+        files.append(file_path)
+    if file_type == "parquet":
+        assert pd.read_parquet(files[0]).equals(pd.read_parquet(files[1]))
+    elif file_type == "excel":
+        assert pd.read_excel(files[0]).equals(pd.read_excel(files[1]))
+    else:
+        assert files[0].read_text() == files[1].read_text()
+
+
+def test_iter_batches_parents_are_not_built(monkeypatch):
+    config = copy.deepcopy(CONFIG)
+    config["tables"][0]["columns"].append({"column_name": "phone", "data": "fake.phone_number()", "null_percentage": 0.3})
+    config["tables"][1]["columns"].append({"column_name": "discount", "data": "random.random()", "null_percentage": 0.2})
+    expected = TableFaker().to_pandas(copy.deepcopy(config))["orders"]
+
+    tables = []
+    generate_table = TableFaker.generate_table
+
+    def record(self, table, *args, **kwargs):
+        tables.append(table["table_name"])
+        return generate_table(self, table, *args, **kwargs)
+
+    monkeypatch.setattr(TableFaker, "generate_table", record)
+    batches = list(tablefaker.iter_batches(config, "orders", batch_size=50))
+    assert set(tables) == {"orders"}
+    # the parent rows leave the random state of an export of them
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), expected)
+
+
+def test_parent_rows_only_kept_when_read():
+    config = copy.deepcopy(CONFIG)
+    config["tables"][1]["columns"].pop(2)
+    tf = TableFaker()
+    list(tf.iter_batches(config, "orders", batch_size=10))
+    assert tf.parent_rows == {}
+    assert len(tf.primary_key_cache["customers"]["customer_id"]) == 25
+
+    tf = TableFaker()
+    list(tf.iter_batches(copy.deepcopy(CONFIG), "orders", batch_size=10))
+    assert len(tf.parent_rows["customers"]) == 25
+
+
+def test_wrong_batch_size(tmp_path):
+    with pytest.raises(Exception, match="Wrong batch_size"):
+        TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(tmp_path), batch_size=0)
+    with pytest.raises(Exception, match="Table missing not found"):
+        list(tablefaker.iter_batches(copy.deepcopy(CONFIG), "missing"))
+
+
+@pytest.mark.parametrize("batch_size", [None, 4, 7, 333])
+def test_null_count_does_not_depend_on_batch_size(batch_size):
+    config = copy.deepcopy(CONFIG)
+    config["tables"] = [config["tables"][0]]
+    config["tables"][0]["row_count"] = 1000
+    config["tables"][0]["columns"][1]["null_percentage"] = 0.2
+    config["tables"][0]["columns"][2]["null_percentage"] = 0.15
+    if batch_size is None:
+        df = TableFaker().to_pandas(config)["customers"]
+    else:
+        df = pd.concat(tablefaker.iter_batches(config, "customers", batch_size=batch_size))
+    assert df["name"].isna().sum() == 200 and df["note"].isna().sum() == 150
@@ -0,0 +1,136 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import json
+import re
+import pytest
+from tablefaker.tablefaker import TableFaker
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US"},
+    "tables": [
+        {
+            "table_name": "customers",
+            "row_count": 60,
+            "columns": [
+                {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "first_name", "data": "fake.unique.first_name()"},
+                {"column_name": "segment", "data": 'random.choice(["retail", "corporate"])'},
+            ],
+        },
+        {
+            "table_name": "orders",
+            "row_count": 150,
+            "export_file_count": 5,
+            "columns": [
+                {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id")'},
+                {"column_name": "segment", "data": 'copy_from_fk("customers", "customer_id", "segment")'},
+                {"column_name": "amount", "data": "round(random.uniform(5, 500), 2)", "null_percentage": 0.1},
+            ],
+        },
+        {
+            "table_name": "coupons",
+            "row_count": 40,
+            "export_file_count": 2,
+            "columns": [
+                {"column_name": "coupon_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "first_name", "data": "fake.unique.first_name()"},
+                {"column_name": "order_id", "data": 'foreign_key("orders", "order_id", is_unique=True)'},
+            ],
+        },
+    ],
+}
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _interrupt_after(monkeypatch, chunk_count):
+    """Make export_chunk fail once chunk_count chunks were exported, like a process dying mid-run."""
+    export_chunk = TableFaker.export_chunk
+    calls = []
+
+    def failing_export_chunk(self, *args):
+        if len(calls) == chunk_count:
+            raise Interrupted()
+        calls.append(args)
+        export_chunk(self, *args)
+
+    monkeypatch.setattr(TableFaker, "export_chunk", failing_export_chunk)
+
+
+def _files(target):
+    # single-file names carry a timestamp
+    return {re.sub(r"_\d{4}-\d{2}-\d{2}_[\d-]+", "", f): (target / f).read_bytes() for f in os.listdir(target)}
+
+
+def _export(tmp_path, name, **kwargs):
+    target = tmp_path / name
+    target.mkdir()
+    TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(target), seed=21, **kwargs)
+    return target
+
+
+@pytest.mark.parametrize("chunk_count", [1, 3, 7])
+def test_resume_is_byte_identical(tmp_path, monkeypatch, chunk_count):
+    """Interrupted in customers, in the middle of orders and in the sequential coupons table."""
+    expected = _files(_export(tmp_path, "full", checkpoint=str(tmp_path / "full_checkpoint")))
+    assert len(expected) == 1 + 5 + 2
+
+    _interrupt_after(monkeypatch, chunk_count)
+    checkpoint = str(tmp_path / "checkpoint")
+    with pytest.raises(Interrupted):
+        _export(tmp_path, "resumed", checkpoint=checkpoint)
+    monkeypatch.undo()
+
+    target = tmp_path / "resumed"
+    TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(target), seed=21, checkpoint=checkpoint, resume=True)
+    assert _files(target) == expected
+    assert len(os.listdir(target)) == len(expected)
+
+
+def test_resume_skips_exported_chunks(tmp_path, monkeypatch):
+    checkpoint = tmp_path / "checkpoint"
+    _interrupt_after(monkeypatch, 4)
+    with pytest.raises(Interrupted):
+        _export(tmp_path, "resumed", checkpoint=str(checkpoint))
+    manifest = json.loads((checkpoint / "manifest.json").read_text())
+    assert manifest["tables"]["customers"]["done"]
+    assert manifest["tables"]["orders"]["chunks"] == [0, 1, 2]
+    monkeypatch.undo()
+
+    exported = []
+    export_chunk = TableFaker.export_chunk
+    monkeypatch.setattr(TableFaker, "export_chunk", lambda self, *args: exported.append((args[1]["table_name"], args[3], args[4])) or export_chunk(self, *args))
+    TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(tmp_path / "resumed"), seed=21, checkpoint=str(checkpoint), resume=True)
+    # (table, chunk index, first row): the last two orders chunks, then both coupons chunks
+    assert exported == [("orders", 3, 90), ("orders", 4, 120), ("coupons", 0, 0), ("coupons", 1, 20)]
+
+
+def test_checkpoint_matches_workers_output(tmp_path):
+    checkpointed = _files(_export(tmp_path, "checkpointed", checkpoint=str(tmp_path / "checkpoint")))
+    assert checkpointed == _files(_export(tmp_path, "workers", workers=1))
+
+
+def test_unseeded_run_resumes_with_its_seed(tmp_path):
+    checkpoint = tmp_path / "checkpoint"
+    config = copy.deepcopy(CONFIG)
+    TableFaker().to_target("csv", config, str(tmp_path), table_name="customers", checkpoint=str(checkpoint))
+    seed = json.loads((checkpoint / "manifest.json").read_text())["seed"]
+    assert isinstance(seed, int)
+    TableFaker().to_target("csv", copy.deepcopy(config), str(tmp_path), table_name="customers", checkpoint=str(checkpoint), resume=True)
+    assert json.loads((checkpoint / "manifest.json").read_text())["seed"] == seed
+
+
+def test_resume_checks_config(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint")
+    with pytest.raises(Exception, match="No checkpoint to resume"):
+        TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(tmp_path), checkpoint=checkpoint, resume=True)
+    with pytest.raises(Exception, match="resume needs the checkpoint"):
+        TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(tmp_path), resume=True)
+    TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(tmp_path), table_name="customers", seed=1, checkpoint=checkpoint)
+    with pytest.raises(Exception, match="another config"):
+        TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(tmp_path), table_name="customers", seed=2, checkpoint=checkpoint, resume=True)
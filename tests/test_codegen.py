@@ -0,0 +1,110 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import pytest
+from tablefaker.tablefaker import TableFaker
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 11},
+    "tables": [
+        {
+            "table_name": "customers",
+            "row_count": 20,
+            "columns": [
+                {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "first_name", "data": "fake.first_name()"},
+                {"column_name": "last_name", "data": "fake.last_name()"},
+                {"column_name": "full_name", "data": 'first_name + " " + last_name'},
+                {"column_name": "email", "data": "fake.unique.email()"},
+                {"column_name": "rating", "data": "random.choice([3, 4, 5])"},
+                {"column_name": "tier", "data": "if rating == 5:\n  return 'gold'\nreturn 'standard'"},
+            ],
+        },
+        {
+            "table_name": "orders",
+            "row_count": 50,
+            "columns": [
+                {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "customer_email", "data": 'copy_from_fk("customers", "customer_id", "email")'},
+                {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id", distribution="zipf")'},
+                {"column_name": "quantity", "data": "random.randint(1, 5)"},
+                {"column_name": "unit_price", "data": "round(random.uniform(1, 100), 2)"},
+                {"column_name": "total", "data": "discount = 0.9 if quantity > 3 else 1.0\nreturn round(quantity * unit_price * discount, 2)"},
+                {"column_name": "tier_price", "data": "tier = copy_from_fk(\"customers\", \"customer_id\", \"tier\")\nreturn total * (0.8 if tier == 'gold' else 1.0)"},
+                {"column_name": "running_count", "data": "running_count + 1 if row_id > 1 else 1"},
+                {"column_name": "codes", "data": "[str(i) for i in range(quantity)]"},
+            ],
+        },
+    ],
+}
+
+
+def _generate(engine, cfg=CONFIG):
+    tf = TableFaker()
+    return tf.to_pandas(copy.deepcopy(cfg), engine=engine)
+
+
+def test_codegen_output_identical_to_interpreter():
+    interpreted = _generate("interpreter")
+    generated = _generate("codegen")
+    for table_name in interpreted:
+        assert interpreted[table_name].to_csv(index=False) == generated[table_name].to_csv(index=False)
+
+
+def test_codegen_engine_from_config():
+    cfg = copy.deepcopy(CONFIG)
+    cfg["config"]["engine"] = "codegen"
+    tf = TableFaker()
+    dfs = tf.to_pandas(cfg)
+    assert list(dfs["orders"]["running_count"]) == list(range(1, 51))
+
+
+def test_codegen_binds_call_targets_once():
+    tf = TableFaker()
+    calls = []
+    original = tf._build_row_function
+
+    def capture(table_name, plan, variables):
+        row_function = original(table_name, plan, variables)
+        calls.append(row_function)
+        return row_function
+
+    tf._build_row_function = capture
+    tf.to_pandas(copy.deepcopy(CONFIG), table_name="customers", engine="codegen")
+    source = calls[0].source
+    assert "fake.first_name" not in source
+    assert "_tf_b" in source
+
+
+def test_codegen_falls_back_for_dynamic_copy_from_fk():
+    cfg = copy.deepcopy(CONFIG)
+    columns = cfg["tables"][1]["columns"]
+    dynamic = columns.pop(1)
+    dynamic["data"] = 'copy_from_fk("customers", "customer" + "_id", "email")'
+    columns.append(dynamic)
+    interpreted = _generate("interpreter", cfg)
+    generated = _generate("codegen", cfg)
+    assert interpreted["orders"].to_csv(index=False) == generated["orders"].to_csv(index=False)
+
+
+def test_codegen_reports_failing_column():
+    cfg = {
+        "tables": [
+            {
+                "table_name": "t",
+                "row_count": 2,
+                "columns": [
+                    {"column_name": "id", "data": "row_id"},
+                    {"column_name": "bad", "data": "fake.not_a_provider()"},
+                ],
+            }
+        ]
+    }
+    with pytest.raises(RuntimeError, match="Attribute can not be found. fake.not_a_provider()"):
+        _generate("codegen", cfg)
+
+
+def test_unknown_engine_raises():
+    with pytest.raises(Exception, match="Wrong engine"):
+        _generate("jit")
@@ -0,0 +1,226 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import contextlib
+import copy
+import importlib.util
+import sqlite3
+import types
+import pytest
+from tablefaker import cli, db_loader
+from tablefaker.tablefaker import TableFaker
+
+# orders is defined before its parent customers
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 5},
+    "tables": [
+        {
+            "table_name": "orders",
+            "row_count": 40,
+            "columns": [
+                {"column_name": "order_id", "data": "row_id"},
+                {"column_name": "customer_id", "data": "foreign_key(\"customers\", \"customer_id\")"},
+                {"column_name": "amount", "data": "round(random.uniform(1, 100), 2)", "null_percentage": 0.2},
+                {"column_name": "ordered_on", "data": "fake.date_object()"},
+            ],
+        },
+        {
+            "table_name": "customers",
+            "row_count": 15,
+            "columns": [
+                {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "name", "data": "fake.name() + \"'s\""},
+                {"column_name": "vip", "data": "row_id % 4 == 0"},
+                {"column_name": "score", "data": "random.randint(0, 9)", "type": "int32"},
+            ],
+        },
+    ],
+}
+
+
+def _rows(connection, table):
+    return connection.execute(f'SELECT * FROM "{table}" ORDER BY rowid').fetchall()
+
+
+def test_loads_parents_first(tmp_path):
+    database = tmp_path / "data.db"
+    loaded = TableFaker().to_database(copy.deepcopy(CONFIG), f"sqlite:///{database}", progress=False)
+    assert list(loaded) == ["customers", "orders"] and loaded == {"customers": 15, "orders": 40}
+
+    connection = sqlite3.connect(database)
+    schema = dict(connection.execute("SELECT name, sql FROM sqlite_master").fetchall())
+    assert schema["customers"] == 'CREATE TABLE "customers" ("customer_id" INTEGER, "name" TEXT, "vip" INTEGER, "score" INTEGER)'
+    assert schema["orders"] == 'CREATE TABLE "orders" ("order_id" INTEGER, "customer_id" INTEGER, "amount" REAL, "ordered_on" TEXT)'
+    customer_ids = {row[0] for row in _rows(connection, "customers")}
+    orders = _rows(connection, "orders")
+    assert len(orders) == 40 and {row[1] for row in orders} <= customer_ids
+    assert any(row[2] is None for row in orders)
+
+
+def test_matches_generated_frames(tmp_path):
+    ordered = copy.deepcopy(CONFIG)
+    ordered["tables"].reverse()
+    database = tmp_path / "data.db"
+    TableFaker().to_database(copy.deepcopy(ordered), str(database), progress=False)
+    expected = TableFaker().to_pandas(ordered)["customers"]
+    loaded = _rows(sqlite3.connect(database), "customers")
+    assert [row[1] for row in loaded] == expected["name"].tolist()
+    assert [bool(row[2]) for row in loaded] == expected["vip"].tolist()
+    assert [row[3] for row in loaded] == expected["score"].tolist()
+
+
+def test_streams_batches(tmp_path, monkeypatch):
+    batches = []
+    write = db_loader.DatabaseLoader.write
+
+    def record(loader, data_frame):
+        batches.append((loader.table_name, len(data_frame)))
+        write(loader, data_frame)
+
+    monkeypatch.setattr(db_loader.DatabaseLoader, "write", record)
+    connection = sqlite3.connect(":memory:")
+    TableFaker().to_database(copy.deepcopy(CONFIG), connection, batch_size=16, progress=False)
+    assert batches == [("customers", 15), ("orders", 16), ("orders", 16), ("orders", 8)]
+    # a connection of the caller is not closed
+    assert connection.execute("SELECT COUNT(*) FROM orders").fetchone() == (40,)
+
+
+def test_if_exists(tmp_path):
+    database = str(tmp_path / "data.db")
+    TableFaker().to_database(copy.deepcopy(CONFIG), database, progress=False)
+    with pytest.raises(sqlite3.OperationalError, match="already exists"):
+        TableFaker().to_database(copy.deepcopy(CONFIG), database, progress=False)
+    TableFaker().to_database(copy.deepcopy(CONFIG), database, if_exists="append", progress=False)
+    assert sqlite3.connect(database).execute("SELECT COUNT(*) FROM orders").fetchone() == (80,)
+    TableFaker().to_database(copy.deepcopy(CONFIG), database, if_exists="replace", progress=False)
+    assert sqlite3.connect(database).execute("SELECT COUNT(*) FROM orders").fetchone() == (40,)
+    with pytest.raises(Exception, match="Wrong if_exists"):
+        TableFaker().to_database(copy.deepcopy(CONFIG), database, if_exists="truncate", progress=False)
+
+
+def test_failed_table_is_rolled_back(tmp_path):
+    config = copy.deepcopy(CONFIG)
+    config["tables"][0]["columns"].append({"column_name": "broken", "data": "1 if row_id < 20 else undefined_name"})
+    database = tmp_path / "data.db"
+    with pytest.raises(Exception):
+        TableFaker().to_database(config, str(database), batch_size=10, progress=False)
+    connection = sqlite3.connect(database)
+    assert connection.execute("SELECT COUNT(*) FROM customers").fetchone() == (15,)
+    assert connection.execute("SELECT COUNT(*) FROM orders").fetchone() == (0,)
+
+
+def test_single_table_and_cli(tmp_path, monkeypatch):
+    database = tmp_path / "data.db"
+    loaded = TableFaker().to_target("database", copy.deepcopy(CONFIG), str(database), table_name="orders", progress=False)
+    assert loaded == {"orders": 40}
+    assert [name for (name,) in sqlite3.connect(database).execute("SELECT name FROM sqlite_master")] == ["orders"]
+
+    monkeypatch.setattr(sys, "argv", ["tablefaker", "--config", "tests/test_table.yaml", "--file_type", "database",
+                                      "--target", f"sqlite:///{database}", "--if-exists", "replace", "--no-progress"])
+    cli.main()
+    names = {name for (name,) in sqlite3.connect(database).execute("SELECT name FROM sqlite_master")}
+    assert {"orders", "person", "employee"} <= names
+
+
+def test_declared_types():
+    config = {"version": 1, "config": {"seed": 1}, "tables": [
+        {"table_name": "events", "row_count": 6, "columns": [
+            {"column_name": "id", "data": "row_id"},
+            {"column_name": "late_count", "data": "None if row_id < 4 else row_id", "parquet_type": "int32"},
+            {"column_name": "ratio", "data": "None if row_id < 4 else row_id / 2", "type": "float"},
+            {"column_name": "flag", "data": "None if row_id < 4 else row_id % 2 == 0", "type": "boolean"},
+        ]},
+        {"table_name": "empty", "row_count": 0, "columns": [
+            {"column_name": "day", "data": "fake.date_object()", "parquet_type": "date32"},
+            {"column_name": "amount", "data": "1.5", "type": "float32"},
+            {"column_name": "note", "data": "fake.word()"},
+        ]},
+    ]}
+    # sqlite accepts the type names of any dialect
+    connection = sqlite3.connect(":memory:")
+    TableFaker().to_database(config, connection, batch_size=2, sql_dialect="postgres", progress=False)
+    schema = dict(connection.execute("SELECT name, sql FROM sqlite_master").fetchall())
+    # the first batch holds only nulls, the types come from the config
+    assert schema["events"] == 'CREATE TABLE "events" ("id" BIGINT, "late_count" BIGINT, "ratio" DOUBLE PRECISION, "flag" BOOLEAN)'
+    assert schema["empty"] == 'CREATE TABLE "empty" ("day" DATE, "amount" DOUBLE PRECISION, "note" TEXT)'
+    assert [row[1:] for row in _rows(connection, "events")] == [(None, None, None)] * 3 + [(4, 2.0, 1), (5, 2.5, 0), (6, 3.0, 1)]
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+
+    def execute(self, statement):
+        self.log.append(("execute", statement))
+
+    def executemany(self, statement, rows):
+        raise AssertionError("Postgres drivers with a COPY API load with COPY")
+
+    def close(self):
+        pass
+
+
+class Psycopg2Cursor(FakeCursor):
+    def copy_expert(self, statement, file):
+        self.log.append(("copy", statement, file.read()))
+
+
+class Psycopg3Cursor(FakeCursor):
+    @contextlib.contextmanager
+    def copy(self, statement):
+        parts = []
+        yield types.SimpleNamespace(write=parts.append)
+        self.log.append(("copy", statement, "".join(parts)))
+
+
+class CopyConnection:
+    def __init__(self, cursor_class):
+        self.log = []
+        self.cursor_class = cursor_class
+
+    def cursor(self):
+        return self.cursor_class(self.log)
+
+    def commit(self):
+        self.log.append(("commit",))
+
+    def rollback(self):
+        self.log.append(("rollback",))
+
+
+@pytest.mark.parametrize("cursor_class", [Psycopg2Cursor, Psycopg3Cursor])
+def test_postgres_copy(cursor_class):
+    config = copy.deepcopy(CONFIG)
+    config["tables"] = config["tables"][1:]
+    config["tables"][0]["row_count"] = 5
+    connection = CopyConnection(cursor_class)
+    TableFaker().to_database(config, connection, batch_size=3, sql_dialect="postgres", progress=False)
+    expected = TableFaker().to_pandas(copy.deepcopy(config))["customers"]
+
+    assert connection.log[0] == ("execute", 'CREATE TABLE "customers" ("customer_id" BIGINT, "name" TEXT, "vip" BOOLEAN, "score" BIGINT)')
+    copies = [entry for entry in connection.log if entry[0] == "copy"]
+    statement = 'COPY "customers" ("customer_id", "name", "vip", "score") FROM STDIN'
+    assert [entry[1] for entry in copies] == [statement, statement]
+    lines = "".join(entry[2] for entry in copies).splitlines()
+    assert [line.split("\t") for line in lines] == [
+        [str(row.customer_id), row.name, "t" if row.vip else "f", str(row.score)] for row in expected.itertuples()]
+    assert connection.log[-1] == ("commit",)
+
+
+def test_load_order():
+    tables = [
+        {"table_name": "c", "columns": [{"column_name": "b_id", "data": "foreign_key('b', 'id')"}]},
+        {"table_name": "b", "columns": [{"column_name": "a", "data": "copy_from_fk('a', 'a_id', 'id')"}]},
+        {"table_name": "a", "columns": [{"column_name": "id", "data": "row_id"}]},
+        {"table_name": "d", "columns": [{"column_name": "x", "data": "foreign_key(parent, 'id')"}]},
+    ]
+    assert [table["table_name"] for table in db_loader.load_order(tables)] == ["a", "b", "c", "d"]
+    tables[2]["columns"][0]["data"] = "foreign_key('c', 'b_id')"
+    with pytest.raises(Exception, match="reference each other"):
+        db_loader.load_order(tables)
+
+
+@pytest.mark.skipif(importlib.util.find_spec("sqlalchemy") is not None, reason="sqlalchemy is installed")
+def test_url_needs_sqlalchemy():
+    with pytest.raises(Exception, match="sqlalchemy package is not installed"):
+        db_loader.DatabaseLoader("postgresql://localhost/test")
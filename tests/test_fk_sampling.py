@@ -0,0 +1,88 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import numpy as np
+import pandas as pd
+from tablefaker.tablefaker import TableFaker
+from tablefaker import rng
+from tablefaker.parent_cache import PrimaryKeyValues, literal_foreign_key_calls
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 9},
+    "tables": [
+        {
+            "table_name": "customers",
+            "row_count": 40,
+            "columns": [
+                {"column_name": "customer_id", "data": "row_id * 3", "is_primary_key": True},
+                {"column_name": "tier", "data": 'random.choice(["gold", "silver"])'},
+            ],
+        },
+        {
+            "table_name": "orders",
+            "row_count": 120,
+            "columns": [
+                {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "uniform_id", "data": 'foreign_key("customers", "customer_id")'},
+                {"column_name": "zipf_id", "data": 'foreign_key("customers", "customer_id", distribution="zipf", param=1.5)'},
+                {"column_name": "weighted_id", "data": 'foreign_key("customers", "customer_id", "weighted_parent", parent_attr="tier", weights={"gold": 4})'},
+                {"column_name": "maybe_id", "data": 'foreign_key("customers", "customer_id") if row_id % 2 else None'},
+            ],
+        },
+    ],
+}
+
+
+def test_scalar_and_vector_streams_match():
+    key = rng.stream_key("customers", "customer_id", "uniform")
+    counters = [-3, 0, 1, 2, 10**12]
+    assert rng.uniforms(key, counters).tolist() == [rng.uniform(key, c) for c in counters]
+
+
+def test_primary_key_values():
+    keys = PrimaryKeyValues([1, 2, 3])
+    keys.append(4)
+    assert keys.array().dtype == np.int64 and keys.tolist() == [1, 2, 3, 4] and type(keys[0]) is int
+    keys.append("five")
+    assert keys.array().dtype == object and keys[-1] == "five" and keys[0] == 1
+
+
+def test_literal_foreign_key_calls():
+    calls = literal_foreign_key_calls(CONFIG["tables"][1]["columns"])
+    assert len(calls) == 4
+    assert calls[2] == {"table_name": "customers", "column_name": "customer_id", "distribution": "weighted_parent",
+                        "parent_attr": "tier", "weights": {"gold": 4}}
+
+
+def test_chunk_draw_matches_per_row_draw(monkeypatch):
+    prefetched = TableFaker().to_pandas(copy.deepcopy(CONFIG))["orders"]
+    monkeypatch.setattr(TableFaker, "_prefetch_foreign_keys", lambda self, *args: None)
+    per_row = TableFaker().to_pandas(copy.deepcopy(CONFIG))["orders"]
+    assert prefetched.equals(per_row)
+    assert set(prefetched["uniform_id"]) <= set(range(3, 121, 3))
+
+
+def test_foreign_keys_do_not_depend_on_batches():
+    full = TableFaker().to_pandas(copy.deepcopy(CONFIG))["orders"]
+    batches = pd.concat(TableFaker().iter_batches(copy.deepcopy(CONFIG), "orders", batch_size=25), ignore_index=True)
+    for column in ["uniform_id", "zipf_id", "weighted_id", "maybe_id"]:
+        assert full[column].tolist() == batches[column].tolist()
+
+
+def test_alias_table_matches_weights():
+    weights = [5.0, 0.0, 1.0, 2.0, 0.5]
+    table = rng.AliasTable(weights)
+    counts = np.bincount(table.sample(rng.uniforms(rng.stream_key("alias"), np.arange(200000))), minlength=5)
+    assert counts[1] == 0
+    assert np.allclose(counts / counts.sum(), np.array(weights) / sum(weights), atol=0.01)
+
+
+def test_sampler_rebuilt_when_parent_grows():
+    tf = TableFaker()
+    tf.to_pandas(copy.deepcopy(CONFIG), table_name="customers")
+    first = tf._foreign_key_sampler("customers", "customer_id", "zipf", 1.5, None, None)
+    assert tf._foreign_key_sampler("customers", "customer_id", "zipf", 1.5, None, None) is first
+    tf._primary_keys("customers", "customer_id").append(1000)
+    second = tf._foreign_key_sampler("customers", "customer_id", "zipf", 1.5, None, None)
+    assert second is not first and len(second) == len(first) + 1
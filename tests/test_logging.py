@@ -0,0 +1,122 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import inspect
+import json
+import logging
+import subprocess
+import pytest
+import yaml
+from tablefaker import util
+from tablefaker.tablefaker import TableFaker
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 2},
+    "tables": [
+        {
+            "table_name": "people",
+            "row_count": 40,
+            "export_file_count": 2,
+            "columns": [
+                {"column_name": "person_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "age", "data": "random.randint(18, 90)", "type": "int32"},
+            ],
+        },
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def default_logging():
+    util.configure_logging(level=util.INFO, log_format="text")
+    yield
+    util.configure_logging(level=util.INFO, log_format="text")
+
+
+def caller_of_log():
+    util.log("hello", util.FOREGROUND_COLOR.GREEN)
+
+
+def test_text_lines_name_the_calling_function(capsys, monkeypatch):
+    monkeypatch.setattr(inspect, "stack", lambda *args: pytest.fail("util.log must not inspect the stack"))
+    caller_of_log()
+    assert capsys.readouterr().out == f"[tablefaker][caller_of_log] - {util.FOREGROUND_COLOR.GREEN}hello{util.FOREGROUND_COLOR.RESET}\n"
+
+
+def test_json_lines(capsys, tmp_path):
+    util.configure_logging(log_format="json")
+    TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(tmp_path))
+    entries = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    exported = [entry for entry in entries if entry["message"].startswith("data is exported to")]
+    assert [entry["file"] for entry in exported] == [str(tmp_path / "people_1.csv"), str(tmp_path / "people_2.csv")]
+    assert all(entry["level"] == "info" and entry["table"] == "people" and entry["function"] for entry in exported)
+    progress = [entry for entry in entries if entry.get("event") == "progress"]
+    assert progress[-1]["finished"] and progress[-1]["rows"] == 40
+
+
+def test_levels(capsys):
+    util.configure_logging(quiet=True)
+    TableFaker().to_pandas(copy.deepcopy(CONFIG))
+    assert capsys.readouterr().out == ""
+
+    util.configure_logging(level=util.DEBUG)
+    TableFaker().to_pandas(copy.deepcopy(CONFIG))
+    assert "Converting Column age to int32" in capsys.readouterr().out
+
+    util.configure_logging(level=util.INFO)
+    TableFaker().to_pandas(copy.deepcopy(CONFIG))
+    out = capsys.readouterr().out
+    assert "Converting Column" not in out and "people pandas dataframe created" in out
+
+
+def test_library_adds_no_output():
+    output = subprocess.run(
+        [sys.executable, "-c", "from tablefaker import util; util.log('hello'); print(util.logger.propagate, util.logger.handlers)"],
+        capture_output=True, text=True, check=True)
+    assert output.stdout == "True [<NullHandler (NOTSET)>]\n" and output.stderr == ""
+
+
+def test_application_handlers(caplog, capsys):
+    # records propagate to the handlers of the application
+    with caplog.at_level(util.INFO, logger="tablefaker"):
+        util.log("to the application", util.FOREGROUND_COLOR.GREEN)
+    assert [record.getMessage() for record in caplog.records] == ["to the application"]
+    capsys.readouterr()
+
+    # configure_logging replaces its own handler, the others are kept
+    own_handlers = [handler for handler in util.logger.handlers if type(handler) is not logging.NullHandler]
+    util.configure_logging(log_format="json")
+    util.configure_logging(level=util.WARNING)
+    assert len([handler for handler in util.logger.handlers if type(handler) is not logging.NullHandler]) == len(own_handlers) == 1
+
+    # a handler removed by the application is added again
+    util.logger.handlers.clear()
+    util.configure_logging(level=util.INFO, log_format="text")
+    util.log("again")
+    assert capsys.readouterr().out.endswith("again\x1b[0m\n")
+
+
+def test_wrong_log_format():
+    with pytest.raises(Exception, match="Wrong log_format"):
+        util.configure_logging(log_format="xml")
+
+
+def test_cli_json_logs_with_workers(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(CONFIG))
+    target = tmp_path / "out"
+    target.mkdir()
+    output = subprocess.run(
+        [sys.executable, "-c", "from tablefaker import cli; cli.main()", "--config", str(config_path),
+         "--target", str(target), "--jobs", "2", "--log-format", "json"],
+        capture_output=True, text=True, check=True)
+    entries = [json.loads(line) for line in output.stdout.splitlines()]
+    # the worker processes log json too
+    assert sum(entry["message"].startswith("data is exported to") for entry in entries) == 2
+
+    output = subprocess.run(
+        [sys.executable, "-c", "from tablefaker import cli; cli.main()", "--config", str(config_path),
+         "--target", str(target), "--quiet"],
+        capture_output=True, text=True, check=True)
+    assert output.stdout == ""
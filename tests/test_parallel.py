@@ -0,0 +1,111 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import pytest
+from tablefaker.tablefaker import TableFaker
+from tablefaker import parallel
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 3},
+    "tables": [
+        {
+            "table_name": "customers",
+            "row_count": 90,
+            "export_file_count": 3,
+            "columns": [
+                {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "first_name", "data": "fake.first_name()"},
+                {"column_name": "segment", "data": 'random.choice(["retail", "corporate"])'},
+                {"column_name": "score", "data": "random.randint(1, 100)", "null_percentage": 0.1},
+            ],
+        },
+        {
+            "table_name": "orders",
+            "row_count": 200,
+            "export_file_row_count": 30,
+            "columns": [
+                {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id", distribution="zipf")'},
+                {"column_name": "segment", "data": 'copy_from_fk("customers", "customer_id", "segment")'},
+                {"column_name": "amount", "data": "round(random.uniform(5, 500), 2)"},
+                {"column_name": "note", "data": "fake.sentence()"},
+            ],
+        },
+        {
+            "table_name": "coupons",
+            "row_count": 60,
+            "export_file_count": 4,
+            "columns": [
+                {"column_name": "coupon_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "code", "data": "fake.unique.bothify('??-####')"},
+                {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id", is_unique=True)'},
+            ],
+        },
+    ],
+}
+
+
+def _export(tmp_path, name, **kwargs):
+    target = tmp_path / name
+    target.mkdir()
+    TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(target), **kwargs)
+    return {f: (target / f).read_text() for f in sorted(os.listdir(target))}
+
+
+def test_output_does_not_depend_on_workers(tmp_path):
+    sequential = _export(tmp_path, "one", workers=1)
+    parallel_run = _export(tmp_path, "four", workers=4)
+    assert len(sequential) == 3 + 7 + 4
+    assert sequential == parallel_run
+
+
+def test_without_workers_a_table_keeps_one_stream(tmp_path):
+    config = copy.deepcopy(CONFIG)
+    # nulls are spread over each file
+    config["tables"][0]["columns"][3].pop("null_percentage")
+
+    def export(name, config, **kwargs):
+        target = tmp_path / name
+        target.mkdir()
+        TableFaker().to_target("csv", copy.deepcopy(config), str(target), **kwargs)
+        tables = {}
+        # table_1.csv, table_2.csv, ... or one timestamped table file
+        number = lambda f: int(f[:-len(".csv")].split("_")[-1]) if f[:-len(".csv")].split("_")[-1].isdigit() else 0
+        for f in sorted(os.listdir(target), key=lambda f: (f.split("_")[0], number(f))):
+            header, rows = (target / f).read_text().split("\n", 1)
+            tables[f.split("_")[0]] = tables.get(f.split("_")[0], header + "\n") + rows
+        return tables
+
+    single_config = copy.deepcopy(config)
+    for table in single_config["tables"]:
+        table.pop("export_file_count", None)
+        table.pop("export_file_row_count", None)
+    single = export("single", single_config)
+    # without workers or a checkpoint, the files of a table split the rows of a single-file export
+    assert export("none", config) == single
+    # with workers, even 1, every file is seeded on its own, the same for any number of workers
+    assert export("one", config, workers=1) == export("three", config, workers=3) != single
+
+
+def test_workers_from_config(tmp_path):
+    config = copy.deepcopy(CONFIG)
+    config["config"]["workers"] = 2
+    target = tmp_path / "cfg"
+    target.mkdir()
+    TableFaker().to_target("csv", config, str(target))
+    assert _export(tmp_path, "kw", workers=2) == {f: (target / f).read_text() for f in sorted(os.listdir(target))}
+
+
+def test_sequential_reason():
+    tables = {t["table_name"]: t for t in CONFIG["tables"]}
+    assert parallel.sequential_reason(tables["customers"]) is None
+    assert parallel.sequential_reason(tables["orders"]) is None
+    assert parallel.sequential_reason(tables["coupons"]) is not None
+    self_ref = {"table_name": "employees", "columns": [{"column_name": "manager_id", "data": 'foreign_key("employees", "employee_id")'}]}
+    assert parallel.sequential_reason(self_ref) == "the table references its own keys"
+
+
+def test_wrong_workers(tmp_path):
+    with pytest.raises(Exception, match="Wrong workers"):
+        TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(tmp_path), workers=0)
@@ -0,0 +1,106 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import numpy as np
+from tablefaker.tablefaker import TableFaker
+from tablefaker.parent_cache import ParentUsage, ParentCache, KeyIndex
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 5},
+    "tables": [
+        {
+            "table_name": "customers",
+            "row_count": 30,
+            "columns": [
+                {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "email", "data": "fake.email()"},
+                {"column_name": "tier", "data": 'random.choice(["gold", "silver"])'},
+                {"column_name": "address", "data": "fake.address()"},
+            ],
+        },
+        {
+            "table_name": "orders",
+            "row_count": 60,
+            "columns": [
+                {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id", distribution="weighted_parent", parent_attr="tier", weights={"gold": 5, "silver": 1})'},
+                {"column_name": "email", "data": 'copy_from_fk("customers", "customer_id", "email")'},
+            ],
+        },
+    ],
+}
+
+
+def test_usage_finds_referenced_attributes():
+    usage = ParentUsage(CONFIG["tables"])
+    assert usage.attributes_of("customers") == {"tier", "email"}
+    assert usage.attributes_of("orders") == set()
+    assert not usage.keeps_rows("customers")
+
+
+def test_usage_falls_back_to_every_column():
+    tables = [{"table_name": "t", "columns": [
+        {"column_name": "a", "data": 'copy_from_fk("p", "a", name)'},
+        {"column_name": "b", "data": 'get_table("p")'},
+    ]}]
+    usage = ParentUsage(tables)
+    assert usage.attributes_of("p") is None
+    assert usage.keeps_rows("p") and not usage.keeps_rows("t")
+    plugin = [{"table_name": "t", "columns": [{"column_name": "a", "data": "helpers.pick(copy_from_fk, get_table)"}]}]
+    usage = ParentUsage(plugin)
+    assert usage.attributes_of("anything") is None
+    assert usage.keeps_rows("anything")
+
+
+def test_key_index():
+    index = KeyIndex()
+    for position, key in enumerate(range(10, 40, 3)):
+        index.add(key, position)
+    assert index.positions is None
+    assert index.get(16) == 2 and index.get(17) is None and index.get(40) is None and index.get(16.0) == 2
+    index.add("x", 10)
+    assert index.positions is not None
+    assert index.get(37) == 9 and index.get("x") == 10
+
+
+def test_parent_cache_values_and_extend():
+    cache = ParentCache(["id"], ["name", "score"])
+    cache.add_row({"id": 1, "name": "a", "score": 1.5})
+    assert cache.value(1, "name") == "a"  # readable before the chunk is flushed
+    cache.add_row({"id": 2, "name": None, "score": 2.5})
+    cache.flush()
+    assert isinstance(cache.chunks[0]["score"], np.ndarray) and cache.chunks[0]["score"].dtype == np.float64
+    assert type(cache.value(2, "score")) is float and cache.value(2, "name") is None
+
+    other = ParentCache(["id"], ["name", "score"])
+    other.add_row({"id": 3, "name": "c", "score": 3.5})
+    cache.extend(other)
+    assert len(cache) == 3 and cache.value(3, "name") == "c"
+    assert cache.get(4, "name", "missing") == "missing"
+    assert cache.get(1, "address") is None
+
+
+def test_only_referenced_attributes_are_cached():
+    tf = TableFaker()
+    dfs = tf.to_pandas(copy.deepcopy(CONFIG))
+    cache = tf.parent_rows["customers"]
+    assert set(cache.attributes) == {"email", "tier"}
+    assert "orders" not in tf.parent_rows
+    assert tf.generated_rows == {}
+    customers = dfs["customers"].set_index("customer_id")
+    for _, order in dfs["orders"].iterrows():
+        assert order["email"] == customers.loc[order["customer_id"], "email"]
+
+
+def test_copy_from_own_table():
+    config = {"tables": [{"table_name": "employees", "row_count": 10, "columns": [
+        {"column_name": "employee_id", "data": "row_id", "is_primary_key": True},
+        {"column_name": "name", "data": "fake.first_name()"},
+        {"column_name": "manager_name", "data": "if row_id == 1:\n  return None\nreturn copy_from_fk(\"employees\", \"manager_id\", \"name\")"},
+        {"column_name": "manager_id", "data": "row_id - 1 if row_id > 1 else None"},
+    ]}]}
+    df = TableFaker().to_pandas(config)["employees"]
+    names = df.set_index("employee_id")["name"]
+    for _, row in df.iloc[1:].iterrows():
+        assert row["manager_name"] == names[row["manager_id"]]
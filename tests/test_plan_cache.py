@@ -0,0 +1,173 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import concurrent.futures
+import functools
+import multiprocessing
+import pickle
+import subprocess
+import yaml
+import tablefaker as tablefaker_package
+from tablefaker import config, plan_cache
+from tablefaker import tablefaker as tablefaker_module
+from tablefaker.tablefaker import TableFaker
+
+CONFIG_YAML = """
+version: 1
+config:
+  locale: en_US
+  seed: 4
+  infer_entity_attrs_by_name: true
+tables:
+  - table_name: customers
+    row_count: 20
+    columns:
+      - column_name: customer_id
+        data: row_id
+        is_primary_key: true
+      - column_name: email
+        data: fake.email()
+  - table_name: orders
+    row_count: 50
+    columns:
+      - column_name: order_id
+        data: row_id
+        is_primary_key: true
+      - column_name: customer_id
+        data: foreign_key("customers", "customer_id")
+      - column_name: customer_email
+        data: auto
+      - column_name: amount
+        data: |
+          x = random.uniform(1, 100)
+          return round(x, 2)
+"""
+
+
+class FailingLoader(yaml.SafeLoader):
+    def __init__(self, stream):
+        raise AssertionError("the YAML should come from the cache")
+
+
+def _write(tmp_path, text):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(text)
+    return str(config_path)
+
+
+def _frames_equal(left, right):
+    return left.keys() == right.keys() and all(left[name].equals(right[name]) for name in left)
+
+
+def test_cached_run_skips_parsing_and_matches(tmp_path, monkeypatch):
+    config_path = _write(tmp_path, CONFIG_YAML)
+    cache_dir = tmp_path / ".tablefaker_cache"
+    expected = TableFaker().to_pandas(config_path)
+    assert _frames_equal(TableFaker().to_pandas(config_path, cache_dir=str(cache_dir)), expected)
+    assert len(os.listdir(cache_dir)) == 1
+
+    plan_cache.clear()
+    monkeypatch.setattr(config, "YAML_LOADER", FailingLoader)
+    cached = TableFaker().to_pandas(config_path, cache_dir=str(cache_dir))
+    assert _frames_equal(cached, expected)
+    # data: auto was resolved during the run, the cached config keeps it as written
+    assert TableFaker().to_pandas(config_path, cache_dir=str(cache_dir))["orders"].equals(expected["orders"])
+
+
+def test_changed_config_gets_new_cache_file(tmp_path):
+    cache_dir = tmp_path / ".tablefaker_cache"
+    config_path = _write(tmp_path, CONFIG_YAML)
+    TableFaker().to_pandas(config_path, cache_dir=str(cache_dir))
+    config_path = _write(tmp_path, CONFIG_YAML.replace("row_count: 50", "row_count: 7"))
+    orders = TableFaker().to_pandas(config_path, cache_dir=str(cache_dir))["orders"]
+    assert len(orders) == 7
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_broken_cache_file_is_rebuilt(tmp_path):
+    cache_dir = tmp_path / ".tablefaker_cache"
+    config_path = _write(tmp_path, CONFIG_YAML)
+    expected = TableFaker().to_pandas(config_path, cache_dir=str(cache_dir))
+    cache_file = cache_dir / os.listdir(cache_dir)[0]
+    cache_file.write_bytes(b"not a pickle")
+    plan_cache.clear()
+    assert _frames_equal(TableFaker().to_pandas(config_path, cache_dir=str(cache_dir)), expected)
+    assert cache_file.read_bytes() != b"not a pickle"
+
+
+def test_dict_config_cache(tmp_path):
+    cache_dir = tmp_path / ".tablefaker_cache"
+    config_dict = yaml.safe_load(CONFIG_YAML)
+    expected = TableFaker().to_pandas(yaml.safe_load(CONFIG_YAML))
+    TableFaker().to_pandas(config_dict, cache_dir=str(cache_dir))
+    plan_cache.clear()
+    assert _frames_equal(TableFaker().to_pandas(yaml.safe_load(CONFIG_YAML), cache_dir=str(cache_dir)), expected)
+
+
+def test_yaml_loader_matches_safe_load():
+    with open("tests/test_table.yaml") as f:
+        text = f.read()
+    assert yaml.load(text, Loader=config.YAML_LOADER) == yaml.safe_load(text)
+
+
+def test_version_matches_setup():
+    process = subprocess.run([sys.executable, "setup.py", "--version"], capture_output=True, text=True, check=True)
+    assert process.stdout.strip().splitlines()[-1] == tablefaker_package.__version__
+
+
+def _cache_memo(cache_dir):
+    (name,) = os.listdir(cache_dir)
+    with open(os.path.join(cache_dir, name), "rb") as f:
+        return pickle.load(f)["memo"]
+
+
+def test_cache_file_holds_only_its_config(tmp_path):
+    TableFaker().to_pandas(_write(tmp_path, CONFIG_YAML), progress=False)
+    other = CONFIG_YAML.replace("fake.email()", "fake.company_email()")
+    cache_dir = tmp_path / ".tablefaker_cache"
+    TableFaker().to_pandas(_write(tmp_path, other), cache_dir=str(cache_dir), progress=False)
+    names = _cache_memo(cache_dir)["names"]
+    assert "fake.company_email()" in names and "fake.email()" not in names
+
+
+def test_unseeded_block_code_is_reused(tmp_path):
+    unseeded = CONFIG_YAML.replace("  seed: 4\n", "")
+    config_path = _write(tmp_path, unseeded)
+    cache_dir = tmp_path / ".tablefaker_cache"
+    TableFaker().to_pandas(config_path, cache_dir=str(cache_dir), progress=False)
+    code = _cache_memo(cache_dir)["code"]
+    assert not any("func_" in source for _, source in code)
+    cache_file = cache_dir / os.listdir(cache_dir)[0]
+    modified = cache_file.stat().st_mtime_ns
+    plan_cache.clear()
+    TableFaker().to_pandas(config_path, cache_dir=str(cache_dir), progress=False)
+    # every entry came from the file, so it is not written again
+    assert cache_file.stat().st_mtime_ns == modified
+
+
+def test_process_memo_is_bounded(monkeypatch):
+    monkeypatch.setattr(plan_cache, "MAX_ENTRIES", 3)
+    plan_cache.clear()
+    for i in range(5):
+        plan_cache.cached("names", f"x{i}", lambda: i)
+    assert list(plan_cache._memo["names"]) == ["x2", "x3", "x4"]
+    plan_cache.clear()
+
+
+def test_spawned_workers_reload_the_cache(tmp_path, monkeypatch):
+    chunked = CONFIG_YAML.replace("    row_count: 50\n", "    row_count: 50\n    export_file_count: 2\n")
+    config_path = _write(tmp_path, chunked)
+    cache_dir = str(tmp_path / ".tablefaker_cache")
+
+    def export(name, **kwargs):
+        target = tmp_path / name
+        target.mkdir()
+        TableFaker().to_target("csv", config_path, str(target), workers=2, progress=False, **kwargs)
+        return sorted((target / f).read_text() for f in os.listdir(target) if f.startswith("orders_"))
+
+    expected = export("fork")
+    # spawn (macOS, Windows, Python 3.14) pickles the config with its plan cache for the workers
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(tablefaker_module, "ProcessPoolExecutor", functools.partial(concurrent.futures.ProcessPoolExecutor, mp_context=spawn))
+    assert export("spawn", cache_dir=cache_dir) == expected
+    # the second run reads the cache file, its workers too
+    assert export("spawn_cached", cache_dir=cache_dir) == expected
@@ -0,0 +1,144 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import json
+import subprocess
+import pytest
+import yaml
+from tablefaker.profiler import Profiler
+from tablefaker.tablefaker import TableFaker
+
+PLUGIN = """
+from tablefaker.plugin_loader import tf_expose
+
+@tf_expose()
+def exposed_word(row_id):
+    return "w" + str(row_id)
+
+def module_word(row_id):
+    return sum(range(5000)) + row_id
+"""
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 6},
+    "tables": [
+        {
+            "table_name": "customers",
+            "row_count": 200,
+            "columns": [
+                {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "name", "data": "fake.first_name()"},
+                {"column_name": "slow", "data": "sum(range(20000))"},
+            ],
+        },
+        {
+            "table_name": "orders",
+            "row_count": 300,
+            "export_file_count": 3,
+            "columns": [
+                {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id")'},
+            ],
+        },
+    ],
+}
+
+
+def test_columns_sorted_by_time():
+    table_faker = TableFaker()
+    table_faker.to_pandas(copy.deepcopy(CONFIG), profile=True)
+    report = table_faker.profiler.report()
+    columns = report["columns"]
+    assert (columns[0]["table"], columns[0]["column"], columns[0]["expression"]) == ("customers", "slow", "sum(range(20000))")
+    assert [entry["seconds"] for entry in columns] == sorted((entry["seconds"] for entry in columns), reverse=True)
+    assert {(entry["table"], entry["column"]): entry["calls"] for entry in columns} == {
+        ("customers", "customer_id"): 200, ("customers", "name"): 200, ("customers", "slow"): 200,
+        ("orders", "order_id"): 300, ("orders", "customer_id"): 300}
+    assert sum(entry["share"] for entry in columns) == pytest.approx(1)
+    assert {(entry["table"], entry["stage"]) for entry in report["stages"]} == {
+        ("customers", "rows"), ("customers", "convert"), ("orders", "rows"), ("orders", "convert")}
+    assert "customers.slow = sum(range(20000))" in table_faker.profiler.format_text()
+
+
+@pytest.mark.parametrize("engine", ["interpreter", "codegen"])
+def test_sampled_rows_keep_the_output(engine):
+    expected = TableFaker().to_pandas(copy.deepcopy(CONFIG), engine=engine)
+    table_faker = TableFaker()
+    result = table_faker.to_pandas(copy.deepcopy(CONFIG), engine=engine, profile=True, profile_sample=0.1)
+    for table_name in expected:
+        assert result[table_name].equals(expected[table_name])
+    report = table_faker.profiler.report()
+    assert report["sample"] == 0.1
+    assert {entry["calls"] for entry in report["columns"] if entry["table"] == "orders"} == {30}
+
+
+def test_codegen_rows_are_timed_by_the_row_function(monkeypatch):
+    def interpreted(*args, **kwargs):
+        raise AssertionError("codegen rows must not go through the interpreter")
+    monkeypatch.setattr(TableFaker, "generate_fake_row", interpreted)
+    table_faker = TableFaker()
+    table_faker.to_pandas(copy.deepcopy(CONFIG), engine="codegen", profile=True)
+    columns = table_faker.profiler.report()["columns"]
+    assert (columns[0]["table"], columns[0]["column"]) == ("customers", "slow")
+    assert {(entry["table"], entry["column"]): entry["calls"] for entry in columns} == {
+        ("customers", "customer_id"): 200, ("customers", "name"): 200, ("customers", "slow"): 200,
+        ("orders", "order_id"): 300, ("orders", "customer_id"): 300}
+
+
+def test_plugin_functions(tmp_path):
+    plugin_path = tmp_path / "profiled_plugin.py"
+    plugin_path.write_text(PLUGIN)
+
+    def custom_word():
+        return "custom"
+
+    config = {
+        "version": 1,
+        "config": {"locale": "en_US", "seed": 6, "python_import": [str(plugin_path)]},
+        "tables": [
+            {
+                "table_name": "words",
+                "row_count": 50,
+                "columns": [
+                    {"column_name": "exposed", "data": "exposed_word(row_id)"},
+                    {"column_name": "module", "data": "profiled_plugin.module_word(row_id)"},
+                    {"column_name": "custom", "data": "custom_word()"},
+                ],
+            },
+        ],
+    }
+    expected = TableFaker().to_pandas(copy.deepcopy(config), custom_function=custom_word)["words"]
+    table_faker = TableFaker()
+    result = table_faker.to_pandas(copy.deepcopy(config), custom_function=custom_word, profile=True)["words"]
+    assert result.equals(expected)
+    plugins = table_faker.profiler.report()["plugins"]
+    assert {entry["function"]: entry["calls"] for entry in plugins} == {"exposed_word": 50, "profiled_plugin.module_word": 50, "custom_word": 50}
+    assert plugins[0]["function"] == "profiled_plugin.module_word"
+
+
+def test_worker_profiles_are_merged(tmp_path):
+    report_path = tmp_path / "profile.json"
+    TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(tmp_path), workers=2, profile=str(report_path))
+    report = json.loads(report_path.read_text())
+    calls = {(entry["table"], entry["column"]): entry["calls"] for entry in report["columns"]}
+    assert calls[("orders", "order_id")] == 300
+    stages = {(entry["table"], entry["stage"]): entry["calls"] for entry in report["stages"]}
+    assert stages[("orders", "write")] == 3 and stages[("customers", "write")] == 1
+
+
+def test_wrong_sample():
+    with pytest.raises(Exception, match="Wrong profile_sample"):
+        Profiler(0)
+
+
+def test_cli_profile(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(CONFIG))
+    target = tmp_path / "out"
+    target.mkdir()
+    output = subprocess.run([sys.executable, "-c", "from tablefaker import cli; cli.main()", "--config", str(config_path), "--target", str(target),
+                             "--profile", str(tmp_path / "profile.json"), "--profile-sample", "0.5", "--no-progress"],
+                            capture_output=True, text=True, check=True)
+    assert "1 row in 2" in output.stdout and "customers.slow = sum(range(20000))" in output.stdout
+    assert json.loads((tmp_path / "profile.json").read_text())["sample"] == 0.5
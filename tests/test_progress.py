@@ -0,0 +1,106 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import re
+import pytest
+from tablefaker import progress, util
+from tablefaker.progress import Progress
+from tablefaker.tablefaker import TableFaker
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 5},
+    "tables": [
+        {
+            "table_name": "customers",
+            "row_count": 300,
+            "columns": [
+                {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "name", "data": "fake.first_name()"},
+            ],
+        },
+        {
+            "table_name": "orders",
+            "row_count": 900,
+            "export_file_count": 3,
+            "columns": [
+                {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id")'},
+                {"column_name": "amount", "data": "round(random.uniform(1, 100), 2)"},
+            ],
+        },
+    ],
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.reads = 0
+
+    def monotonic(self):
+        self.reads += 1
+        return self.now
+
+
+def test_events_rate_and_eta(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(progress, "time", clock)
+    events = []
+    run = Progress(events.append, {"a": 100, "b": 300}, interval=1)
+    tracker = run.table("a", 100)
+    clock.now = 2.0
+    tracker.add(50)
+    assert events[-1]["table"] == "a" and events[-1]["rows"] == 50 and events[-1]["total"] == 100
+    assert events[-1]["rows_per_sec"] == 25 and events[-1]["eta"] == 2
+    assert events[-1]["run_rows"] == 50 and events[-1]["run_total"] == 400 and events[-1]["run_eta"] == 14
+    assert not events[-1]["finished"]
+
+    # throttled: no event until the interval passed, except the last row of a table
+    clock.now = 2.5
+    tracker.add(25)
+    assert len(events) == 1
+    tracker.add(25)
+    assert len(events) == 2 and events[-1]["finished"] and events[-1]["eta"] == 0
+
+
+def test_clock_is_read_rarely(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(progress, "time", clock)
+    events = []
+    tracker = Progress(events.append, {"a": 100000}, interval=1).table("a", 100000)
+    for i in range(100000):
+        clock.now += 0.00001  # 100000 rows/s
+        tracker.add()
+    assert clock.reads < 200
+    assert events[-1]["finished"] and events[-1]["rows"] == 100000
+
+
+def test_callback_gets_every_table_without_output(capsys):
+    events = []
+    TableFaker().to_pandas(copy.deepcopy(CONFIG), progress=events.append, progress_interval=0)
+    finished = [event for event in events if event["finished"]]
+    assert [(event["table"], event["rows"]) for event in finished] == [("customers", 300), ("orders", 900)]
+    assert finished[-1]["run_rows"] == finished[-1]["run_total"] == 1200
+    assert all(event["rows"] <= event["total"] for event in events)
+    assert "━" not in capsys.readouterr().out
+
+
+def test_worker_chunks_are_counted_by_the_main_process(tmp_path):
+    events = []
+    TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(tmp_path), workers=2, progress=lambda event: events.append(event))
+    orders = [event["rows"] for event in events if event["table"] == "orders"]
+    assert orders[-1] == 900 and events[-1]["finished"]
+
+
+@pytest.mark.parametrize("report, lines", [(True, 2), (False, 0)])
+def test_plain_lines_without_terminal(capsys, report, lines):
+    # the terminal output of the CLI, libraries get no output until configure_logging
+    util.configure_logging(level=util.INFO, log_format="text")
+    TableFaker().to_pandas(copy.deepcopy(CONFIG), progress=report)
+    out = re.sub(r"\x1b\[[0-9;]*m", "", capsys.readouterr().out)
+    assert "━" not in out
+    progress_lines = [line for line in out.splitlines() if "] - progress " in line]
+    assert len(progress_lines) == lines
+    if lines:
+        assert "progress customers 300/300 100.0%" in progress_lines[0]
@@ -0,0 +1,63 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import pytest
+from tablefaker.tablefaker import TableFaker
+from tablefaker import rng
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 21},
+    "tables": [
+        {
+            "table_name": "readings",
+            "row_count": 200,
+            "columns": [
+                {"column_name": "reading_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "sensor", "data": "rng.randint(1, 20) + rng.randint(0, 1)"},
+                {"column_name": "value", "data": "round(rng.uniform(-5, 5), 3)"},
+                {"column_name": "level", "data": 'rng.choice(["low", "mid", "high"])'},
+                {"column_name": "noise", "data": "x = rng.gauss(0, 2)\nreturn round(x, 4)"},
+                {"column_name": "label", "data": "fake.word()"},
+            ],
+        },
+    ],
+}
+
+RNG_COLUMNS = ["reading_id", "sensor", "value", "level", "noise"]
+
+
+def _readings(config=CONFIG, **kwargs):
+    return TableFaker().to_pandas(copy.deepcopy(config), **kwargs)["readings"][RNG_COLUMNS]
+
+
+@pytest.mark.parametrize("engine", ["codegen", "vectorized"])
+def test_engines_draw_the_same_values(engine):
+    assert _readings(engine=engine).equals(_readings(engine="interpreter"))
+
+
+def test_rows_are_seekable():
+    config = copy.deepcopy(CONFIG)
+    config["tables"][0]["start_row_id"] = 151
+    config["tables"][0]["row_count"] = 50
+    tail = _readings(config).reset_index(drop=True)
+    assert tail.equals(_readings().iloc[150:].reset_index(drop=True))
+    streams = rng.Streams(21, "readings")
+    assert streams.select("value", 151).uniform(-5, 5) == pytest.approx(tail["value"][0], abs=1e-3)
+
+
+def test_seed_changes_streams():
+    config = copy.deepcopy(CONFIG)
+    config["config"]["seed"] = 22
+    assert not _readings(config)["value"].equals(_readings()["value"])
+
+
+def test_streams_api():
+    streams = rng.Streams(1, "t")
+    first = [streams.select("c", 7).random() for _ in range(2)]
+    assert first[0] == first[1]
+    streams.select("c", 7)
+    draws = [streams.random(), streams.random()]
+    assert draws[0] != draws[1]
+    assert streams.uniforms("c", [7], draw=1).tolist() == [draws[1]]
+    assert all(1 <= streams.randint(1, 3) <= 3 for _ in range(100))
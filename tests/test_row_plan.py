@@ -0,0 +1,107 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import pytest
+from tablefaker.tablefaker import TableFaker
+from tablefaker.row_plan import RowPlan, referenced_names
+
+
+def _names(plan):
+    return [c["column_name"] for c in plan.columns]
+
+
+def test_referenced_names_uses_ast_not_substrings():
+    """A column called 'id' is not a dependency of an expression that uses row_id."""
+    columns = [
+        {"column_name": "double_id", "data": "row_id * 2"},
+        {"column_name": "id", "data": "row_id", "is_primary_key": True},
+    ]
+    plan = RowPlan("t", columns)
+    assert plan.dependencies["double_id"] == set()
+    # not a dependency, but the former two-phase order still puts it after id, as seeded configs expect
+    assert _names(plan) == ["id", "double_id"]
+
+
+def test_seeded_sample_keeps_its_values():
+    """Columns the old substring test put in the second phase (fax contains fake.) keep their random draws."""
+    import yaml
+    with open("samples/northwind/northwind.yaml") as f:
+        config = yaml.safe_load(f)
+    config["config"]["seed"] = 7
+    frames = TableFaker().to_pandas(config, progress=False)
+    supplier = frames["supplier"].astype(str).values.tolist()
+    assert list(frames["supplier"].columns) == ["supplier_id", "company_name", "contact_name", "contact_title", "address",
+                                                 "city", "country", "phone", "homepage", "fax"]
+    assert supplier[0] == ["2000", "Waters-Tyler", "Patricia Harris", "Sales Manager", "090 Michael Mall Apt. 848",
+                           "Courtneyshire", "Norfolk Island", "754-910-2560x71512", "ewing-buck.com", "621.889.4863x5403"]
+    assert frames["category"].astype(str).values.tolist()[1] == ["3001", "Bakery", "Strong open investment live among."]
+    employee = frames["employee"].astype(str).values.tolist()[0]
+    assert employee[:4] == ["5000", "Bruce", "Leonard", "Sales Representative"] and employee[-1] == "693"
+    # foreign keys are drawn from their own streams since the array-backed key cache, the other columns are unchanged
+    product = frames["product"].drop(columns=["supplier_id", "category_id"]).astype(str).values.tolist()
+    assert product[0] == ["4000", "Wife Blend", "12 - 1 lb pkgs", "114.49", "88", "32", "19", "False"]
+
+
+def test_function_block_locals_are_not_dependencies():
+    command = "total = 5\nreturn total + price"
+    assert referenced_names(command) == {"price"}
+
+
+def test_copy_from_fk_depends_on_fk_column():
+    columns = [
+        {"column_name": "customer_email", "data": 'copy_from_fk("customers", "customer_id", "email")'},
+        {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id")'},
+    ]
+    plan = RowPlan("orders", columns)
+    assert plan.dependencies["customer_email"] == {"customer_id"}
+    assert _names(plan) == ["customer_id", "customer_email"]
+
+
+def test_primary_key_with_dependencies_runs_after_them():
+    columns = [
+        {"column_name": "full_name", "data": 'first_name + " " + last_name', "is_primary_key": True},
+        {"column_name": "first_name", "data": "fake.first_name()"},
+        {"column_name": "last_name", "data": "fake.last_name()"},
+    ]
+    plan = RowPlan("person", columns)
+    assert _names(plan) == ["first_name", "last_name", "full_name"]
+
+
+def test_circular_dependency_raises():
+    columns = [
+        {"column_name": "a", "data": "b + 1"},
+        {"column_name": "b", "data": "a + 1"},
+    ]
+    with pytest.raises(Exception, match="Circular dependency"):
+        RowPlan("t", columns)
+
+
+def test_plan_is_built_once_per_table_across_chunks(tmp_path, monkeypatch):
+    cfg = {
+        "version": 1,
+        "config": {"locale": "en_US", "seed": 3},
+        "tables": [
+            {
+                "table_name": "items",
+                "row_count": 20,
+                "export_file_row_count": 5,
+                "columns": [
+                    {"column_name": "item_id", "data": "row_id", "is_primary_key": True},
+                    {"column_name": "price", "data": "random.randint(1, 10)"},
+                    {"column_name": "total", "data": "price * 3"},
+                ],
+            }
+        ],
+    }
+    tf = TableFaker()
+    built = []
+    original_init = RowPlan.__init__
+
+    def counting_init(self, *args, **kwargs):
+        built.append(args[0])
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(RowPlan, "__init__", counting_init)
+    tf.to_target("csv", cfg, str(tmp_path))
+
+    assert built == ["items"]
+    assert len(list(tmp_path.glob("*.csv"))) == 4
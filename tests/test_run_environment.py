@@ -0,0 +1,91 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+from faker.providers import BaseProvider
+from tablefaker.tablefaker import TableFaker
+
+PLUGIN = """
+from tablefaker.plugin_loader import tf_expose
+
+with open(__file__ + ".loads", "a") as f:
+    f.write("loaded\\n")
+
+_CACHE = {"calls": 0}
+
+@tf_expose()
+def next_call():
+    _CACHE["calls"] += 1
+    return _CACHE["calls"]
+"""
+
+
+class CountingProvider(BaseProvider):
+    def ticket(self):
+        return "T-" + str(self.random_int(1, 9))
+
+
+def _config(plugin_path):
+    return {
+        "version": 1,
+        "config": {"locale": "en_US", "seed": 3, "python_import": [plugin_path]},
+        "tables": [
+            {
+                "table_name": "events",
+                "row_count": 30,
+                "export_file_count": 3,
+                "columns": [
+                    {"column_name": "event_id", "data": "row_id", "is_primary_key": True},
+                    {"column_name": "call", "data": "next_call()"},
+                    {"column_name": "ticket", "data": "fake.ticket()"},
+                ],
+            },
+            {
+                "table_name": "notes",
+                "row_count": 5,
+                "columns": [
+                    {"column_name": "note_id", "data": "row_id", "is_primary_key": True},
+                    {"column_name": "call", "data": "next_call()"},
+                ],
+            },
+        ],
+    }
+
+
+def _plugin(tmp_path):
+    plugin_path = tmp_path / "run_plugin.py"
+    plugin_path.write_text(PLUGIN)
+    return str(plugin_path)
+
+
+def _loads(plugin_path):
+    with open(plugin_path + ".loads") as f:
+        return len(f.readlines())
+
+
+def test_plugins_load_once_per_run(tmp_path):
+    plugin_path = _plugin(tmp_path)
+    target = tmp_path / "out"
+    target.mkdir()
+    TableFaker().to_target("csv", _config(plugin_path), str(target), fake_provider=CountingProvider)
+    assert _loads(plugin_path) == 1
+    assert len(os.listdir(target)) == 3 + 1
+
+
+def test_plugin_state_survives_chunks_and_tables(tmp_path):
+    plugin_path = _plugin(tmp_path)
+    batches = list(TableFaker().iter_batches(_config(plugin_path), "events", batch_size=7, fake_provider=CountingProvider))
+    calls = [call for batch in batches for call in batch["call"]]
+    assert calls == list(range(1, 31))
+    assert _loads(plugin_path) == 1
+
+    frames = TableFaker().to_pandas(_config(plugin_path), fake_provider=CountingProvider)
+    assert list(frames["notes"]["call"]) == list(range(31, 36))
+    # a new run loads the plugin again
+    assert _loads(plugin_path) == 2
+
+
+def test_providers_added_once_per_run(tmp_path):
+    table_faker = TableFaker()
+    frames = table_faker.to_pandas(_config(_plugin(tmp_path)), fake_provider=[CountingProvider])
+    assert frames["events"]["ticket"].str.startswith("T-").all()
+    fake = table_faker.fake_by_locale["en_US"]
+    assert sum(isinstance(provider, CountingProvider) for provider in fake.providers) == 1
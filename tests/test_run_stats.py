@@ -0,0 +1,121 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import json
+import subprocess
+import psutil
+import pytest
+import yaml
+from tablefaker import run_stats
+from tablefaker.tablefaker import TableFaker
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 8},
+    "tables": [
+        {
+            "table_name": "customers",
+            "row_count": 200,
+            "export_file_count": 4,
+            "columns": [
+                {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "name", "data": "fake.name()"},
+            ],
+        },
+        {
+            "table_name": "orders",
+            "row_count": 300,
+            "columns": [
+                {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id")'},
+            ],
+        },
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def no_blocking_cpu_sampling(monkeypatch):
+    monkeypatch.setattr(psutil, "cpu_percent", lambda *args, **kwargs: pytest.fail("cpu_percent blocks, use the run stats sample"))
+
+
+def _files(target):
+    return {f: (target / f).stat().st_size for f in os.listdir(target) if f.endswith(".csv")}
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_run_report(tmp_path, workers):
+    target = tmp_path / "out"
+    target.mkdir()
+    report_path = tmp_path / "reports" / "run.json"
+    kwargs = {"workers": workers} if workers else {}
+    TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(target), run_report=str(report_path), **kwargs)
+    report = json.loads(report_path.read_text())
+
+    assert report["rows"] == 500 and report["file_type"] == "csv"
+    assert report["bytes_written"] == sum(_files(target).values())
+    assert report["seconds"] > 0 and report["rows_per_sec"] > 0 and report["cpu_seconds"] >= 0
+    assert report["peak_rss_bytes"] > 0
+    assert (report["worker_peak_rss_bytes"] is not None) == bool(workers)
+
+    customers, orders = report["tables"]
+    assert customers["table"] == "customers" and customers["rows"] == 200 and customers["seconds"] > 0
+    assert [(chunk["chunk"], chunk["rows"]) for chunk in customers["chunks"]] == [(0, 50), (1, 50), (2, 50), (3, 50)]
+    assert [os.path.basename(chunk["file"]) for chunk in customers["chunks"]] == [f"customers_{i}.csv" for i in range(1, 5)]
+    assert all(chunk["bytes_written"] == os.path.getsize(chunk["file"]) and chunk["rows_per_sec"] > 0 for chunk in customers["chunks"])
+    assert orders["rows"] == 300 and len(orders["chunks"]) == 1 and orders["files"] == [orders["chunks"][0]["file"]]
+
+
+def test_to_pandas_stats():
+    table_faker = TableFaker()
+    table_faker.to_pandas(copy.deepcopy(CONFIG))
+    report = table_faker.run_stats.report()
+    assert [(stats["table"], stats["rows"], stats["chunks"]) for stats in report["tables"]] == [("customers", 200, []), ("orders", 300, [])]
+    assert report["rows"] == 500 and report["bytes_written"] == 0 and report["finished_at"] is not None
+
+
+@pytest.mark.skipif(run_stats.resource is None, reason="no process peak on Windows")
+def test_peak_memory_of_each_run():
+    table_faker = TableFaker()
+    # a peak of the process before the run
+    ballast = b"x" * (256 * 1024 * 1024)
+    del ballast
+    table_faker.to_pandas(copy.deepcopy(CONFIG))
+    report = table_faker.run_stats.report()
+    assert 0 < report["peak_rss_bytes"] < run_stats.process_peak_rss_bytes() - 128 * 1024 * 1024
+    # the sampling thread ends with the run
+    assert not table_faker.run_stats.sampler.is_alive()
+
+
+def test_sampling_stops_when_a_run_fails_or_is_abandoned():
+    table_faker = TableFaker()
+    config = copy.deepcopy(CONFIG)
+    config["tables"][1]["columns"].append({"column_name": "broken", "data": "undefined_name"})
+    with pytest.raises(Exception):
+        table_faker.to_pandas(config)
+    assert not table_faker.run_stats.sampler.is_alive()
+
+    batches = table_faker.iter_batches(copy.deepcopy(CONFIG), "orders", batch_size=10)
+    next(batches)
+    assert table_faker.run_stats.sampler.is_alive()
+    batches.close()
+    assert not table_faker.run_stats.sampler.is_alive()
+
+
+def test_restored_tables_are_not_counted(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint")
+    TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(tmp_path), table_name="customers", checkpoint=checkpoint)
+    table_faker = TableFaker()
+    table_faker.to_target("csv", copy.deepcopy(CONFIG), str(tmp_path), table_name="customers", checkpoint=checkpoint, resume=True)
+    report = table_faker.run_stats.report()
+    assert report["tables"][0]["restored"] and report["rows"] == 0
+
+
+def test_cli_run_report(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(CONFIG))
+    target = tmp_path / "out"
+    target.mkdir()
+    subprocess.run([sys.executable, "-c", "from tablefaker import cli; cli.main()", "--config", str(config_path), "--target", str(target),
+                    "--run-report", str(tmp_path / "run.json"), "--quiet"], check=True)
+    assert json.loads((tmp_path / "run.json").read_text())["rows"] == 500
@@ -0,0 +1,116 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import random
+import pytest
+from tablefaker import tablefaker
+from tablefaker import rng
+from tablefaker.tablefaker import TableFaker
+
+
+def pick_level(limit):
+    return random.randint(0, limit)
+
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 5, "seekable": True},
+    "tables": [
+        {
+            "table_name": "teams",
+            "row_count": 15,
+            "columns": [
+                {"column_name": "team_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "team_name", "data": "fake.city()"},
+            ],
+        },
+        {
+            "table_name": "players",
+            "row_count": 120,
+            "columns": [
+                {"column_name": "player_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "team_id", "data": 'foreign_key("teams", "team_id")'},
+                {"column_name": "team_name", "data": 'copy_from_fk("teams", "team_id", "team_name")'},
+                {"column_name": "name", "data": "fake.name()"},
+                {"column_name": "age", "data": "random.randint(18, 40)", "null_percentage": 0.25},
+                {"column_name": "rating", "data": "round(random.uniform(1, 10), 2)"},
+                {"column_name": "level", "data": "pick_level(5)"},
+                {"column_name": "bonus", "data": "x = random.random()\nreturn round(x * 100, 1)"},
+            ],
+        },
+    ],
+}
+
+
+def _config():
+    return copy.deepcopy(CONFIG)
+
+
+@pytest.mark.parametrize("engine", ["interpreter", "codegen", "vectorized"])
+def test_generate_rows_matches_full_run(engine):
+    full = tablefaker.to_pandas(_config(), custom_function=pick_level, engine=engine)["players"]
+    expected = full.iloc[47:93].reset_index(drop=True)
+    rows = tablefaker.generate_rows(_config(), "players", 47, 93, custom_function=pick_level, engine=engine)
+    assert rows.equals(expected)
+    table = tablefaker.generate_rows(_config(), "players", 47, 93, output="arrow", custom_function=pick_level, engine=engine)
+    assert table.to_pandas().equals(expected)
+
+
+def test_codegen_matches_interpreter():
+    interpreter = tablefaker.to_pandas(_config(), custom_function=pick_level, engine="interpreter")
+    codegen = tablefaker.to_pandas(_config(), custom_function=pick_level, engine="codegen")
+    for name in interpreter:
+        assert interpreter[name].equals(codegen[name])
+
+
+def test_adding_a_column_keeps_the_others():
+    before = tablefaker.to_pandas(_config(), custom_function=pick_level)["players"]
+    config = _config()
+    config["tables"][1]["columns"].insert(3, {"column_name": "nickname", "data": "fake.first_name() + str(random.random())"})
+    after = tablefaker.to_pandas(config, custom_function=pick_level)["players"]
+    assert after.drop(columns=["nickname"]).equals(before)
+
+
+def test_export_does_not_depend_on_batches(tmp_path):
+    contents = []
+    for name, kwargs in [("full", {}), ("batched", {"batch_size": 11})]:
+        target = tmp_path / name
+        target.mkdir()
+        TableFaker().to_target("csv", _config(), str(target), custom_function=pick_level, **kwargs)
+        contents.append(sorted((target / f).read_text() for f in os.listdir(target)))
+    assert contents[0] == contents[1]
+
+
+def test_generate_rows_of_sequential_table():
+    """is_unique foreign keys depend on the rows before them, the table is generated from its first row."""
+    config = _config()
+    config["tables"][1]["row_count"] = 15
+    config["tables"][1]["columns"][1]["data"] = 'foreign_key("teams", "team_id", is_unique=True)'
+    full = tablefaker.to_pandas(copy.deepcopy(config), custom_function=pick_level)["players"]
+    rows = tablefaker.generate_rows(config, "players", 5, 12, custom_function=pick_level)
+    assert rows.equals(full.iloc[5:12].reset_index(drop=True))
+
+
+def test_generate_rows_range_is_clipped_and_checked():
+    assert len(tablefaker.generate_rows(_config(), "players", 110, 500, custom_function=pick_level)) == 10
+    with pytest.raises(Exception, match="Wrong row range"):
+        tablefaker.generate_rows(_config(), "players", 10, 5)
+    with pytest.raises(Exception, match="Table missing not found"):
+        tablefaker.generate_rows(_config(), "missing", 0, 5)
+
+
+def test_faker_random_is_restored():
+    table_faker = TableFaker()
+    table_faker.to_pandas(_config(), custom_function=pick_level)
+    for fake in table_faker.fake_by_locale.values():
+        assert not isinstance(fake.random, rng.CellRandom)
+
+
+def test_cell_random_is_counter_based():
+    cell_random = rng.CellRandom(5, "players")
+    first = [cell_random.select("age", 1000).randint(1, 6) for _ in range(3)]
+    assert len(set(first)) == 1
+    cell_random.select("age", 7)
+    values = [cell_random.random(), cell_random.getrandbits(100), cell_random.choice("abc")]
+    cell_random.select("age", 7)
+    assert values == [cell_random.random(), cell_random.getrandbits(100), cell_random.choice("abc")]
@@ -0,0 +1,118 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import subprocess
+import pandas as pd
+import pytest
+import yaml
+from tablefaker.tablefaker import TableFaker
+from tablefaker import shard
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 11},
+    "tables": [
+        {
+            "table_name": "customers",
+            "row_count": 70,
+            "columns": [
+                {"column_name": "customer_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "first_name", "data": "fake.first_name()"},
+                {"column_name": "segment", "data": 'random.choice(["retail", "corporate"])'},
+                {"column_name": "score", "data": "random.randint(1, 100)", "null_percentage": 0.2},
+            ],
+        },
+        {
+            "table_name": "orders",
+            "row_count": 200,
+            "columns": [
+                {"column_name": "order_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id", distribution="zipf")'},
+                {"column_name": "segment", "data": 'copy_from_fk("customers", "customer_id", "segment")'},
+                {"column_name": "amount", "data": "round(random.uniform(5, 500), 2)"},
+            ],
+        },
+        {
+            "table_name": "coupons",
+            "row_count": 40,
+            "columns": [
+                {"column_name": "coupon_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "code", "data": "fake.unique.bothify('??-####')"},
+                {"column_name": "customer_id", "data": 'foreign_key("customers", "customer_id", is_unique=True)'},
+            ],
+        },
+    ],
+}
+TABLES = ["customers", "orders", "coupons"]
+
+
+def _read(target, table_name):
+    files = sorted(f for f in os.listdir(target) if f.startswith(table_name))
+    return [pd.read_csv(target / f) for f in files]
+
+
+def test_shards_in_processes_equal_single_run(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(CONFIG))
+    single = tmp_path / "single"
+    single.mkdir()
+    TableFaker().to_target("csv", str(config_path), str(single), seekable=True)
+
+    sharded = tmp_path / "sharded"
+    sharded.mkdir()
+    env = dict(os.environ, PYTHONPATH=os.path.abspath("."))
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", "from tablefaker import cli; cli.main()", "--config", str(config_path),
+             "--target", str(sharded), "--shard", f"{i}/3"],
+            env=env, stdout=subprocess.DEVNULL,
+        )
+        for i in (1, 2, 3)
+    ]
+    assert [process.wait(timeout=300) for process in processes] == [0, 0, 0]
+
+    for table_name in TABLES:
+        parts = _read(sharded, table_name)
+        assert len(parts) == 3
+        union = pd.concat(parts, ignore_index=True)
+        assert union.equals(_read(single, table_name)[0])
+
+
+def test_shard_slices_cover_rows_in_order(tmp_path):
+    sizes = []
+    for i in (1, 2, 3, 4):
+        target = tmp_path / str(i)
+        target.mkdir()
+        TableFaker().to_target("csv", copy.deepcopy(CONFIG), str(target), shard=(i, 4), batch_size=9)
+        assert all(f"_shard{i}of4_" in f for f in os.listdir(target))
+        orders = _read(target, "orders")[0]
+        sizes.append(len(orders))
+        first_row_id = shard.shard_range(200, i, 4)[0] + 1
+        assert orders["order_id"].tolist() == list(range(first_row_id, first_row_id + len(orders)))
+    assert sizes == [50, 50, 50, 50]
+
+
+def test_shard_range():
+    assert [shard.shard_range(10, i, 3) for i in (1, 2, 3)] == [(0, 3), (3, 3), (6, 4)]
+    assert shard.shard_range(2, 1, 4) == (0, 0)
+
+
+def test_wrong_shard():
+    assert shard.parse_shard("2/8") == (2, 8)
+    for value in ["0/3", "4/3", "a/3", "3", (1,)]:
+        with pytest.raises(Exception, match="Wrong shard"):
+            shard.parse_shard(value)
+
+
+def test_shard_needs_seed(tmp_path):
+    config = copy.deepcopy(CONFIG)
+    del config["config"]["seed"]
+    with pytest.raises(Exception, match="shard needs a seed"):
+        TableFaker().to_target("csv", config, str(tmp_path), shard="1/2")
+
+
+def test_read_tables():
+    assert shard.read_tables(CONFIG["tables"]) == {"customers"}
+    tables = copy.deepcopy(CONFIG["tables"])
+    tables[1]["columns"][1]["data"] = 'foreign_key(parent, "customer_id")'
+    assert shard.read_tables(tables) == set(TABLES)
@@ -0,0 +1,98 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import math
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+from tablefaker.sql_writer import quote_identifier, sql_literals, copy_fields
+from tablefaker.tablefaker import TableFaker
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 12},
+    "tables": [
+        {
+            "table_name": "people",
+            "row_count": 23,
+            "columns": [
+                {"column_name": "person_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "name", "data": "fake.first_name() + \"'s\""},
+                {"column_name": "born", "data": "fake.date_object()", "null_percentage": 0.3},
+                {"column_name": "active", "data": "row_id % 3 == 0"},
+                {"column_name": "score", "data": "round(random.uniform(0, 10), 2)"},
+            ],
+        },
+    ],
+}
+
+
+def _export(tmp_path, name, **kwargs):
+    target = tmp_path / name
+    target.mkdir()
+    TableFaker().to_target("sql", copy.deepcopy(CONFIG), str(target), **kwargs)
+    return (target / os.listdir(target)[0]).read_text()
+
+
+def test_sqlite_loads_batched_inserts(tmp_path):
+    script = _export(tmp_path, "sqlite", sql_dialect="sqlite", sql_batch_size=10)
+    assert script.count("INSERT INTO \"people\"") == 3
+    connection = sqlite3.connect(":memory:")
+    connection.execute('CREATE TABLE people (person_id INTEGER, name TEXT, born TEXT, active INTEGER, score REAL)')
+    connection.executescript(script)
+    loaded = connection.execute("SELECT person_id, name, born, active, score FROM people ORDER BY person_id").fetchall()
+
+    expected = TableFaker().to_pandas(copy.deepcopy(CONFIG))["people"]
+    assert [row[0] for row in loaded] == expected["person_id"].tolist()
+    assert [row[1] for row in loaded] == expected["name"].tolist()
+    assert [row[2] for row in loaded] == [None if born is None else str(born) for born in expected["born"]]
+    assert [row[3] for row in loaded] == [int(active) for active in expected["active"]]
+    assert [row[4] for row in loaded] == expected["score"].tolist()
+
+
+def test_statements_do_not_depend_on_batches(tmp_path):
+    # seekable, so null_percentage does not depend on the batches either
+    full = _export(tmp_path, "full", sql_batch_size=5, seekable=True)
+    batched = _export(tmp_path, "batched", sql_batch_size=5, batch_size=7, seekable=True)
+    assert full == batched and full.count("INSERT INTO people") == 5 and full.endswith(";\n")
+
+
+def test_copy_format(tmp_path):
+    script = _export(tmp_path, "copy", sql_format="copy", sql_dialect="postgres")
+    lines = script.splitlines()
+    assert lines[0] == 'COPY "people" ("person_id", "name", "born", "active", "score") FROM stdin;'
+    assert lines[-1] == "\\." and len(lines) == 25
+    assert all(len(line.split("\t")) == 5 for line in lines[1:-1])
+    assert "\\N" in script and {line.split("\t")[3] for line in lines[1:-1]} == {"t", "f"}
+
+
+def test_literals():
+    values = pd.Series(["it's", "back\\slash", None, "tab\there"])
+    assert list(sql_literals(values)) == ["'it''s'", "'back\\slash'", "NULL", "'tab\there'"]
+    assert list(sql_literals(values, "mysql"))[1] == "'back\\\\slash'"
+    assert list(copy_fields(values)) == ["it's", "back\\\\slash", "\\N", "tab\\there"]
+    # no float upcast of integers, missing floats are NULL
+    frame = pd.DataFrame({"id": [1, 2, 3], "value": [0.5, np.nan, 2.0]})
+    assert list(sql_literals(frame["id"])) == ["1", "2", "3"]
+    assert list(sql_literals(frame["value"])) == ["0.5", "NULL", "2.0"]
+    assert list(sql_literals(pd.Series([True, None, False], dtype="boolean"), "postgres")) == ["TRUE", "NULL", "FALSE"]
+    mixed = sql_literals(pd.Series([1, "a", math.pi, pd.Timestamp("2024-01-02")], dtype=object))
+    assert list(mixed) == ["1", "'a'", str(math.pi), "'2024-01-02 00:00:00'"]
+
+
+def test_quote_identifier():
+    assert quote_identifier("sales.orders") == "sales.orders"
+    assert quote_identifier("sales.orders", "mysql") == "`sales`.`orders`"
+    assert quote_identifier('my"table', "postgres") == '"my""table"'
+    assert quote_identifier('"Sales".orders', "snowflake") == '"Sales"."orders"'
+
+
+@pytest.mark.parametrize("options, message", [
+    ({"sql_dialect": "oracle"}, "Wrong sql_dialect"),
+    ({"sql_format": "copy", "sql_dialect": "mysql"}, "Postgres COPY"),
+    ({"sql_batch_size": 0}, "Wrong sql_batch_size"),
+])
+def test_wrong_options(tmp_path, options, message):
+    with pytest.raises(Exception, match=message):
+        TableFaker().to_target("sql", copy.deepcopy(CONFIG), str(tmp_path), **options)
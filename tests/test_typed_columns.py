@@ -0,0 +1,86 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import pandas as pd
+import pytest
+from tablefaker.tablefaker import TableFaker
+from tablefaker import typed_columns
+from tablefaker.typed_columns import ColumnBuilder
+
+COLUMNS = [
+    {"column_name": "id", "type": "int32"},
+    {"column_name": "small", "type": "int8"},
+    {"column_name": "ratio", "type": "float32"},
+    {"column_name": "amount", "type": "float"},
+    {"column_name": "flag", "type": "bool"},
+    {"column_name": "flag_as_int", "type": "int32"},
+    {"column_name": "name", "type": "string"},
+    {"column_name": "maybe_name", "type": "string"},
+    {"column_name": "nullable", "type": "Int64"},
+    {"column_name": "untyped"},
+    {"column_name": "mixed"},
+]
+
+
+def _rows(count):
+    return [{
+        "id": i,
+        "small": i * 10,  # overflows int8, converted like astype does
+        "ratio": i / 7,
+        "amount": i if i % 2 else i + 0.25,
+        "flag": i % 3 == 0,
+        "flag_as_int": i % 2 == 0,
+        "name": f"n{i}",
+        "maybe_name": None if i % 4 == 0 else "x",
+        "nullable": None if i % 5 == 0 else i,
+        "untyped": i * 1.5,
+        "mixed": i if i % 2 else "a",
+    } for i in range(count)]
+
+
+def _convert_after(rows):
+    """What generate_table did before columns were typed while generating."""
+    df = pd.DataFrame(rows, columns=[c["column_name"] for c in COLUMNS]).convert_dtypes()
+    for column in COLUMNS:
+        if "type" in column:
+            df[column["column_name"]] = df[column["column_name"]].astype(column["type"])
+    return df
+
+
+@pytest.mark.parametrize("row_count", [0, 1, 40])
+def test_builder_matches_convert_dtypes_and_astype(monkeypatch, row_count):
+    monkeypatch.setattr(typed_columns, "FLUSH_ROWS", 7)
+    rows = _rows(row_count)
+    builder = ColumnBuilder(COLUMNS)
+    for row in rows:
+        builder.add_row(row)
+    typed = builder.typed_columns()
+    df = builder.to_data_frame()
+    for column in COLUMNS:
+        if "type" in column and column["column_name"] not in typed:
+            df[column["column_name"]] = df[column["column_name"]].astype(column["type"])
+    expected = _convert_after(rows)
+    assert list(df.dtypes) == list(expected.dtypes)
+    assert df.equals(expected)
+    if row_count > 1:
+        assert {"id", "ratio", "amount", "flag", "flag_as_int", "name"} <= typed
+        assert not {"small", "maybe_name", "nullable", "untyped"} & typed
+
+
+def test_generated_table_types():
+    config = {
+        "version": 1,
+        "config": {"seed": 4},
+        "tables": [{
+            "table_name": "items",
+            "row_count": 30,
+            "columns": [
+                {"column_name": "item_id", "data": "row_id", "is_primary_key": True, "type": "int16"},
+                {"column_name": "price", "data": "round(random.uniform(1, 9), 2)", "type": "float32"},
+                {"column_name": "code", "data": "fake.bothify('??##')", "type": "string"},
+                {"column_name": "stock", "data": "random.randint(0, 50)"},
+            ],
+        }],
+    }
+    df = TableFaker().to_pandas(config)["items"]
+    assert [str(t) for t in df.dtypes] == ["int16", "float32", "string", "Int64"]
+    assert df["item_id"].tolist() == list(range(1, 31))
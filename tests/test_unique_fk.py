@@ -105,3 +105,54 @@ def test_unique_fk_independent_per_child_table():
     # Both child tables should independently have unique FK values
     assert dfs["shirts"]["color_id"].nunique() == 5
     assert dfs["pants"]["color_id"].nunique() == 5
+
+
+def _unique_config(parent_rows, child_rows, child_columns):
+    return {
+        "version": 1,
+        "config": {"locale": "en_US", "seed": 11},
+        "tables": [
+            {
+                "table_name": "stores",
+                "row_count": parent_rows,
+                "columns": [
+                    {"column_name": "store_id", "data": "row_id", "is_primary_key": True},
+                    {"column_name": "size", "data": '"big" if row_id <= 10 else "small"'},
+                ],
+            },
+            {
+                "table_name": "managers",
+                "row_count": child_rows,
+                "columns": [{"column_name": "manager_id", "data": "row_id", "is_primary_key": True}] + child_columns,
+            },
+        ],
+    }
+
+
+@pytest.mark.parametrize("data", [
+    'foreign_key("stores", "store_id", is_unique=True)',
+    'foreign_key("stores", "store_id", distribution="zipf", param=2, is_unique=True)',
+    'foreign_key("stores", "store_id", distribution="weighted_parent", parent_attr="size", weights={"big": 50, "small": 0}, is_unique=True)',
+])
+def test_unique_fk_uses_every_parent_before_raising(data):
+    columns = [{"column_name": "store_id", "data": data}]
+    managers = TableFaker().to_pandas(_unique_config(40, 40, columns))["managers"]
+    assert sorted(managers["store_id"]) == list(range(1, 41))
+    with pytest.raises(Exception, match="All primary key values"):
+        TableFaker().to_pandas(_unique_config(40, 41, columns))
+
+
+def test_unique_fk_weighted_without_replacement():
+    columns = [{"column_name": "store_id", "data": 'foreign_key("stores", "store_id", distribution="weighted_parent", parent_attr="size", weights={"big": 50, "small": 0}, is_unique=True)'}]
+    managers = TableFaker().to_pandas(_unique_config(40, 12, columns))["managers"]
+    # the ten "big" stores come first, weight 0 stores only once they are used up
+    assert sorted(managers["store_id"][:10]) == list(range(1, 11))
+
+
+def test_unique_fk_columns_share_pool():
+    columns = [
+        {"column_name": "store_id", "data": 'foreign_key("stores", "store_id", is_unique=True)'},
+        {"column_name": "backup_store_id", "data": 'foreign_key("stores", "store_id", distribution="zipf", is_unique=True)'},
+    ]
+    managers = TableFaker().to_pandas(_unique_config(30, 15, columns))["managers"]
+    assert sorted(list(managers["store_id"]) + list(managers["backup_store_id"])) == list(range(1, 31))
@@ -0,0 +1,164 @@
+import sys, os
+sys.path.append(os.path.abspath("."))
+import copy
+import pytest
+from tablefaker.tablefaker import TableFaker
+from tablefaker.row_plan import RowPlan
+import numpy as np
+from tablefaker import vectorize
+from tablefaker.vectorize import find_vector_columns
+
+CONFIG = {
+    "version": 1,
+    "config": {"locale": "en_US", "seed": 7, "engine": "vectorized"},
+    "tables": [
+        {
+            "table_name": "products",
+            "row_count": 200,
+            "columns": [
+                {"column_name": "product_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "stock", "data": "random.randint(0, 50)"},
+                {"column_name": "price", "data": "round(random.uniform(1, 100), 2)"},
+                {"column_name": "category", "data": 'random.choice(["toys", "books", "food"])'},
+                {"column_name": "bucket", "data": "fake.random_int(min=10, max=50, step=10)"},
+                {"column_name": "value", "data": "stock * price"},
+                {"column_name": "label", "data": 'category + "-" + str(product_id)'},
+            ],
+        },
+        {
+            "table_name": "sales",
+            "row_count": 100,
+            "columns": [
+                {"column_name": "sale_id", "data": "row_id", "is_primary_key": True},
+                {"column_name": "product_id", "data": 'foreign_key("products", "product_id")'},
+                {"column_name": "quantity", "data": "random.randint(1, 3)"},
+            ],
+        },
+    ],
+}
+
+
+def _plan_vector_names(columns, variables=None):
+    return list(find_vector_columns(RowPlan("t", columns), variables or {}))
+
+
+def test_recognized_patterns():
+    names = _plan_vector_names(CONFIG["tables"][0]["columns"])
+    assert names == ["product_id", "stock", "price", "category", "bucket", "value"]
+
+
+def test_shadowed_names_are_not_vectorized():
+    columns = [
+        {"column_name": "random", "data": "1"},
+        {"column_name": "a", "data": "random.randint(1, 3)"},
+        {"column_name": "b", "data": "round(2.5)"},
+    ]
+    assert _plan_vector_names(columns, {"round": lambda x: x}) == ["random"]
+
+
+def test_values_and_ranges():
+    df = TableFaker().to_pandas(copy.deepcopy(CONFIG))["products"]
+    assert df["product_id"].tolist() == list(range(1, 201))
+    assert df["stock"].between(0, 50).all()
+    assert df["price"].between(1, 100).all()
+    assert set(df["category"]) <= {"toys", "books", "food"}
+    assert set(df["bucket"]) <= {10, 20, 30, 40, 50}
+    assert (df["value"] == df["stock"] * df["price"]).all()
+    assert (df["label"] == df["category"] + "-" + df["product_id"].astype(str)).all()
+
+
+def test_same_seed_same_output():
+    first = TableFaker().to_pandas(copy.deepcopy(CONFIG))
+    second = TableFaker().to_pandas(copy.deepcopy(CONFIG))
+    for table_name in first:
+        assert first[table_name].equals(second[table_name])
+
+
+def test_foreign_keys_use_vectorized_primary_keys():
+    dfs = TableFaker().to_pandas(copy.deepcopy(CONFIG))
+    assert set(dfs["sales"]["product_id"]) <= set(dfs["products"]["product_id"])
+
+
+def test_division_by_zero_falls_back_to_per_row():
+    config = copy.deepcopy(CONFIG)
+    config["tables"][0]["columns"].append({"column_name": "ratio", "data": "1 / (row_id - 1)"})
+    with pytest.raises(ZeroDivisionError):
+        TableFaker().to_pandas(config)
+
+
+def _both_engines(columns, row_count=400):
+    config = {"version": 1, "config": {"seed": 1}, "tables": [{"table_name": "t", "row_count": row_count, "columns": columns}]}
+    return [TableFaker().to_pandas(copy.deepcopy(config), engine=engine)["t"] for engine in ("interpreter", "vectorized")]
+
+
+def test_round_matches_python():
+    columns = [
+        {"column_name": "id", "data": "row_id"},
+        # halves like 2.675 that np.round rounds up and Python's round down
+        {"column_name": "cents", "data": "round(row_id / 400 + 2.6, 2)"},
+        {"column_name": "half", "data": "round(row_id / 2)"},
+        {"column_name": "whole", "data": "round(row_id, 1)"},
+        {"column_name": "tens", "data": "round(row_id * 1.5, -1)"},
+    ]
+    assert _plan_vector_names(columns) == ["id", "cents", "half", "whole", "tens"]
+    interpreted, vectorized = _both_engines(columns)
+    for column in interpreted:
+        assert interpreted[column].tolist() == vectorized[column].tolist()
+        assert interpreted[column].dtype == vectorized[column].dtype
+
+
+def test_large_integer_literals_fall_back_to_per_row():
+    columns = [
+        {"column_name": "id", "data": "row_id"},
+        {"column_name": "wide", "data": "row_id % 10000000000000000000000 + 0.5"},
+        {"column_name": "stock", "data": "random.randint(0, 10000000000000000000000)"},
+        {"column_name": "step", "data": "fake.random_int(max=10000000000000000000000, step=10000000000000000000)"},
+    ]
+    assert _plan_vector_names(columns) == ["id"]
+    interpreted, vectorized = _both_engines(columns[:2])
+    assert interpreted["wide"].tolist() == vectorized["wide"].tolist() == [row_id + 0.5 for row_id in range(1, 401)]
+
+
+def test_arithmetic_on_other_literals_is_per_row():
+    columns = [
+        {"column_name": "id", "data": "row_id"},
+        {"column_name": "text", "data": "'ab' * 2"},
+        {"column_name": "flag", "data": "True + row_id"},
+        {"column_name": "negative", "data": "-'a'"},
+        {"column_name": "half", "data": "row_id * 0.5"},
+    ]
+    assert _plan_vector_names(columns) == ["id", "half"]
+    interpreted, vectorized = _both_engines(columns[:3] + columns[4:])
+    for column in interpreted:
+        assert interpreted[column].tolist() == vectorized[column].tolist()
+
+
+def test_integer_overflow_is_per_row():
+    columns = [
+        {"column_name": "id", "data": "row_id"},
+        {"column_name": "scaled", "data": "row_id * 9000000000000000000 // 9000000000000000000"},
+        {"column_name": "shifted", "data": "(row_id + 9223372036854775800) % 1000"},
+        {"column_name": "small", "data": "row_id * 1000 - 7"},
+    ]
+    assert _plan_vector_names(columns) == ["id", "scaled", "shifted", "small"]
+    interpreted, vectorized = _both_engines(columns)
+    assert vectorized["scaled"].tolist() == list(range(1, 401))
+    assert vectorized["shifted"].tolist() == [(row_id + 9223372036854775800) % 1000 for row_id in range(1, 401)]
+    for column in interpreted:
+        assert interpreted[column].tolist() == vectorized[column].tolist()
+
+
+def test_round_is_exact_without_a_python_loop(monkeypatch):
+    generator = np.random.default_rng(3)
+    halves = np.arange(-2000, 2000) / 1000 + 0.0005
+    values = np.concatenate([generator.uniform(-1000, 1000, 20000), halves, np.arange(-50, 50) / 2, [0.0, -0.0, 2.675, 1e300, np.inf, np.nan]])
+    expected = {digits: [round(value, digits) for value in values.tolist()] for digits in (-2, -1, 0, 1, 2, 3, 6)}
+    rounded = []
+    monkeypatch.setattr(vectorize, "round", lambda value, digits: rounded.append(value) or round(value, digits), raising=False)
+    for digits, python in expected.items():
+        result = vectorize._round(values, digits).tolist()
+        assert all(a == b or (a != a and b != b) for a, b in zip(result, python)), digits
+    # only the values next to a half and the huge ones go through Python's round
+    assert len(rounded) < len(values)
+    assert vectorize._round(np.arange(-30, 30) / 2).tolist() == [round(value) for value in np.arange(-30, 30) / 2]
+    assert vectorize._round(np.arange(-300, 300), -1).tolist() == [round(value, -1) for value in range(-300, 300)]